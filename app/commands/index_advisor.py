@@ -0,0 +1,222 @@
+"""
+Asesor de índices.
+
+Reproduce las formas de consulta grabadas en QUERY_SHAPES_DIR contra el
+esquema actual (con planes genéricos, sin ejecutar las consultas) y reporta:
+- tablas recorridas secuencialmente y las columnas filtradas en esas consultas
+- índices que ningún plan utiliza
+- índices redundantes (prefijo de otro índice de la misma tabla)
+
+Uso:
+    python -m app.commands.index_advisor [directorio_de_formas]
+"""
+
+import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from sqlalchemy import create_engine, inspect, pool, text
+from sqlalchemy.engine import Connection
+
+from app.config.query_shapes import load_shapes
+from app.config.settings import get_settings
+
+_PG_PLACEHOLDER = re.compile(r"%\((\w+)\)s|%s")
+_PG_SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+_PG_INDEX_SCAN = re.compile(
+    r"(?:Index (?:Only )?Scan (?:Backward )?using|Bitmap Index Scan on) (\w+)"
+)
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?! USING)")
+_SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+_FILTERED_COLUMN = re.compile(
+    r'"?(\w+)"?\."?(\w+)"?\s*(?:=|!=|<|>|\bIN\b|\bLIKE\b|\bILIKE\b|\bIS\b)',
+    re.IGNORECASE,
+)
+_ALIAS_SUFFIX = re.compile(r"_\d+$")
+
+
+@dataclass
+class SeqScanReport:
+    count: int = 0
+    total_ms: float = 0.0
+    columns: set[str] = field(default_factory=set)
+
+
+def _to_generic_postgres(statement: str) -> tuple[str, int]:
+    """Convierte placeholders pyformat a $n para un PREPARE."""
+    positions: dict[str, int] = {}
+    counter = 0
+
+    def replace(match: re.Match) -> str:
+        nonlocal counter
+        name = match.group(1)
+        if name is None or name not in positions:
+            counter += 1
+            if name is not None:
+                positions[name] = counter
+            return f"${counter}"
+        return f"${positions[name]}"
+
+    converted = _PG_PLACEHOLDER.sub(replace, statement).replace("%%", "%")
+    return converted, counter
+
+
+def _explain_postgres(conn: Connection, statement: str, name: str) -> list[str]:
+    """
+    Obtiene el plan genérico de la sentencia: con force_generic_plan el plan
+    no depende de los valores, así que basta con pasar NULL a cada parámetro.
+    """
+    sql, n_params = _to_generic_postgres(statement)
+    args = f"({', '.join(['NULL'] * n_params)})" if n_params else ""
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SET plan_cache_mode = force_generic_plan")
+        cursor.execute(f"PREPARE {name} AS {sql}")
+        cursor.execute(f"EXPLAIN EXECUTE {name}{args}")
+        lines = [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"DEALLOCATE {name}")
+        return lines
+    finally:
+        cursor.close()
+
+
+def _explain_sqlite(conn: Connection, statement: str) -> list[str]:
+    params = tuple([None] * statement.count("?"))
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).fetchall()
+    return [str(row[-1]) for row in rows]
+
+
+def _parse_plan(dialect: str, lines: list[str]) -> tuple[set[str], set[str]]:
+    """Retorna (tablas con recorrido secuencial, índices utilizados)."""
+    seq_scans: set[str] = set()
+    used: set[str] = set()
+    for line in lines:
+        if dialect == "postgresql":
+            seq_scans.update(_PG_SEQ_SCAN.findall(line))
+            used.update(_PG_INDEX_SCAN.findall(line))
+        else:
+            detail = line.strip()
+            match = _SQLITE_SCAN.match(detail)
+            if match:
+                seq_scans.add(_ALIAS_SUFFIX.sub("", match.group(1)))
+            used.update(_SQLITE_INDEX.findall(detail))
+    return seq_scans, used
+
+
+def _filtered_columns(statement: str, table: str) -> set[str]:
+    """Columnas de `table` (o de sus alias) usadas en comparaciones."""
+    return {
+        column
+        for alias, column in _FILTERED_COLUMN.findall(statement)
+        if _ALIAS_SUFFIX.sub("", alias) == table
+    }
+
+
+def _postgres_index_scans(conn: Connection) -> dict[str, int]:
+    rows = conn.execute(
+        text("SELECT indexrelname, idx_scan FROM pg_stat_user_indexes")
+    ).fetchall()
+    return {name: scans for name, scans in rows}
+
+
+def run(shapes_dir: str) -> int:
+    settings = get_settings()
+    shapes = load_shapes(shapes_dir)
+    if not shapes:
+        print(f"No recorded query shapes found in {shapes_dir}")
+        return 1
+
+    engine = create_engine(settings.DATABASE_URI, poolclass=pool.NullPool)
+    dialect = engine.dialect.name
+    seq_scans: dict[str, SeqScanReport] = defaultdict(SeqScanReport)
+    used_indexes: set[str] = set()
+    failed = 0
+
+    with engine.connect() as conn:
+        for position, (statement, stats) in enumerate(shapes.items()):
+            try:
+                if dialect == "postgresql":
+                    lines = _explain_postgres(
+                        conn, statement, f"index_advisor_q{position}"
+                    )
+                else:
+                    lines = _explain_sqlite(conn, statement)
+            except Exception:  # pylint: disable=broad-except
+                conn.rollback()
+                failed += 1
+                continue
+
+            tables, used = _parse_plan(dialect, lines)
+            used_indexes |= used
+            for table in tables:
+                report = seq_scans[table]
+                report.count += stats["count"]
+                report.total_ms += stats["total_ms"]
+                report.columns |= _filtered_columns(statement, table)
+
+        pg_scans = _postgres_index_scans(conn) if dialect == "postgresql" else {}
+        conn.rollback()
+
+        inspector = inspect(conn)
+        indexes = {
+            table: inspector.get_indexes(table)
+            for table in inspector.get_table_names()
+            if table != "alembic_version"
+        }
+    engine.dispose()
+
+    print(f"Replayed {len(shapes) - failed}/{len(shapes)} query shapes ({dialect})")
+
+    seq_scans = {
+        table: report for table, report in seq_scans.items() if table in indexes
+    }
+    print("\n== Sequential scans (missing index candidates) ==")
+    if not seq_scans:
+        print("  none")
+    for table, report in sorted(
+        seq_scans.items(), key=lambda item: item[1].total_ms, reverse=True
+    ):
+        columns = ", ".join(sorted(report.columns)) or "-"
+        print(
+            f"  {table}: {report.count} executions, {report.total_ms:.1f} ms total; "
+            f"filtered columns: {columns}"
+        )
+
+    print("\n== Unused indexes ==")
+    for table, table_indexes in sorted(indexes.items()):
+        for index in table_indexes:
+            name = index["name"]
+            if name in used_indexes:
+                continue
+            note = " (unique: backs a constraint)" if index.get("unique") else ""
+            if name in pg_scans:
+                note += f" [idx_scan={pg_scans[name]}]"
+            print(f"  {table}.{name} {index['column_names']}{note}")
+
+    print("\n== Redundant indexes (prefix of another index) ==")
+    for table, table_indexes in sorted(indexes.items()):
+        for index in table_indexes:
+            columns = index["column_names"]
+            for other in table_indexes:
+                other_columns = other["column_names"]
+                if (
+                    other["name"] != index["name"]
+                    and not index.get("unique")
+                    and len(other_columns) > len(columns)
+                    and other_columns[: len(columns)] == columns
+                    and not other.get("dialect_options", {}).get("postgresql_where")
+                    and not other.get("dialect_options", {}).get("sqlite_where")
+                ):
+                    print(f"  {table}.{index['name']} is a prefix of {other['name']}")
+                    break
+
+    return 0
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else get_settings().QUERY_SHAPES_DIR
+    if not directory:
+        print("Usage: python -m app.commands.index_advisor <query_shapes_dir>")
+        sys.exit(2)
+    sys.exit(run(directory))
@@ -0,0 +1,30 @@
+"""
+Borra los tokens vencidos (UserToken y VerificationToken) en lotes.
+
+La API lo hace cada TOKEN_PURGE_INTERVAL_SECONDS; usar tras la migración de
+índices para vaciar lo acumulado, o con TOKEN_PURGE_INTERVAL_SECONDS=0.
+
+Uso:
+    python -m app.commands.purge_tokens
+"""
+
+import sys
+
+from app.config.database import close_db, db_manager, init_db
+from app.services.token_purge import purge_all
+
+
+def run() -> int:
+    init_db()
+    try:
+        with db_manager.get_session_context() as session:
+            deleted = purge_all(session)
+    finally:
+        close_db()
+    for table, count in deleted.items():
+        print(f"Purged {table}: {count} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
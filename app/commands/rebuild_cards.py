@@ -0,0 +1,29 @@
+"""
+Reconstruye el modelo de lectura `candidatura_card` desde las tablas fuente.
+
+Usar tras la migración que crea la tabla, después de cargas masivas hechas
+fuera de los servicios, o si se sospecha que quedó desfasado.
+
+Uso:
+    python -m app.commands.rebuild_cards [tamaño_de_lote]
+"""
+
+import sys
+
+from app.config.database import close_db, db_manager, init_db
+from app.services.candidatura_cards import rebuild_candidatura_cards
+
+
+def run(batch_size: int) -> int:
+    init_db()
+    try:
+        with db_manager.get_session_context() as session:
+            total = rebuild_candidatura_cards(session, batch_size=batch_size)
+    finally:
+        close_db()
+    print(f"Rebuilt {total} candidatura cards")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,32 @@
+"""
+Recalcula `resultado_agregado` desde candidato y corrige la deriva.
+
+Usar después de cargar votos fuera de la ingesta de resultados (la
+migración que crea la tabla ya la puebla).
+
+Uso:
+    python -m app.commands.reconcile_tallies [proceso_id]
+"""
+
+import sys
+
+from app.config.database import close_db, db_manager, init_db
+from app.services.tallies import reconcile, reconcile_active
+
+
+def run(proceso_id: str | None) -> int:
+    init_db()
+    try:
+        with db_manager.get_session_context() as session:
+            if proceso_id:
+                drift = reconcile(session, proceso_id)
+            else:
+                drift = reconcile_active(session)
+    finally:
+        close_db()
+    print(f"Reconciled tallies: {drift} rows corrected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv[1] if len(sys.argv) > 1 else None))
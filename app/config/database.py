@@ -3,22 +3,106 @@ Módulo de configuración y gestión de base de datos.
 Proporciona conexión singleton y dependency injection para FastAPI.
 """
 
+import itertools
 import logging
+import threading
+import time
 from contextlib import contextmanager
 from typing import Callable, Generator
 
+from fastapi import Request, Response
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlmodel import Session
 
+from app.config.pool import TimedNullPool, TimedQueuePool
+from app.config.query_shapes import QueryShapeRecorder
 from app.config.settings import get_settings
+from app.config.slow_query import SlowQueryLogger
+from app.utils.cookies import PRIMARY_READS_COOKIE, _set_primary_reads_cookie
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 Base = declarative_base()
 
+# Retraso de réplica en segundos; 0 si ya aplicó todo lo recibido (réplica ociosa)
+_REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
+
+
+def _build_session_factory(engine: Engine) -> Callable[[], Session]:
+    return sessionmaker(
+        bind=engine,
+        autocommit=False,
+        autoflush=False,
+        class_=Session,
+    )
+
+
+def pool_size_per_worker() -> int:
+    """
+    Reparte el presupuesto global de conexiones entre los workers.
+    Cada engine (primario o réplica) respeta el presupuesto de su servidor.
+    """
+    return max(1, settings.DATABASE_CONNECTION_BUDGET // settings.WEB_CONCURRENCY)
+
+
+def _pooler_connect_args(uri: str) -> dict:
+    """
+    Argumentos de conexión compatibles con un pooler en modo transacción.
+    psycopg2 no usa prepared statements del lado del servidor; psycopg 3 sí,
+    así que se desactivan explícitamente.
+    """
+    if uri.startswith("postgresql+psycopg://"):
+        return {"prepare_threshold": None}
+    return {}
+
+
+class Replica:
+    """
+    Réplica de lectura con su estado de salud y retraso.
+    El chequeo se hace de forma perezosa, como máximo una vez por intervalo.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.session_factory = _build_session_factory(engine)
+        self.healthy = True
+        self.lag_seconds = 0.0
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def refresh_health(self, interval_seconds: float) -> None:
+        """Actualiza salud y retraso si el último chequeo es más viejo que el intervalo."""
+        if time.monotonic() - self._checked_at < interval_seconds:
+            return
+        # Si otro hilo ya está chequeando, se usa el último estado conocido
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._checked_at = time.monotonic()
+            with self.engine.connect() as conn:
+                if self.engine.dialect.name == "postgresql":
+                    lag = conn.execute(text(_REPLICA_LAG_SQL)).scalar()
+                else:
+                    lag = conn.execute(text("SELECT 0")).scalar()
+            self.lag_seconds = float(lag or 0)
+            self.healthy = True
+        except Exception as e:  # pylint: disable=broad-except
+            if self.healthy:
+                logger.warning(
+                    "Read replica %s marked unhealthy: %s", self.engine.url, e
+                )
+            self.healthy = False
+        finally:
+            self._lock.release()
+
 
 class DatabaseManager:
     """
@@ -29,6 +113,10 @@ class DatabaseManager:
     def __init__(self) -> None:
         self._engine: Engine | None = None
         self._session_factory: Callable[[], Session] | None = None
+        self._slow_query_logger: SlowQueryLogger | None = None
+        self._query_shape_recorder: QueryShapeRecorder | None = None
+        self._replicas: list[Replica] = []
+        self._replica_cursor = itertools.count()
 
     @property
     def engine(self) -> Engine:
@@ -51,24 +139,127 @@ class DatabaseManager:
         """
         logger.info("Initializing database connection...")
 
-        self._engine = create_engine(
-            settings.DATABASE_URI,
+        self._engine = self._create_engine(settings.DATABASE_URI)
+        self._replicas = [
+            Replica(self._create_engine(uri)) for uri in settings.DATABASE_REPLICA_URIS
+        ]
+        engines = [self._engine] + [replica.engine for replica in self._replicas]
+
+        if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+            self._slow_query_logger = SlowQueryLogger(
+                threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+                explain=settings.SLOW_QUERY_EXPLAIN,
+                explain_cooldown_seconds=settings.SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS,
+            )
+            for engine in engines:
+                self._slow_query_logger.attach(engine)
+
+        if settings.QUERY_SHAPES_DIR:
+            self._query_shape_recorder = QueryShapeRecorder(settings.QUERY_SHAPES_DIR)
+            for engine in engines:
+                self._query_shape_recorder.attach(engine)
+
+        self._session_factory = _build_session_factory(self._engine)
+
+        self._verify_connection()
+        logger.info("✓ Database connection established successfully.")
+        if settings.DATABASE_POOL_MODE == "transaction":
+            logger.info(
+                "✓ Transaction pooler mode: connections are not pooled locally."
+            )
+        else:
+            logger.info(
+                "✓ Pool size per worker: %d (budget %d / %d workers)",
+                pool_size_per_worker(),
+                settings.DATABASE_CONNECTION_BUDGET,
+                settings.WEB_CONCURRENCY,
+            )
+        if self._replicas:
+            logger.info("✓ %d read replica(s) configured.", len(self._replicas))
+
+    def _create_engine(self, uri: str) -> Engine:
+        """
+        Crea un engine según DATABASE_POOL_MODE.
+        - "session": pool propio dimensionado con pool_size_per_worker().
+        - "transaction": para poolers externos en modo transacción
+          (Supabase/Supavisor, PgBouncer). No se retienen conexiones
+          (NullPool) y se desactivan los prepared statements del driver.
+        """
+        if settings.DATABASE_POOL_MODE == "transaction":
+            return create_engine(
+                uri,
+                poolclass=TimedNullPool,
+                connect_args=_pooler_connect_args(uri),
+                echo=False,
+            )
+
+        return create_engine(
+            uri,
+            poolclass=TimedQueuePool,
             pool_pre_ping=True,
             pool_recycle=3600,
-            pool_size=20,
+            pool_size=pool_size_per_worker(),
             max_overflow=0,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT_SECONDS,
             echo=False,
         )
 
-        self._session_factory = sessionmaker(
-            bind=self._engine,
-            autocommit=False,
-            autoflush=False,
-            class_=Session,
-        )
+    def _engines(self) -> dict[str, Engine]:
+        return {"primary": self.engine} | {
+            f"replica_{position}": replica.engine
+            for position, replica in enumerate(self._replicas)
+        }
 
-        self._verify_connection()
-        logger.info("✓ Database connection established successfully.")
+    def pool_status(self) -> dict:
+        """Estado de los pools (tamaño, en uso y tiempos de espera)."""
+        status = {}
+        for name, engine in self._engines().items():
+            pool = engine.pool
+            entry = {"mode": settings.DATABASE_POOL_MODE}
+            if isinstance(pool, TimedQueuePool):
+                entry |= {
+                    "size": pool.size(),
+                    "checked_out": pool.checkedout(),
+                }
+            if hasattr(pool, "wait_stats"):
+                entry |= pool.wait_stats.snapshot()
+                entry["connect_p95_ms"] = round(
+                    pool.connect_stats.recent_percentile(95), 3
+                )
+            status[name] = entry
+        return status
+
+    def pool_wait_p95_ms(self) -> float:
+        """
+        Mayor percentil 95 reciente de espera por conexión entre el primario y
+        las réplicas: las lecturas públicas saturan los pools de las réplicas.
+        """
+        waits = [
+            engine.pool.wait_stats.recent_percentile(95)
+            for engine in self._engines().values()
+            if hasattr(engine.pool, "wait_stats")
+        ]
+        return max(waits, default=0.0)
+
+    def read_session_factory(self) -> Callable[[], Session]:
+        """
+        Retorna la factory de sesiones para lecturas.
+        Elige réplicas en round-robin, saltando las caídas o con retraso mayor
+        a REPLICA_MAX_LAG_SECONDS; si ninguna sirve, usa el primario.
+        """
+        if not self._replicas:
+            return self.session_factory
+
+        start = next(self._replica_cursor)
+        for offset in range(len(self._replicas)):
+            replica = self._replicas[(start + offset) % len(self._replicas)]
+            replica.refresh_health(settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS)
+            if (
+                replica.healthy
+                and replica.lag_seconds <= settings.REPLICA_MAX_LAG_SECONDS
+            ):
+                return replica.session_factory
+        return self.session_factory
 
     def _verify_connection(self) -> None:
         """Verifica que la conexión a la base de datos funcione."""
@@ -86,6 +277,15 @@ class DatabaseManager:
         """
         if self._engine:
             logger.info("Closing database connection...")
+            if self._slow_query_logger:
+                self._slow_query_logger.close()
+                self._slow_query_logger = None
+            if self._query_shape_recorder:
+                self._query_shape_recorder.close()
+                self._query_shape_recorder = None
+            for replica in self._replicas:
+                replica.engine.dispose()
+            self._replicas = []
             self._engine.dispose()
             self._engine = None
             self._session_factory = None
@@ -140,3 +340,33 @@ def get_session() -> Generator[Session, None, None]:
         yield session
     finally:
         session.close()
+
+
+def get_read_session(request: Request) -> Generator[Session, None, None]:
+    """
+    Dependency de FastAPI para endpoints de solo lectura.
+    Lee de una réplica, salvo que el cliente haya escrito hace poco
+    (cookie de read-your-writes): entonces lee del primario.
+    """
+    if request.cookies.get(PRIMARY_READS_COOKIE):
+        factory = db_manager.session_factory
+    else:
+        factory = db_manager.read_session_factory()
+
+    session = factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def use_primary_after_write(request: Request, response: Response) -> None:
+    """
+    Dependency para rutas de escritura: abre la ventana de read-your-writes
+    para que las lecturas siguientes del cliente vayan al primario.
+    Solo en métodos que escriben; la cookie va en `response`, que FastAPI
+    descarta si la ruta termina en error (401/403, validación, HTTPException),
+    así que solo la reciben las escrituras exitosas.
+    """
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        _set_primary_reads_cookie(response)
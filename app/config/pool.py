@@ -0,0 +1,124 @@
+"""
+Pools de conexiones instrumentados.
+Miden cuánto espera cada checkout por una conexión, para validar el
+dimensionamiento del pool frente al presupuesto de conexiones.
+
+La espera es solo el tiempo en la cola del pool: abrir una conexión nueva
+(TCP/TLS contra la base o un pooler remoto) se mide aparte, así la espera
+no sube por latencia de red. Con NullPool no hay cola y la espera es ~0.
+"""
+
+import threading
+import time
+from collections import deque
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool
+
+
+class PoolWaitStats:
+    """Acumula los tiempos de espera de checkout de un pool."""
+
+    def __init__(self, window: int = 1000) -> None:
+        self._lock = threading.Lock()
+        self._recent: deque[float] = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def record(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self._recent.append(wait_ms)
+            if timed_out:
+                self.timeouts += 1
+
+    def recent_percentile(self, percentile: float) -> float:
+        """Percentil de espera (ms) sobre la ventana de checkouts recientes."""
+        with self._lock:
+            recent = sorted(self._recent)
+        if not recent:
+            return 0.0
+        index = min(len(recent) - 1, int(len(recent) * percentile / 100))
+        return recent[index]
+
+    def snapshot(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": (
+                round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0
+            ),
+            "p95_wait_ms": round(self.recent_percentile(95), 3),
+            "max_wait_ms": round(self.max_wait_ms, 3),
+        }
+
+
+_connecting = threading.local()
+
+
+class _TimedPoolMixin:
+    """
+    Mide el tiempo de `_do_get` (donde el pool bloquea o conecta) menos el de
+    `_create_connection`, que se registra en `connect_stats`.
+    """
+
+    wait_stats: PoolWaitStats
+    connect_stats: PoolWaitStats
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()  # type: ignore[misc]
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            _connecting.elapsed_ms = (
+                getattr(_connecting, "elapsed_ms", 0.0) + elapsed_ms
+            )
+            self.connect_stats.record(elapsed_ms)
+
+    def _do_get(self):
+        _connecting.elapsed_ms = 0.0
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore[misc]
+        except Exception as e:
+            self._record_wait(started, timed_out=isinstance(e, PoolTimeoutError))
+            raise
+        self._record_wait(started)
+        return connection
+
+    def _record_wait(self, started: float, timed_out: bool = False) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.wait_stats.record(
+            max(0.0, elapsed_ms - _connecting.elapsed_ms), timed_out=timed_out
+        )
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+        self.connect_stats = PoolWaitStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        pool.connect_stats = self.connect_stats
+        return pool
+
+
+class TimedNullPool(_TimedPoolMixin, NullPool):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+        self.connect_stats = PoolWaitStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        pool.connect_stats = self.connect_stats
+        return pool
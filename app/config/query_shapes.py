@@ -0,0 +1,139 @@
+"""
+Registro de "formas" de consulta.
+Acumula las sentencias de lectura ejecutadas (ya parametrizadas, sin valores)
+con su frecuencia y tiempo total, y las vuelca a disco para que el
+asesor de índices (app.commands.index_advisor) pueda reproducirlas.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+_READ_PREFIXES = ("select", "with")
+
+# Listas IN expandidas: "IN (%(x_1)s, %(x_2)s)" o "IN (?, ?, ?)" -> un solo placeholder
+_EXPANDED_IN = re.compile(
+    r"IN \(\s*(%\(\w+\)s|\?)(?:\s*,\s*(?:%\(\w+\)s|\?))+\s*\)", re.IGNORECASE
+)
+
+
+def normalize_statement(statement: str) -> str:
+    """Colapsa las listas IN expandidas para agrupar sentencias equivalentes."""
+    return _EXPANDED_IN.sub(r"IN (\1)", " ".join(statement.split()))
+
+
+def load_shapes_file(path: Path) -> dict[str, dict]:
+    """Lee un único archivo de formas; vacío si no se puede leer."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning("Skipping unreadable query shapes file %s: %s", path, e)
+        return {}
+
+
+def load_shapes(directory: str | Path) -> dict[str, dict]:
+    """Combina los volcados de todos los procesos de un directorio."""
+    shapes: dict[str, dict] = {}
+    for path in Path(directory).glob("*.json"):
+        for statement, stats in load_shapes_file(path).items():
+            current = shapes.setdefault(statement, {"count": 0, "total_ms": 0.0})
+            current["count"] += stats.get("count", 0)
+            current["total_ms"] += stats.get("total_ms", 0.0)
+    return shapes
+
+
+class QueryShapeRecorder:
+    """
+    Listener de engine que cuenta las formas de consulta de lectura.
+    Cada proceso escribe su propio archivo (query_shapes.<pid>.json),
+    así varios workers pueden grabar al mismo directorio sin bloqueos.
+    El volcado periódico corre en un hilo propio, fuera de las consultas.
+    """
+
+    def __init__(self, directory: str, flush_interval_seconds: float = 60) -> None:
+        self.directory = Path(directory)
+        self.flush_interval_seconds = flush_interval_seconds
+        self._engines: list[Engine] = []
+        self._shapes: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    @property
+    def path(self) -> Path:
+        return self.directory / f"query_shapes.{os.getpid()}.json"
+
+    def attach(self, engine: Engine) -> None:
+        """
+        Registra los listeners en el engine (puede llamarse por cada engine)
+        y carga el volcado previo del proceso.
+        """
+        if not self._engines:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if self.path.exists():
+                self._shapes = load_shapes_file(self.path)
+            self._stop.clear()
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name="query-shapes", daemon=True
+            )
+            self._flusher.start()
+        self._engines.append(engine)
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def close(self) -> None:
+        """Quita los listeners, detiene el hilo y vuelca lo acumulado."""
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.clear()
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self.flush_interval_seconds):
+            self.flush()
+
+    def flush(self) -> None:
+        """Escribe el archivo del proceso de forma atómica."""
+        with self._lock:
+            shapes = {shape: dict(stats) for shape, stats in self._shapes.items()}
+        payload = json.dumps(shapes)
+
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(payload, encoding="utf-8")
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logger.warning("Could not write query shapes to %s: %s", self.path, e)
+
+    def _before_cursor_execute(
+        self, conn: Connection, _cursor, _statement, _parameters, _context, _many
+    ) -> None:
+        conn.info.setdefault("shape_start_time", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn: Connection, _cursor, statement, _parameters, _context, _many
+    ) -> None:
+        started = conn.info["shape_start_time"].pop()
+        if not statement.lstrip().lower().startswith(_READ_PREFIXES):
+            return
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        shape = normalize_statement(statement)
+        with self._lock:
+            stats = self._shapes.setdefault(shape, {"count": 0, "total_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
@@ -23,6 +23,127 @@ class Settings(BaseSettings):
 
     # === Database ===
     DATABASE_URI: str = Field(default="", description="Database connection string")
+    DATABASE_REPLICA_URIS: List[str] = Field(
+        default=[], description="Réplicas de lectura (JSON list)"
+    )
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = Field(default=10, gt=0)
+    REPLICA_MAX_LAG_SECONDS: float = Field(default=5, ge=0)
+    READ_YOUR_WRITES_SECONDS: int = Field(default=10, ge=0)
+    DATABASE_POOL_MODE: str = Field(
+        default="session",
+        pattern="^(session|transaction)$",
+        description="transaction: detrás de un pooler externo (PgBouncer/Supavisor)",
+    )
+    DATABASE_CONNECTION_BUDGET: int = Field(
+        default=20, ge=1, description="Conexiones máximas entre todos los workers"
+    )
+    DATABASE_POOL_TIMEOUT_SECONDS: float = Field(default=30, gt=0)
+    WEB_CONCURRENCY: int = Field(default=1, ge=1, description="Número de workers")
+    ID_STRATEGY: str = Field(
+        default="cuid",
+        pattern="^(cuid|sortable)$",
+        description="sortable: ids ordenables por tiempo para filas nuevas",
+    )
+    SLOW_QUERY_THRESHOLD_MS: float = Field(
+        default=500, ge=0, description="Umbral de consulta lenta (0 desactiva)"
+    )
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS: int = Field(default=300, ge=0)
+    QUERY_SHAPES_DIR: str | None = Field(
+        default=None, description="Directorio donde grabar formas de consulta"
+    )
+
+    # === HTTP ===
+    FORWARDED_ALLOW_IPS: str = Field(
+        default="127.0.0.1",
+        description="IPs o CIDR de proxies cuyos X-Forwarded-* se aceptan",
+    )
+    COMPRESSION_MINIMUM_SIZE: int = Field(
+        default=1024, ge=0, description="Bytes mínimos para comprimir una respuesta"
+    )
+    COMPRESSION_GZIP_LEVEL: int = Field(default=6, ge=1, le=9)
+    COMPRESSION_BROTLI_QUALITY: int = Field(default=5, ge=0, le=11)
+    RESPONSE_CACHE_TTL_SECONDS: float = Field(
+        default=30, ge=0, description="TTL de la caché de respuestas (0 desactiva)"
+    )
+    RESPONSE_CACHE_STALE_SECONDS: float = Field(
+        default=60, ge=0, description="Gracia para servir vencido mientras se refresca"
+    )
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=1000, ge=1)
+    RESPONSE_CACHE_VERSION_CHECK_SECONDS: float = Field(
+        default=2, ge=0, description="Revisión de escrituras de otros workers"
+    )
+    BATCH_MAX_IDS: int = Field(
+        default=100, ge=1, description="IDs máximos por petición :batch"
+    )
+    CHANGE_FEED_SETTLE_SECONDS: float = Field(
+        default=2, ge=0, description="Retraso antes de publicar un cambio en /changes"
+    )
+    LIVE_RESULTS_POLL_SECONDS: float = Field(
+        default=1, gt=0, description="Intervalo de consulta de resultados en vivo"
+    )
+    LIVE_RESULTS_KEEPALIVE_SECONDS: float = Field(default=15, gt=0)
+    LIVE_RESULTS_MAX_SUBSCRIBERS: int = Field(
+        default=5000, ge=1, description="Clientes SSE máximos por worker"
+    )
+    REFERENCE_REFRESH_SECONDS: float = Field(
+        default=30, ge=0, description="Revisión del registro de partidos y procesos"
+    )
+
+    # === Elecciones ===
+    SEATS_THRESHOLD_PERCENT: float = Field(
+        default=5.0, ge=0, le=100, description="Valla electoral (% de votos válidos)"
+    )
+    SIMULATION_WORKERS: int = Field(
+        default=2, ge=1, description="Procesos del pool de simulaciones"
+    )
+    SIMULATION_MAX_SCENARIOS: int = Field(default=50000, ge=100)
+    SIMULATION_MAX_CONCURRENT: int = Field(
+        default=2, ge=1, description="Simulaciones simultáneas por worker"
+    )
+    SIMULATION_CHUNK_SIZE: int = Field(
+        default=200, ge=1, description="Escenarios por tarea del pool"
+    )
+    TALLY_REFRESH_SECONDS: float = Field(
+        default=2, ge=0, description="Recarga de totales en memoria por worker"
+    )
+    TALLY_RECONCILE_SECONDS: float = Field(
+        default=300, ge=0, description="Reconciliación de totales (0 desactiva)"
+    )
+
+    # === Rate limiting y descarte de carga ===
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_IP_RATE: float = Field(
+        default=20, ge=0, description="Peticiones por segundo por IP (0 desactiva)"
+    )
+    RATE_LIMIT_PER_IP_BURST: int = Field(default=60, ge=1)
+    RATE_LIMIT_LOGIN_PER_MINUTE: float = Field(
+        default=5, gt=0, description="Intentos de login por minuto por IP"
+    )
+    RATE_LIMIT_LOGIN_BURST: int = Field(default=5, ge=1)
+    RATE_LIMIT_REDIS_URL: str | None = Field(
+        default=None, description="Comparte los buckets entre workers"
+    )
+    LOAD_SHED_MAX_CONCURRENCY: int = Field(
+        default=200,
+        ge=0,
+        description=(
+            "Concurrencia máxima por worker (0 desactiva). Con "
+            "DATABASE_POOL_MODE=transaction es un tope fijo: no hay descarte "
+            "adaptativo"
+        ),
+    )
+    LOAD_SHED_MIN_CONCURRENCY: int = Field(
+        default=10, ge=1, description="Ignorado con DATABASE_POOL_MODE=transaction"
+    )
+    LOAD_SHED_TARGET_POOL_WAIT_MS: float = Field(
+        default=50,
+        gt=0,
+        description=(
+            "Espera p95 (el peor pool entre primario y réplicas) que activa el "
+            "descarte; ignorado con DATABASE_POOL_MODE=transaction"
+        ),
+    )
 
     # === security ===
     JWT_SECRET_KEY: str = Field(..., min_length=32)
@@ -31,6 +152,19 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_MINUTES: int = Field(default=10080, ge=1)
     REFRESH_TOKEN_SLIDING_WINDOW: bool = True
     REFRESH_TOKEN_RENEWAL_THRESHOLD_DAYS: int = 2
+    MAX_ACTIVE_SESSIONS_PER_USER: int = Field(
+        default=10, ge=0, description="Sesiones activas por usuario (0 sin límite)"
+    )
+    TOKEN_PURGE_INTERVAL_SECONDS: float = Field(
+        default=3600, ge=0, description="Purga de tokens vencidos (0 desactiva)"
+    )
+    TOKEN_PURGE_BATCH_SIZE: int = Field(default=1000, ge=1)
+    TOKEN_PURGE_BATCH_PAUSE_SECONDS: float = Field(
+        default=0.1, ge=0, description="Pausa entre lotes de la purga"
+    )
+    TOKEN_PURGE_MAX_BATCHES: int = Field(
+        default=100, ge=1, description="Lotes por tabla en cada vuelta de la purga"
+    )
 
     # === Email (opcional) ===
     RESEND_API_KEY: str | None = None
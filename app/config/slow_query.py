@@ -0,0 +1,163 @@
+"""
+Registro de consultas lentas.
+Mide cada sentencia ejecutada por el engine y, si supera el umbral configurado,
+la registra con sus parámetros redactados junto con la ruta y el servicio que
+la originaron. Opcionalmente captura su plan de ejecución en segundo plano.
+"""
+
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+from app.middleware.request_context import current_route
+
+logger = logging.getLogger(__name__)
+
+# Solo se explican sentencias de lectura: EXPLAIN ANALYZE ejecuta la consulta.
+# Un WITH puede contener INSERT/UPDATE/DELETE, así que solo recibe EXPLAIN.
+_EXPLAINABLE_PREFIXES = ("select", "with")
+_ANALYZABLE_PREFIXES = ("select",)
+_EXPLAIN_FLAG = "slow_query_explaining"
+_MAX_TRACKED_STATEMENTS = 1000
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Reemplaza los valores de los parámetros por su tipo."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) for value in parameters]
+    return type(parameters).__name__
+
+
+def find_query_origin() -> str | None:
+    """
+    Busca en la pila el servicio que originó la consulta.
+    Retorna "modulo.funcion" (p. ej. "politics.get_personas_list").
+    """
+    frame = sys._getframe(1)  # pylint: disable=protected-access
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.services."):
+            return f"{module.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLogger:
+    """
+    Listener de engine que registra las sentencias que superan el umbral.
+    El plan se obtiene en un hilo aparte sobre otra conexión, para no
+    alargar la petición que disparó la consulta lenta.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        explain: bool = True,
+        explain_cooldown_seconds: float = 300,
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.explain_cooldown_seconds = explain_cooldown_seconds
+        self._engines: list[Engine] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self._last_explained: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine) -> None:
+        """Registra los listeners en el engine (puede llamarse por cada engine)."""
+        self._engines.append(engine)
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        if self.explain and self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="slow-query-explain"
+            )
+
+    def close(self) -> None:
+        """Quita los listeners y descarta los EXPLAIN pendientes."""
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _before_cursor_execute(
+        self, conn: Connection, _cursor, _statement, _parameters, _context, _many
+    ) -> None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn: Connection, _cursor, statement, parameters, _context, executemany
+    ) -> None:
+        started = conn.info["query_start_time"].pop()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if elapsed_ms < self.threshold_ms or conn.info.get(_EXPLAIN_FLAG):
+            return
+
+        route = current_route()
+        service = find_query_origin()
+        logger.warning(
+            "Slow query (%.1f ms) route=%s service=%s params=%s\n%s",
+            elapsed_ms,
+            route,
+            service,
+            redact_parameters(parameters),
+            statement,
+        )
+
+        if self._executor is not None and not executemany:
+            if self._should_explain(statement):
+                self._executor.submit(
+                    self._explain, conn.engine, statement, parameters, route, service
+                )
+
+    def _should_explain(self, statement: str) -> bool:
+        """Evita repetir el EXPLAIN de la misma sentencia dentro del cooldown."""
+        if not statement.lstrip().lower().startswith(_EXPLAINABLE_PREFIXES):
+            return False
+
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_explained.get(statement)
+            if last is not None and now - last < self.explain_cooldown_seconds:
+                return False
+            if len(self._last_explained) >= _MAX_TRACKED_STATEMENTS:
+                self._last_explained.clear()
+            self._last_explained[statement] = now
+        return True
+
+    def _explain(
+        self, engine: Engine, statement: str, parameters, route, service
+    ) -> None:
+        if engine.dialect.name != "postgresql":
+            explain_sql = f"EXPLAIN QUERY PLAN {statement}"
+        elif statement.lstrip().lower().startswith(_ANALYZABLE_PREFIXES):
+            explain_sql = f"EXPLAIN (ANALYZE, BUFFERS) {statement}"
+        else:
+            explain_sql = f"EXPLAIN {statement}"
+
+        try:
+            with engine.connect() as conn:
+                conn.info[_EXPLAIN_FLAG] = True
+                try:
+                    rows = conn.exec_driver_sql(explain_sql, parameters).fetchall()
+                finally:
+                    conn.info.pop(_EXPLAIN_FLAG, None)
+                    conn.rollback()
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("Could not capture plan for slow query: %s", e)
+            return
+
+        plan = "\n".join(" | ".join(str(col) for col in row) for row in rows)
+        logger.warning("Slow query plan route=%s service=%s\n%s", route, service, plan)
@@ -3,17 +3,54 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
-from app.config.database import close_db, init_db
+from app.config.database import close_db, db_manager, init_db
 from app.config.logging_config import setup_logging
 from app.config.settings import get_settings
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.rate_limit import (
+    AdaptiveConcurrencyLimiter,
+    InMemoryBucketStore,
+    RateLimitMiddleware,
+    RateLimitRule,
+    RedisBucketStore,
+)
+from app.middleware.request_context import RequestContextMiddleware
+from app.middleware.response_cache import ResponseCacheMiddleware, warm_cache
+from app.responses.base import FastJSONResponse
 from app.routes.api import api_router_v1
+from app.services import changes, simulations
+from app.services.candidatura_cards import ensure_candidatura_cards
+from app.services.live_results import live_results
+from app.services.reference import reference_registry
+from app.services.tallies import tally_reconciler
+from app.services.token_purge import token_purger
 
 settings = get_settings()
 setup_logging(debug=settings.DEBUG, environment=settings.ENVIRONMENT)
 logger = logging.getLogger(__name__)
 
+# Listados públicos que se precargan en la caché de respuestas al arrancar
+CACHE_WARM_PATHS = [
+    "/api/v1/politics/partidos",
+    "/api/v1/politics/distritos",
+    "/api/v1/politics/procesos-electorales",
+    "/api/v1/politics/personas",
+    "/api/v1/politics/candidaturas",
+    "/api/v1/politics/candidaturas/cards",
+]
+# Datos en vivo o cursores: cachearlos los dejaría atrasados hasta el TTL
+CACHE_BYPASS_PATTERNS = (
+    r"^/api/v1/politics/changes$",
+    r"^/api/v1/politics/procesos-electorales/[^/]+/(totales|escanos|resultados)",
+)
+
+
+def _change_log_version() -> int:
+    """Versión del change log: sube con cualquier escritura, en cualquier worker."""
+    with db_manager.get_session_context() as session:
+        return changes.latest_version(session)
+
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
@@ -31,6 +68,17 @@ async def lifespan(_app: FastAPI):
 
     try:
         init_db()
+        with db_manager.get_session_context() as session:
+            reference_registry.load(session)
+            ensure_candidatura_cards(session)
+        live_results.start()
+        tally_reconciler.start()
+        token_purger.start()
+        if settings.RESPONSE_CACHE_TTL_SECONDS > 0:
+            warmed = await warm_cache(_app, CACHE_WARM_PATHS)
+            logger.info(
+                "Response cache warmed: %d/%d paths", warmed, len(CACHE_WARM_PATHS)
+            )
         # await init_embeddings()
         # await init_vector_store()
         # logger.info("=" * 60)
@@ -51,6 +99,10 @@ async def lifespan(_app: FastAPI):
     logger.info("=" * 60)
 
     try:
+        await live_results.stop()
+        await tally_reconciler.stop()
+        await token_purger.stop()
+        simulations.shutdown_pool()
         close_db()
         logger.info("✅ Cleanup completed successfully")
     except (RuntimeError, ConnectionError, TimeoutError) as e:
@@ -62,9 +114,69 @@ async def lifespan(_app: FastAPI):
 
 
 app = FastAPI(
-    title=settings.APP_NAME, lifespan=lifespan, debug=settings.DEBUG, version="1.0.0"
+    title=settings.APP_NAME,
+    lifespan=lifespan,
+    debug=settings.DEBUG,
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
 )
 
+# Orden (de afuera hacia adentro): contexto -> compresión -> CORS -> caché ->
+# rate limit. La caché queda dentro de CORS para no guardar cabeceras de un
+# Origin concreto; el rate limit, dentro de la caché para que los aciertos no
+# consuman tokens ni cupo de concurrencia.
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        path_prefix="/api/",
+        per_ip_rate=settings.RATE_LIMIT_PER_IP_RATE,
+        per_ip_burst=settings.RATE_LIMIT_PER_IP_BURST,
+        rules=(
+            # Cada login verifica un hash Argon2: limitar protege la CPU
+            RateLimitRule(
+                name="login",
+                path_prefix="/api/v1/auth/login",
+                rate=settings.RATE_LIMIT_LOGIN_PER_MINUTE / 60,
+                burst=settings.RATE_LIMIT_LOGIN_BURST,
+                methods=frozenset({"POST"}),
+            ),
+        ),
+        store=(
+            RedisBucketStore(settings.RATE_LIMIT_REDIS_URL)
+            if settings.RATE_LIMIT_REDIS_URL
+            else InMemoryBucketStore()
+        ),
+        limiter=(
+            AdaptiveConcurrencyLimiter(
+                wait_p95_ms=db_manager.pool_wait_p95_ms,
+                target_wait_ms=settings.LOAD_SHED_TARGET_POOL_WAIT_MS,
+                # Con un pooler en modo transacción no hay cola local que
+                # medir: el límite queda fijo en el máximo
+                min_limit=(
+                    settings.LOAD_SHED_MAX_CONCURRENCY
+                    if settings.DATABASE_POOL_MODE == "transaction"
+                    else settings.LOAD_SHED_MIN_CONCURRENCY
+                ),
+                max_limit=settings.LOAD_SHED_MAX_CONCURRENCY,
+            )
+            if settings.LOAD_SHED_MAX_CONCURRENCY
+            else None
+        ),
+    )
+app.add_middleware(
+    ResponseCacheMiddleware,
+    path_prefix="/api/v1/politics",
+    invalidate_prefix="/api/v1/politics/admin",
+    bypass_patterns=CACHE_BYPASS_PATTERNS,
+    version_source=_change_log_version,
+    version_check_seconds=settings.RESPONSE_CACHE_VERSION_CHECK_SECONDS,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    stale_seconds=settings.RESPONSE_CACHE_STALE_SECONDS,
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    compression_minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
@@ -72,6 +184,13 @@ app.add_middleware(
     allow_methods=settings.CORS_ALLOW_METHODS,
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+app.add_middleware(RequestContextMiddleware)
 
 
 @app.get("/")
@@ -96,10 +215,10 @@ async def health_check():
 @app.exception_handler(Exception)
 async def global_exception_handler(_request, exc):
     if settings.DEBUG:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500, content={"error": str(exc), "type": type(exc).__name__}
         )
-    return JSONResponse(status_code=500, content={"error": "Internal Server Error"})
+    return FastJSONResponse(status_code=500, content={"error": "Internal Server Error"})
 
 
 app.include_router(api_router_v1)
@@ -0,0 +1,258 @@
+"""
+Rate limiting por token bucket y descarte de carga adaptativo.
+
+- Un bucket por IP para toda la API y buckets adicionales por IP y ruta
+  (p. ej. más estrictos en /auth/login, para proteger la CPU de Argon2).
+  Excedido el bucket se responde 429 con Retry-After.
+- Un límite de concurrencia adaptativo (AIMD) guiado por la espera p95 de
+  los pools de conexiones (el peor entre primario y réplicas): si la espera
+  supera el objetivo el límite baja multiplicativamente, y sube de a uno
+  mientras los pools están holgados. Sobre el límite se responde 503 con
+  Retry-After.
+
+Los buckets viven en memoria del worker. Con RATE_LIMIT_REDIS_URL se comparten
+entre workers e instancias (redis es una dependencia opcional).
+"""
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Protocol
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # pragma: no cover - dependencia opcional
+    redis = None
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Bucket por IP para las peticiones que coinciden con método y prefijo."""
+
+    name: str
+    path_prefix: str
+    rate: float  # tokens por segundo
+    burst: int
+    methods: Optional[frozenset[str]] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods is not None and method not in self.methods:
+            return False
+        return path.startswith(self.path_prefix)
+
+
+class BucketStore(Protocol):
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Consume un token. Retorna 0 si se permitió o los segundos a esperar."""
+        ...
+
+
+class InMemoryBucketStore:
+    """Buckets del worker, acotados a `max_keys` con desalojo LRU."""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(burst), now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+# Mismo algoritmo que InMemoryBucketStore, atómico en Redis
+_TAKE_SCRIPT = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + (now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """Buckets compartidos entre workers e instancias."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:") -> None:
+        if redis is None:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but redis is not installed")
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._take = self._client.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        wait = await self._take(
+            keys=[self.prefix + key], args=[rate, burst, time.time()]
+        )
+        return float(wait)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Límite de peticiones simultáneas ajustado por AIMD según la espera p95
+    del pool (`wait_p95_ms`), recalculado como máximo una vez por intervalo.
+    """
+
+    def __init__(
+        self,
+        wait_p95_ms: Callable[[], float],
+        target_wait_ms: float,
+        min_limit: int,
+        max_limit: int,
+        interval_seconds: float = 1.0,
+        decrease_factor: float = 0.75,
+    ) -> None:
+        self.wait_p95_ms = wait_p95_ms
+        self.target_wait_ms = target_wait_ms
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.interval_seconds = interval_seconds
+        self.decrease_factor = decrease_factor
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._adjusted_at = 0.0
+
+    def _adjust(self) -> None:
+        now = time.monotonic()
+        if now - self._adjusted_at < self.interval_seconds:
+            return
+        self._adjusted_at = now
+        if self.wait_p95_ms() > self.target_wait_ms:
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1)
+
+    def try_acquire(self) -> bool:
+        self._adjust()
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+
+async def _reject(
+    send: Send, status_code: int, detail: str, retry_after: float
+) -> None:
+    body = orjson.dumps({"detail": detail})
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class RateLimitMiddleware:
+    """
+    Aplica los buckets por IP y por ruta y el límite de concurrencia a las
+    peticiones bajo `path_prefix`. El cupo de concurrencia se libera al
+    empezar la respuesta: cubre el trabajo con la base de datos pero no la
+    duración de un stream.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path_prefix: str,
+        per_ip_rate: float,
+        per_ip_burst: int,
+        rules: tuple[RateLimitRule, ...] = (),
+        store: Optional[BucketStore] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        shed_retry_after: float = 2.0,
+    ) -> None:
+        self.app = app
+        self.path_prefix = path_prefix
+        self.per_ip_rate = per_ip_rate
+        self.per_ip_burst = per_ip_burst
+        self.rules = rules
+        self.store = store or InMemoryBucketStore()
+        self.limiter = limiter
+        self.shed_retry_after = shed_retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        ip = client[0] if client else "unknown"
+        method, path = scope["method"], scope["path"]
+
+        if self.per_ip_rate > 0:
+            wait = await self.store.take(
+                f"ip:{ip}", self.per_ip_rate, self.per_ip_burst
+            )
+            if wait:
+                await _reject(send, 429, "Demasiadas solicitudes", wait)
+                return
+        for rule in self.rules:
+            if rule.matches(method, path):
+                wait = await self.store.take(f"{rule.name}:{ip}", rule.rate, rule.burst)
+                if wait:
+                    await _reject(send, 429, "Demasiadas solicitudes", wait)
+                    return
+
+        if self.limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not self.limiter.try_acquire():
+            await _reject(
+                send,
+                503,
+                "Servicio saturado, intente nuevamente en unos segundos",
+                self.shed_retry_after,
+            )
+            return
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.limiter.release()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                release()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            release()
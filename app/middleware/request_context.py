@@ -0,0 +1,44 @@
+"""
+Contexto de la petición HTTP en curso.
+Permite que capas sin acceso al Request (p. ej. listeners del engine)
+sepan qué ruta originó el trabajo actual.
+"""
+
+from contextvars import ContextVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_current_scope: ContextVar[Scope | None] = ContextVar("current_scope", default=None)
+
+
+def current_route() -> str | None:
+    """
+    Retorna la ruta en curso como "METHOD /plantilla/{param}".
+    Usa la plantilla de la ruta resuelta por FastAPI y, si aún no existe,
+    el path crudo de la petición.
+    """
+    scope = _current_scope.get()
+    if scope is None:
+        return None
+
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+class RequestContextMiddleware:
+    """Middleware ASGI que publica el scope de la petición en un ContextVar."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
@@ -0,0 +1,389 @@
+"""
+Caché en memoria de respuestas públicas de solo lectura.
+
+Cada entrada guarda el cuerpo sin comprimir y, bajo demanda, una copia por
+codificación (br/gzip): la compresión se paga una sola vez por entrada y los
+aciertos se sirven tal cual, sin recomprimir. Cualquier escritura exitosa
+en las rutas de administración vacía la caché del worker; las de otros
+workers se detectan con `version_source` (la versión del change log),
+consultada como máximo una vez cada `version_check_seconds`.
+
+Las rutas en `bypass_patterns` (datos en vivo: totales, escaños, el feed de
+cambios) nunca se cachean.
+
+Vencido el TTL, una entrada se sigue sirviendo durante `stale_seconds`
+(stale-while-revalidate) mientras una tarea de fondo la recalcula: ninguna
+petición paga la consulta completa por haber llegado justo después del
+vencimiento. `warm_cache` precarga rutas al arrancar.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.compression import compress, is_compressible, negotiate_encoding
+from app.utils.cookies import PRIMARY_READS_COOKIE
+
+logger = logging.getLogger(__name__)
+
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Cabeceras que dependen de la codificación enviada; se recalculan por acierto
+_ENCODING_HEADERS = (b"content-length", b"content-encoding")
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    stored_at: float = field(default_factory=time.monotonic)
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+def cache_key(scope: Scope) -> str:
+    """Ruta + query string normalizado (parámetros ordenados)."""
+    query = scope.get("query_string", b"").decode("latin-1")
+    params = sorted(parse_qsl(query, keep_blank_values=True))
+    return f"{scope['path']}?{urlencode(params)}"
+
+
+class ResponseCacheMiddleware:
+    """
+    Cachea las respuestas 200 de GET bajo `path_prefix` durante `ttl_seconds`,
+    y las sirve vencidas hasta `stale_seconds` más mientras se refrescan.
+
+    No cachea respuestas en streaming ni con Set-Cookie, y no usa la caché
+    para clientes con la ventana de read-your-writes abierta (deben ver sus
+    propias escrituras, que pueden ser más nuevas que la entrada cacheada).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path_prefix: str,
+        invalidate_prefix: str,
+        bypass_patterns: tuple[str, ...] = (),
+        version_source: Callable[[], int] | None = None,
+        version_check_seconds: float = 2,
+        ttl_seconds: float = 30,
+        stale_seconds: float = 0,
+        max_entries: int = 1000,
+        compression_minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+    ) -> None:
+        self.app = app
+        self.path_prefix = path_prefix
+        self.invalidate_prefix = invalidate_prefix
+        self.bypass = [re.compile(pattern) for pattern in bypass_patterns]
+        self.version_source = version_source
+        self.version_check_seconds = version_check_seconds
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.compression_minimum_size = compression_minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        # Claves con un refresco en curso y sus tareas (referencia fuerte)
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        # Cambia con cada clear(): un refresco lanzado antes no repuebla
+        self._generation = 0
+        self._version: int | None = None
+        self._version_checked_at = float("-inf")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._generation += 1
+
+    def _is_cacheable_request(self, scope: Scope) -> bool:
+        if scope["method"] != "GET":
+            return False
+        path = scope["path"]
+        if not path.startswith(self.path_prefix) or path.startswith(
+            self.invalidate_prefix
+        ):
+            return False
+        if any(pattern.search(path) for pattern in self.bypass):
+            return False
+        cookie = Headers(scope=scope).get("cookie", "")
+        return PRIMARY_READS_COOKIE not in cookie
+
+    async def _check_version(self) -> None:
+        """Vacía la caché si cambió la versión (escrituras en otros workers)."""
+        now = time.monotonic()
+        if (
+            self.version_source is None
+            or now - self._version_checked_at < self.version_check_seconds
+        ):
+            return
+        self._version_checked_at = now
+        try:
+            version = await asyncio.to_thread(self.version_source)
+        except Exception as e:
+            logger.warning("Response cache version check failed: %s", e)
+            return
+        if self._version is not None and version != self._version:
+            logger.debug("Response cache cleared after version %s", version)
+            self.clear()
+        self._version = version
+
+    def _get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.age() > self.ttl_seconds + self.stale_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, entry: CachedResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _encoded_body(self, entry: CachedResponse, encoding: str | None) -> bytes:
+        """Cuerpo para la codificación pedida; se comprime una sola vez."""
+        if encoding is None:
+            return entry.body
+        body = entry.encoded.get(encoding)
+        if body is None:
+            body = compress(entry.body, encoding, self.gzip_level, self.brotli_quality)
+            entry.encoded[encoding] = body
+        return body
+
+    async def _send_entry(
+        self, scope: Scope, send: Send, entry: CachedResponse, cache_status: str
+    ) -> None:
+        encoding = None
+        content_type = Headers(raw=entry.headers).get("content-type")
+        if len(entry.body) >= self.compression_minimum_size and is_compressible(
+            content_type
+        ):
+            encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+
+        body = self._encoded_body(entry, encoding)
+        headers = MutableHeaders(raw=list(entry.headers))
+        headers["content-length"] = str(len(body))
+        if encoding is not None:
+            headers["content-encoding"] = encoding
+        headers.add_vary_header("Accept-Encoding")
+        headers["x-cache"] = cache_status
+        headers["age"] = str(int(entry.age()))
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": entry.status,
+                "headers": headers.raw,
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def _fetch(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> CachedResponse | None:
+        """
+        Ejecuta la aplicación y captura la respuesta completa.
+        Si no es cacheable (o es un stream) la reenvía tal cual al cliente y
+        retorna None.
+        """
+        start_message: Message | None = None
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def capture(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] != 200
+                    or "set-cookie" in headers
+                    or "content-encoding" in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                # Respuesta en streaming: no se cachea
+                passthrough = True
+                assert start_message is not None
+                await send(start_message)
+                await send({**message, "body": b"".join(chunks)})
+                chunks.clear()
+
+        await self.app(scope, receive, capture)
+
+        if passthrough or start_message is None:
+            return None
+
+        headers = [
+            (name, value)
+            for name, value in start_message["headers"]
+            if name.lower() not in _ENCODING_HEADERS
+        ]
+        return CachedResponse(
+            status=start_message["status"], headers=headers, body=b"".join(chunks)
+        )
+
+    def _refresh_in_background(self, key: str, scope: Scope) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, scope))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: str, scope: Scope) -> None:
+        generation = self._generation
+        try:
+            entry = await self._fetch(
+                {**scope, "state": dict(scope.get("state", {}))},
+                _request_receiver(),
+                _discard,
+            )
+            if entry is not None and generation == self._generation:
+                self._store(key, entry)
+        except Exception as e:
+            logger.warning("Background refresh of %s failed: %s", key, e)
+        finally:
+            self._refreshing.discard(key)
+
+    async def _call_and_invalidate(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        succeeded = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal succeeded
+            if message["type"] == "http.response.start":
+                succeeded = message["status"] < 400
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        if succeeded and self._entries:
+            logger.debug(
+                "Response cache cleared after %s %s", scope["method"], scope["path"]
+            )
+            self.clear()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.ttl_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] not in _SAFE_METHODS and scope["path"].startswith(
+            self.invalidate_prefix
+        ):
+            await self._call_and_invalidate(scope, receive, send)
+            return
+
+        if not self._is_cacheable_request(scope):
+            await self.app(scope, receive, send)
+            return
+
+        await self._check_version()
+        key = cache_key(scope)
+        entry = self._get(key)
+        if entry is not None:
+            if entry.age() <= self.ttl_seconds:
+                await self._send_entry(scope, send, entry, "HIT")
+                return
+            self._refresh_in_background(key, scope)
+            await self._send_entry(scope, send, entry, "STALE")
+            return
+
+        entry = await self._fetch(scope, receive, send)
+        if entry is None:
+            return
+        self._store(key, entry)
+        await self._send_entry(scope, send, entry, "MISS")
+
+
+def _request_receiver() -> Receive:
+    """`receive` de una petición GET sin cuerpo, para llamadas internas."""
+    sent = False
+
+    async def receive() -> Message:
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    return receive
+
+
+async def _discard(message: Message) -> None:
+    pass
+
+
+async def warm_cache(app: ASGIApp, paths: list[str]) -> int:
+    """
+    Precarga la caché haciendo un GET interno a cada ruta (con su query
+    string) a través de toda la pila de la aplicación. Retorna cuántas
+    respondieron 200.
+    """
+    warmed = 0
+    for path in paths:
+        path, _, query = path.partition("?")
+        status_code = None
+
+        async def send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": query.encode(),
+            "headers": [(b"host", b"localhost")],
+            "client": ("127.0.0.1", 0),
+            "server": ("localhost", 80),
+            "state": {},
+        }
+        try:
+            await app(scope, _request_receiver(), send)
+        except Exception as e:
+            logger.warning("Cache warming of %s failed: %s", path, e)
+            continue
+        if status_code == 200:
+            warmed += 1
+        else:
+            logger.warning("Cache warming of %s returned %s", path, status_code)
+    return warmed
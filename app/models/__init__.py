@@ -6,12 +6,15 @@ from .auth import (
 from .politics import (
     Asistencia,
     Candidato,
+    CandidaturaCard,
+    ChangeLog,
     Denuncia,
     Distrito,
     Legislador,
     PartidoPolitico,
     ProcesoElectoral,
     ProyectoLey,
+    ResultadoAgregado,
 )
 
 __all__ = [
@@ -24,6 +27,9 @@ __all__ = [
     "Legislador",
     "ProcesoElectoral",
     "Candidato",
+    "CandidaturaCard",
+    "ChangeLog",
     "Asistencia",
     "ProyectoLey",
+    "ResultadoAgregado",
 ]
@@ -1,13 +1,10 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from cuid2 import Cuid
+from sqlalchemy import Index
 from sqlmodel import Column, DateTime, Field, Relationship, SQLModel
 
-
-def cuid_factory():
-    """Generate cuid id"""
-    return Cuid().generate()
+from app.utils.ids import new_id
 
 
 def utc_now():
@@ -16,6 +13,11 @@ def utc_now():
 
 
 class UserToken(SQLModel, table=True):
+    __table_args__ = (
+        # Sesiones activas de un usuario (refresh y límite de sesiones)
+        Index("ix_usertoken_user_id_expires_at", "user_id", "expires_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: str = Field(foreign_key="user.id")
     access_key: Optional[str] = Field(default=None, index=True, max_length=250)
@@ -30,14 +32,14 @@ class UserToken(SQLModel, table=True):
         sa_column=Column(DateTime(timezone=True), nullable=True), default=None
     )
     expires_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True), nullable=False)
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
     )
 
     user: "User" = Relationship(back_populates="tokens")
 
 
 class User(SQLModel, table=True):
-    id: str = Field(default_factory=cuid_factory, primary_key=True)
+    id: str = Field(default_factory=new_id, primary_key=True)
     name: Optional[str] = Field(default=None, max_length=150)
     email: str = Field(default=None, unique=True)
     email_verified: Optional[datetime] = None
@@ -55,12 +57,12 @@ class User(SQLModel, table=True):
 
 
 class VerificationToken(SQLModel, table=True):
-    id: str = Field(default_factory=cuid_factory, primary_key=True)
+    id: str = Field(default_factory=new_id, primary_key=True)
     email: str = Field(nullable=False, max_length=255)
     token: str = Field(nullable=False, unique=True, max_length=255)
 
     expires_at: datetime = Field(
-        sa_column=Column(DateTime(timezone=True), nullable=False)
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
     )
     created_at: datetime = Field(
         sa_column=Column(DateTime(timezone=True), nullable=False),
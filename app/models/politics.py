@@ -2,19 +2,64 @@ from datetime import date, datetime, timezone
 from enum import Enum
 from typing import List, Optional
 
-from cuid2 import Cuid
 from pydantic import BaseModel
+from sqlalchemy import BigInteger, Computed, Index, Integer, literal_column, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import GenericFunction
 from sqlmodel import JSON, Column, DateTime, Field, Relationship, SQLModel, Text
 
-
-def cuid_factory():
-    return Cuid().generate()
+from app.utils.ids import new_id
 
 
 def utc_now():
     return datetime.now(timezone.utc)
 
 
+# JSONB en Postgres (indexable con GIN), JSON en el resto (SQLite en desarrollo)
+JSON_VARIANT = JSON().with_variant(JSONB(), "postgresql")
+
+
+class json_array_length(GenericFunction):
+    """Largo de un arreglo JSON; 0 si la columna es NULL o no es un arreglo."""
+
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(json_array_length)
+def _json_array_length(element, compiler, **kw):
+    return f"coalesce(json_array_length({compiler.process(element.clauses, **kw)}), 0)"
+
+
+@compiles(json_array_length, "postgresql")
+def _jsonb_array_length(element, compiler, **kw):
+    value = compiler.process(element.clauses, **kw)
+    return (
+        f"CASE WHEN jsonb_typeof({value}) = 'array' "
+        f"THEN jsonb_array_length({value}) ELSE 0 END"
+    )
+
+
+def json_count_column(source: str) -> Column:
+    """Columna generada con el largo del arreglo JSON `source`."""
+    return Column(
+        Integer,
+        Computed(json_array_length(literal_column(source)), persisted=True),
+        nullable=False,
+    )
+
+
+def gin_index(name: str, column: str) -> Index:
+    """Índice GIN (jsonb_path_ops, para @>); solo se crea en Postgres."""
+    return Index(
+        name,
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "jsonb_path_ops"},
+    ).ddl_if(dialect="postgresql")
+
+
 # ============= ENUMS =============
 class TipoCamara(str, Enum):
     CONGRESO = "Congreso"
@@ -80,7 +125,25 @@ class Persona(SQLModel, table=True):
     Almacena información biográfica que no cambia entre candidaturas o periodos.
     """
 
-    id: str = Field(default_factory=cuid_factory, primary_key=True)
+    __table_args__ = (
+        gin_index("ix_persona_antecedentes_penales_gin", "antecedentes_penales"),
+        gin_index("ix_persona_antecedentes_judiciales_gin", "antecedentes_judiciales"),
+        gin_index("ix_persona_experiencia_laboral_gin", "experiencia_laboral"),
+        Index(
+            "ix_persona_con_antecedentes_penales",
+            "num_antecedentes_penales",
+            postgresql_where=text("num_antecedentes_penales > 0"),
+            sqlite_where=text("num_antecedentes_penales > 0"),
+        ),
+        Index(
+            "ix_persona_con_antecedentes_judiciales",
+            "num_antecedentes_judiciales",
+            postgresql_where=text("num_antecedentes_judiciales > 0"),
+            sqlite_where=text("num_antecedentes_judiciales > 0"),
+        ),
+    )
+
+    id: str = Field(default_factory=new_id, primary_key=True)
 
     # Identificación básica y única
     dni: str = Field(unique=True, max_length=20, index=True)
@@ -102,14 +165,24 @@ class Persona(SQLModel, table=True):
     post_grado: Optional[str] = Field(default=None, max_length=300)
     hoja_vida_url: Optional[str] = Field(default=None)
     experiencia_laboral: Optional[List[ExperienciaLaboral]] = Field(
-        default=None, sa_column=Column(JSON)
+        default=None, sa_column=Column(JSON_VARIANT)
     )
     # Antecedentes
     antecedentes_penales: Optional[List[Antecedente]] = Field(
-        default=None, sa_column=Column(JSON)
+        default=None, sa_column=Column(JSON_VARIANT)
     )
     antecedentes_judiciales: Optional[List[Antecedente]] = Field(
-        default=None, sa_column=Column(JSON)
+        default=None, sa_column=Column(JSON_VARIANT)
+    )
+    # Calculadas por la base de datos a partir de los arreglos de arriba
+    num_antecedentes_penales: Optional[int] = Field(
+        default=None, sa_column=json_count_column("antecedentes_penales")
+    )
+    num_antecedentes_judiciales: Optional[int] = Field(
+        default=None, sa_column=json_count_column("antecedentes_judiciales")
+    )
+    num_experiencia_laboral: Optional[int] = Field(
+        default=None, sa_column=json_count_column("experiencia_laboral")
     )
 
     # Redes sociales
@@ -135,7 +208,11 @@ class HistorialPartido(BaseModel):
 class PartidoPolitico(SQLModel, table=True):
     """Organizaciones políticas que presentan candidatos"""
 
-    id: str = Field(default_factory=cuid_factory, primary_key=True)
+    __table_args__ = (
+        gin_index("ix_partidopolitico_historia_timeline_gin", "historia_timeline"),
+    )
+
+    id: str = Field(default_factory=new_id, primary_key=True)
     nombre: str = Field(max_length=200, unique=True, index=True)
     sigla: str = Field(max_length=20, index=True)
     logo_url: Optional[str] = Field(default=None)
@@ -158,10 +235,10 @@ class PartidoPolitico(SQLModel, table=True):
     gasto_campana_ultima: Optional[float] = Field(default=None)
     fuente_financiamiento: Optional[str] = Field(default=None, max_length=500)
 
-    # Timeline e historia (almacenado como JSON)
+    # Timeline e historia (almacenado como JSONB)
     historia_timeline: Optional[List[HistorialPartido]] = Field(
-        default=None, sa_column=Column(JSON)
-    )  # JSON string
+        default=None, sa_column=Column(JSON_VARIANT)
+    )
 
     # Redes sociales
     facebook_url: Optional[str] = Field(default=None)
@@ -186,7 +263,7 @@ class PartidoPolitico(SQLModel, table=True):
 class Distrito(SQLModel, table=True):
     """Distritos electorales de Perú."""
 
-    id: str = Field(default_factory=cuid_factory, primary_key=True)
+    id: str = Field(default_factory=new_id, primary_key=True)
     nombre: str = Field(max_length=100, unique=True, index=True)
     codigo: str = Field(max_length=10, unique=True)
     es_distrito_nacional: bool = Field(default=False)
@@ -206,7 +283,7 @@ class Distrito(SQLModel, table=True):
 class ProcesoElectoral(SQLModel, table=True):
     """Define un evento electoral específico."""
 
-    id: str = Field(default_factory=cuid_factory, primary_key=True)
+    id: str = Field(default_factory=new_id, primary_key=True)
     nombre: str = Field(max_length=200)  # "Elecciones Generales 2026"
     año: int = Field(index=True)
     fecha_elecciones: datetime
@@ -229,7 +306,19 @@ class Legislador(SQLModel, table=True):
     Una persona puede tener varios de estos registros si fue reelegida.
     """
 
-    id: str = Field(default_factory=cuid_factory, primary_key=True)
+    __table_args__ = (
+        # Filtro de legisladores en funciones por cámara (lista de personas)
+        Index(
+            "ix_legislador_activo_camara",
+            "camara",
+            "persona_id",
+            postgresql_include=["partido_id", "distrito_id"],
+            postgresql_where=text("esta_activo"),
+            sqlite_where=text("esta_activo"),
+        ),
+    )
+
+    id: str = Field(default_factory=new_id, primary_key=True)
     persona_id: str = Field(foreign_key="persona.id", index=True)
 
     # Información del cargo en este periodo específico
@@ -262,7 +351,18 @@ class Candidato(SQLModel, table=True):
     Representa UNA POSTULACIÓN de una Persona a un cargo en un ProcesoElectoral.
     """
 
-    id: str = Field(default_factory=cuid_factory, primary_key=True)
+    __table_args__ = (
+        # Lista de candidaturas filtrada por proceso/tipo/estado y ordenada por fecha
+        Index(
+            "ix_candidato_proceso_tipo_estado_created",
+            "proceso_electoral_id",
+            "tipo",
+            "estado",
+            "created_at",
+        ),
+    )
+
+    id: str = Field(default_factory=new_id, primary_key=True)
     persona_id: str = Field(foreign_key="persona.id", index=True)
     proceso_electoral_id: str = Field(foreign_key="procesoelectoral.id", index=True)
 
@@ -270,7 +370,7 @@ class Candidato(SQLModel, table=True):
     tipo: TipoCandidatura = Field(index=True)
     partido_id: str = Field(foreign_key="partidopolitico.id", index=True)
     distrito_id: Optional[str] = Field(
-        default=None, foreign_key="distrito.id"
+        default=None, foreign_key="distrito.id", index=True
     )  # Null para Presidente/Vice
     numero_lista: Optional[int] = Field(default=None)
 
@@ -303,7 +403,13 @@ class Candidato(SQLModel, table=True):
 class ProyectoLey(SQLModel, table=True):
     """Proyectos de ley presentados por un legislador en un periodo concreto"""
 
-    id: str = Field(default_factory=cuid_factory, primary_key=True)
+    __table_args__ = (
+        Index(
+            "ix_proyectoley_legislador_fecha", "legislador_id", "fecha_presentacion"
+        ),
+    )
+
+    id: str = Field(default_factory=new_id, primary_key=True)
     legislador_id: str = Field(foreign_key="legislador.id", index=True)
     numero: str = Field(max_length=50, unique=True, index=True)
     titulo: str = Field(max_length=500)
@@ -322,7 +428,7 @@ class ProyectoLey(SQLModel, table=True):
 class Asistencia(SQLModel, table=True):
     """Registro de asistencias a sesiones durante un periodo legislativo"""
 
-    id: str = Field(default_factory=cuid_factory, primary_key=True)
+    id: str = Field(default_factory=new_id, primary_key=True)
     legislador_id: str = Field(foreign_key="legislador.id", index=True)
     fecha: datetime = Field(index=True)
     tipo_sesion: str
@@ -338,7 +444,7 @@ class Asistencia(SQLModel, table=True):
 class Denuncia(SQLModel, table=True):
     """Denuncias contra un legislador durante su periodo"""
 
-    id: str = Field(default_factory=cuid_factory, primary_key=True)
+    id: str = Field(default_factory=new_id, primary_key=True)
     legislador_id: str = Field(foreign_key="legislador.id", index=True)
     titulo: str = Field(max_length=300)
     descripcion: str = Field(sa_column=Column(Text))
@@ -353,3 +459,95 @@ class Denuncia(SQLModel, table=True):
     )
 
     legislador: "Legislador" = Relationship(back_populates="denuncias")
+
+
+# ============= REGISTRO DE CAMBIOS =============
+
+
+class ChangeLog(SQLModel, table=True):
+    """
+    Registro append-only de escrituras en las entidades políticas.
+    El ID autoincremental es la versión: los clientes sincronizan pidiendo
+    los cambios con versión mayor a la última que vieron.
+    """
+
+    __tablename__ = "change_log"
+    __table_args__ = (Index("ix_change_log_entity_version", "entity_type", "version"),)
+
+    version: Optional[int] = Field(default=None, primary_key=True)
+    entity_type: str = Field(max_length=50)
+    entity_id: str
+    operation: str = Field(max_length=10)
+    changed_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=utc_now,
+    )
+
+
+# ============= MODELOS DE LECTURA =============
+
+
+class CandidaturaCard(SQLModel, table=True):
+    """
+    Modelo de lectura desnormalizado para la lista de candidaturas.
+    Guarda ya serializado lo que necesita CandidaturaListResponse (persona,
+    partido, distrito y proceso) junto con las columnas de filtro, para que
+    la lista sea un único recorrido indexado sin joins.
+    Lo mantienen las escrituras de app.services.politics
+    (ver app.services.candidatura_cards).
+    """
+
+    __tablename__ = "candidatura_card"
+    __table_args__ = (
+        Index(
+            "ix_candidatura_card_proceso_tipo_estado_created",
+            "proceso_electoral_id",
+            "tipo",
+            "estado",
+            "created_at",
+        ),
+    )
+
+    candidatura_id: str = Field(
+        foreign_key="candidato.id", primary_key=True, ondelete="CASCADE"
+    )
+    persona_id: str = Field(index=True)
+    proceso_electoral_id: str
+    tipo: TipoCandidatura
+    estado: EstadoCandidatura
+    partido_nombre: str = Field(index=True)
+    distrito_nombre: Optional[str] = Field(default=None, index=True)
+    # nombre_completo + nombres + apellidos en minúsculas, para `search`
+    nombre_busqueda: str
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+    # JSON de CandidaturaListResponse, listo para enviarse tal cual
+    payload: str = Field(sa_column=Column(Text, nullable=False))
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=utc_now,
+    )
+
+
+class ResultadoAgregado(SQLModel, table=True):
+    """
+    Total de votos por proceso, tipo de candidatura, partido y distrito.
+    La ingesta de resultados le aplica deltas en la misma transacción que
+    actualiza las candidaturas; una reconciliación periódica lo compara con
+    SUM(votos_obtenidos) (ver app.services.tallies).
+    """
+
+    __tablename__ = "resultado_agregado"
+
+    proceso_electoral_id: str = Field(primary_key=True)
+    tipo: TipoCandidatura = Field(primary_key=True)
+    partido_id: str = Field(primary_key=True)
+    # "" para candidaturas sin distrito (Presidente/Vicepresidente)
+    distrito_id: str = Field(default="", primary_key=True)
+    votos: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=utc_now,
+    )
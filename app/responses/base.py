@@ -1,4 +1,36 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, ConfigDict
 
+
 class BaseResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True, arbitrary_types_allowed=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, arbitrary_types_allowed=True)
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Tipos que orjson no serializa de forma nativa."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Respuesta JSON renderizada con orjson.
+    Serializa de forma nativa datetime/date (ISO 8601), enums (por valor),
+    UUID, dataclasses y arrays de NumPy; el resto pasa por _orjson_default.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
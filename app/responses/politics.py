@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -40,6 +40,8 @@ class PersonaBaseResponse(BaseModel):
     # Antecedentes
     antecedentes_penales: Optional[List[Antecedente]] = []
     antecedentes_judiciales: Optional[List[Antecedente]] = []
+    num_antecedentes_penales: int = 0
+    num_antecedentes_judiciales: int = 0
 
     # Redes sociales
     facebook_url: Optional[str] = None
@@ -59,9 +61,12 @@ class PeriodoLegisladorResponse(BaseModel):
     periodo_inicio: datetime
     periodo_fin: datetime
     esta_activo: bool
-    partido: "PartidoPoliticoResponse"
-    distrito: "DistritoElectoralResponse"
+    partido: Optional["PartidoPoliticoResponse"] = None
+    distrito: Optional["DistritoElectoralResponse"] = None
+    # Solo los proyectos más recientes; el resto se pagina con el cursor
     proyectos_ley: List["ProyectoLeyResponse"] = []
+    total_proyectos_ley: Optional[int] = None
+    proyectos_ley_next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -113,12 +118,13 @@ class CandidaturaListResponse(CandidaturaBaseResponse):
     """
     Response para lista de candidaturas.
     Incluye información resumida de persona, partido, distrito.
+    Partido y proceso pueden omitirse si no se piden en `include`.
     """
 
     persona: "PersonaBaseResponse"
-    partido: "PartidoPoliticoResponse"
+    partido: Optional["PartidoPoliticoResponse"] = None
     distrito: Optional["DistritoElectoralResponse"] = None
-    proceso_electoral: "ProcesoElectoralResponse"
+    proceso_electoral: Optional["ProcesoElectoralResponse"] = None
 
 
 class CandidaturaDetailResponse(CandidaturaBaseResponse):
@@ -236,6 +242,100 @@ class ProcesoElectoralResponse(BaseModel):
         from_attributes = True
 
 
+class EscanosPartidoResponse(BaseModel):
+    """Escaños proyectados de un partido en una cámara"""
+
+    partido_id: str
+    nombre: Optional[str] = None
+    sigla: Optional[str] = None
+    votos: int
+    porcentaje: float
+    supera_valla: bool
+    escanos: int
+    escanos_por_distrito: Dict[str, int] = {}
+    electos: List[str] = []
+
+
+class EscanosCamaraResponse(BaseModel):
+    """Reparto de una cámara por cifra repartidora"""
+
+    camara: TipoCandidatura
+    total_escanos: int
+    votos_validos: int
+    partidos: List[EscanosPartidoResponse] = []
+
+
+class EscanosProcesoResponse(BaseModel):
+    """Proyección de escaños de un proceso electoral"""
+
+    proceso_electoral_id: str
+    version: int
+    camaras: List[EscanosCamaraResponse] = []
+    duracion_ms: float
+
+
+class SimulacionPartidoResponse(BaseModel):
+    """Distribución simulada de escaños de un partido"""
+
+    partido_id: str
+    nombre: Optional[str] = None
+    sigla: Optional[str] = None
+    votos_base: int
+    escanos_media: float
+    escanos_p05: int
+    escanos_mediana: int
+    escanos_p95: int
+    prob_supera_valla: float
+    prob_mayoria: float
+    distribucion: Dict[int, float] = {}
+
+
+class SimulacionCamaraResponse(BaseModel):
+    """Resultado de la simulación para una cámara"""
+
+    camara: TipoCandidatura
+    total_escanos: int
+    hash: str
+    duracion_ms: float
+    partidos: List[SimulacionPartidoResponse] = []
+
+
+class SimulacionResponse(BaseModel):
+    """Simulación Monte Carlo de escaños de un proceso electoral"""
+
+    proceso_electoral_id: str
+    escenarios: int
+    camaras: List[SimulacionCamaraResponse] = []
+
+
+class TotalVotosResponse(BaseModel):
+    """Votos de un grupo (partido y/o distrito) para un tipo de candidatura"""
+
+    tipo: TipoCandidatura
+    partido_id: Optional[str] = None
+    distrito_id: Optional[str] = None
+    votos: int
+
+
+class TotalesProcesoResponse(BaseModel):
+    """Totales de votos de un proceso electoral"""
+
+    proceso_electoral_id: str
+    total: int
+    totales: List[TotalVotosResponse] = []
+
+
+class IngestResultadosResponse(BaseModel):
+    """Resumen de una ingesta de resultados"""
+
+    recibidas: int
+    actualizadas: int
+    sin_cambios: int
+    no_encontradas: List[str] = []
+    lotes: int
+    duracion_ms: float
+
+
 # ==============================================================================
 # == PROYECTOS DE LEY
 # ==============================================================================
@@ -257,6 +357,13 @@ class ProyectoLeyResponse(BaseModel):
         from_attributes = True
 
 
+class ProyectoLeyPageResponse(BaseModel):
+    """Página de proyectos de ley (paginación keyset)"""
+
+    items: List[ProyectoLeyResponse] = []
+    next_cursor: Optional[str] = None
+
+
 # ==============================================================================
 # == ASISTENCIAS
 # ==============================================================================
@@ -312,6 +419,32 @@ class EstadisticasLegisladorResponse(BaseModel):
     denuncias_activas: int = 0
 
 
+# ==============================================================================
+# == REGISTRO DE CAMBIOS
+# ==============================================================================
+
+
+class ChangeResponse(BaseModel):
+    """Última operación conocida sobre una entidad"""
+
+    version: int
+    entity_type: str
+    entity_id: str
+    operation: str
+    changed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ChangeFeedResponse(BaseModel):
+    """Página del registro de cambios"""
+
+    changes: List[ChangeResponse] = []
+    next_since: int
+    has_more: bool = False
+
+
 # Resolver referencias circulares
 PersonaDetailResponse.model_rebuild()
 CandidaturaListResponse.model_rebuild()
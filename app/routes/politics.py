@@ -1,20 +1,34 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
-from app.config.database import get_session
+from app.config.database import (
+    db_manager,
+    get_read_session,
+    get_session,
+    use_primary_after_write,
+)
 from app.config.security import get_current_user, oauth2_scheme
+from app.config.settings import get_settings
 from app.models.politics import EstadoCandidatura, TipoCamara, TipoCandidatura
 from app.responses.politics import (
     CandidaturaDetailResponse,
+    ChangeFeedResponse,
+    CandidaturaListResponse,
     DistritoElectoralResponse,
+    EscanosProcesoResponse,
+    IngestResultadosResponse,
     PartidoPoliticoDetailResponse,
     PartidoPoliticoResponse,
     PersonaDetailResponse,
     PersonaListResponse,
     ProcesoElectoralResponse,
+    ProyectoLeyPageResponse,
     ProyectoLeyResponse,
+    SimulacionResponse,
+    TotalesProcesoResponse,
 )
 from app.schemas.politics import (
     CreateCandidaturaRequest,
@@ -22,9 +36,53 @@ from app.schemas.politics import (
     CreatePartidoRequest,
     CreatePersonaRequest,
     CreateProcesoElectoralRequest,
+    IngestResultadosRequest,
+    SimulacionRequest,
     UpdatePersonaRequest,
 )
-from app.services import politics
+from app.services import (
+    candidatura_cards,
+    changes,
+    politics,
+    results_ingestion,
+    seats,
+    simulations,
+    tallies,
+)
+from app.services.live_results import live_results
+from app.services.loaders import (
+    CANDIDATURA_DEFAULT_INCLUDE,
+    CANDIDATURA_INCLUDES,
+    PERSONA_DETAIL_DEFAULT_INCLUDE,
+    PERSONA_INCLUDES,
+    PERSONA_LIST_DEFAULT_INCLUDE,
+    PERSONA_LIST_INCLUDES,
+    parse_include,
+)
+from app.utils.fieldsets import parse_fields, sparse_response
+
+FIELDS_DESCRIPTION = "Campos a devolver, separados por coma (ej: id,nombre_completo)"
+INCLUDE_DESCRIPTION = "Relaciones a cargar, separadas por coma (ej: periodos.partido)"
+BATCH_IDS_DESCRIPTION = "IDs separados por coma o repetidos (?ids=a&ids=b)"
+PROYECTOS_LIMIT_DESCRIPTION = "Proyectos de ley más recientes a embeber por periodo"
+
+settings = get_settings()
+
+
+def parse_batch_ids(ids: List[str]) -> List[str]:
+    """IDs únicos en el orden pedido, acotados por BATCH_MAX_IDS."""
+    unique = list(
+        dict.fromkeys(
+            part.strip() for value in ids for part in value.split(",") if part.strip()
+        )
+    )
+    if len(unique) > settings.BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Se permiten como máximo {settings.BATCH_MAX_IDS} IDs por petición",
+        )
+    return unique
+
 
 # ====== RUTAS PÚBLICAS ======
 politics_public_router = APIRouter(
@@ -49,15 +107,35 @@ async def get_personas_list(
     partidos: Optional[List[str]] = Query(None),
     distritos: Optional[List[str]] = Query(None),
     search: Optional[str] = Query(None, description="Buscar por nombre completo o DNI"),
+    con_antecedentes_penales: Optional[bool] = Query(None),
+    con_antecedentes_judiciales: Optional[bool] = Query(None),
+    antecedente_tipo: Optional[str] = Query(
+        None, description="Tipo de antecedente (penal o judicial), p. ej. 'penal'"
+    ),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    session: Session = Depends(get_session),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(
+        None,
+        description=f"{INCLUDE_DESCRIPTION}. Por defecto: {PERSONA_LIST_DEFAULT_INCLUDE}",
+    ),
+    proyectos_limit: int = Query(
+        politics.PROYECTOS_POR_PERIODO,
+        ge=1,
+        le=100,
+        description=PROYECTOS_LIMIT_DESCRIPTION,
+    ),
+    session: Session = Depends(get_read_session),
 ):
     """
     Endpoint principal para obtener legisladores actuales.
     Útil para mostrar el Congreso actual, o futuros Senado/Diputados.
     """
-    return await politics.get_personas_list(
+    selected = parse_fields(fields, PersonaListResponse)
+    relations = parse_include(
+        include, PERSONA_LIST_INCLUDES, PERSONA_LIST_DEFAULT_INCLUDE
+    )
+    personas = await politics.get_personas_list(
         session=session,
         es_legislador_activo=es_legislador_activo,
         camara=camara,
@@ -66,6 +144,43 @@ async def get_personas_list(
         search=search,
         skip=skip,
         limit=limit,
+        fields=selected,
+        include=relations,
+        proyectos_limit=proyectos_limit,
+        con_antecedentes_penales=con_antecedentes_penales,
+        con_antecedentes_judiciales=con_antecedentes_judiciales,
+        antecedente_tipo=antecedente_tipo,
+    )
+    return sparse_response(PersonaListResponse, selected, personas, many=True)
+
+
+@politics_public_router.get(
+    "/personas:batch",
+    status_code=status.HTTP_200_OK,
+    response_model=Dict[str, Optional[PersonaDetailResponse]],
+    summary="Obtener varias personas por ID",
+)
+async def get_personas_batch(
+    ids: List[str] = Query(..., description=BATCH_IDS_DESCRIPTION),
+    include: Optional[str] = Query(
+        None,
+        description=f"{INCLUDE_DESCRIPTION}. Por defecto: {PERSONA_DETAIL_DEFAULT_INCLUDE}",
+    ),
+    proyectos_limit: int = Query(
+        politics.PROYECTOS_POR_PERIODO,
+        ge=1,
+        le=100,
+        description=PROYECTOS_LIMIT_DESCRIPTION,
+    ),
+    session: Session = Depends(get_read_session),
+):
+    """
+    Reemplaza N llamadas a /personas/{id} (p. ej. el comparador de candidatos).
+    Retorna un objeto indexado por ID en el orden pedido; null si no existe.
+    """
+    relations = parse_include(include, PERSONA_INCLUDES, PERSONA_DETAIL_DEFAULT_INCLUDE)
+    return await politics.get_personas_batch(
+        parse_batch_ids(ids), session, relations, proyectos_limit
     )
 
 
@@ -75,7 +190,21 @@ async def get_personas_list(
     response_model=PersonaDetailResponse,
     summary="Detalle completo de una persona política",
 )
-async def get_persona_detail(persona_id: str, session: Session = Depends(get_session)):
+async def get_persona_detail(
+    persona_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(
+        None,
+        description=f"{INCLUDE_DESCRIPTION}. Por defecto: {PERSONA_DETAIL_DEFAULT_INCLUDE}",
+    ),
+    proyectos_limit: int = Query(
+        politics.PROYECTOS_POR_PERIODO,
+        ge=1,
+        le=100,
+        description=PROYECTOS_LIMIT_DESCRIPTION,
+    ),
+    session: Session = Depends(get_read_session),
+):
     """
     Obtiene toda la información de una persona:
     - Datos biográficos
@@ -83,7 +212,12 @@ async def get_persona_detail(persona_id: str, session: Session = Depends(get_ses
     - Historial de candidaturas
     - Proyectos de ley
     """
-    return await politics.get_persona_by_id(persona_id, session)
+    selected = parse_fields(fields, PersonaDetailResponse)
+    relations = parse_include(include, PERSONA_INCLUDES, PERSONA_DETAIL_DEFAULT_INCLUDE)
+    persona = await politics.get_persona_by_id(
+        persona_id, session, selected, relations, proyectos_limit
+    )
+    return sparse_response(PersonaDetailResponse, selected, persona)
 
 
 @politics_public_router.get(
@@ -96,12 +230,33 @@ async def get_persona_proyectos(
     persona_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
 ):
     """Obtiene todos los proyectos de ley presentados por la persona en todos sus periodos."""
     return await politics.get_proyectos_by_persona(persona_id, session, skip, limit)
 
 
+@politics_public_router.get(
+    "/periodos/{periodo_id}/proyectos",
+    status_code=status.HTTP_200_OK,
+    response_model=ProyectoLeyPageResponse,
+    summary="Proyectos de ley de un periodo legislativo (paginado por cursor)",
+)
+async def get_periodo_proyectos(
+    periodo_id: str,
+    cursor: Optional[str] = Query(
+        None, description="proyectos_ley_next_cursor o next_cursor de la página previa"
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    session: Session = Depends(get_read_session),
+):
+    """
+    Continúa la lista de proyectos embebida en el detalle de la persona,
+    del más reciente al más antiguo, sin OFFSET.
+    """
+    return await politics.get_proyectos_by_periodo(periodo_id, session, cursor, limit)
+
+
 # ========== CANDIDATURAS Y PROCESOS ELECTORALES ==========
 
 
@@ -115,7 +270,7 @@ async def get_procesos_electorales(
     activo: Optional[bool] = Query(
         None, description="Filtrar por procesos activos/inactivos"
     ),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
 ):
     """Obtiene los procesos electorales disponibles (ej: Elecciones 2026)"""
     return await politics.get_procesos_electorales(session, activo)
@@ -129,12 +284,94 @@ async def get_procesos_electorales(
 )
 async def get_proceso_electoral_detail(
     proceso_id: str,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
 ):
     """Obtiene información detallada de un proceso electoral específico"""
     return await politics.get_proceso_electoral_by_id(proceso_id, session)
 
 
+@politics_public_router.get(
+    "/procesos-electorales/{proceso_id}/escanos",
+    status_code=status.HTTP_200_OK,
+    response_model=EscanosProcesoResponse,
+    summary="Proyección de escaños por partido y cámara",
+)
+async def get_escanos(
+    proceso_id: str,
+    session: Session = Depends(get_read_session),
+):
+    """
+    Reparto por cifra repartidora (D'Hondt) con valla y voto preferencial,
+    calculado con los votos actuales de todas las candidaturas del proceso.
+    """
+    return await seats.get_escanos(proceso_id, session)
+
+
+@politics_public_router.get(
+    "/procesos-electorales/{proceso_id}/totales",
+    status_code=status.HTTP_200_OK,
+    response_model=TotalesProcesoResponse,
+    summary="Totales de votos por partido y distrito",
+)
+async def get_totales(
+    proceso_id: str,
+    tipo: Optional[TipoCandidatura] = Query(None, description="Tipo de candidatura"),
+    agrupar: str = Query("partido", description="partido, distrito o partido,distrito"),
+    session: Session = Depends(get_read_session),
+):
+    """
+    Totales mantenidos por la ingesta de resultados (sin recorrer las
+    candidaturas en cada petición).
+    """
+    return await tallies.get_totales(proceso_id, session, tipo, agrupar)
+
+
+@politics_public_router.post(
+    "/procesos-electorales/{proceso_id}/simulaciones",
+    status_code=status.HTTP_200_OK,
+    response_model=SimulacionResponse,
+    summary="Simulación Monte Carlo de escaños",
+)
+async def simulate_escanos(
+    proceso_id: str,
+    data: SimulacionRequest,
+    session: Session = Depends(get_read_session),
+):
+    """
+    Perturba los votos actuales (con `ajustes` opcionales por partido) y
+    reparte cada escenario: distribución de escaños, probabilidad de superar
+    la valla y de obtener mayoría por partido.
+    """
+    return await simulations.simulate(proceso_id, data, session)
+
+
+@politics_public_router.get(
+    "/procesos-electorales/{proceso_id}/resultados/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Resultados en vivo (Server-Sent Events)",
+    responses={503: {"description": "Límite de clientes conectados alcanzado"}},
+)
+async def stream_resultados(
+    proceso_id: str,
+    distrito_id: Optional[str] = Query(None, description="Filtrar por distrito"),
+    session: Session = Depends(get_read_session),
+):
+    """
+    Envía un evento `snapshot` con los votos actuales y luego eventos
+    `resultados` con las candidaturas que cambiaron (agrupadas por intervalo).
+    """
+    await politics.get_proceso_electoral_by_id(proceso_id, session)
+    # El stream no usa esta sesión: liberar la conexión mientras dure
+    session.close()
+    live_results.ensure_capacity()
+    return StreamingResponse(
+        live_results.stream(proceso_id, distrito_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @politics_public_router.get(
     "/candidaturas",
     status_code=status.HTTP_200_OK,
@@ -149,15 +386,85 @@ async def get_candidaturas_list(
     distritos: Optional[List[str]] = Query(None),
     estado: Optional[EstadoCandidatura] = Query(None),
     search: Optional[str] = Query(None),
+    con_antecedentes_penales: Optional[bool] = Query(None),
+    con_antecedentes_judiciales: Optional[bool] = Query(None),
+    antecedente_tipo: Optional[str] = Query(
+        None, description="Tipo de antecedente (penal o judicial), p. ej. 'penal'"
+    ),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    session: Session = Depends(get_session),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    session: Session = Depends(get_read_session),
 ):
     """
     Obtiene lista de candidaturas para mostrar en el frontend.
     Útil para mostrar candidatos a Senadores, Diputados, etc.
     """
-    return await politics.get_candidaturas_list(
+    selected = parse_fields(fields, CandidaturaDetailResponse)
+    candidaturas = await politics.get_candidaturas_list(
+        session=session,
+        proceso_electoral_id=proceso_electoral_id,
+        tipo=tipo,
+        partidos=partidos,
+        distritos=distritos,
+        estado=estado,
+        search=search,
+        skip=skip,
+        limit=limit,
+        fields=selected,
+        con_antecedentes_penales=con_antecedentes_penales,
+        con_antecedentes_judiciales=con_antecedentes_judiciales,
+        antecedente_tipo=antecedente_tipo,
+    )
+    return sparse_response(CandidaturaDetailResponse, selected, candidaturas, many=True)
+
+
+@politics_public_router.get(
+    "/candidaturas:batch",
+    status_code=status.HTTP_200_OK,
+    response_model=Dict[str, Optional[CandidaturaDetailResponse]],
+    summary="Obtener varias candidaturas por ID",
+)
+async def get_candidaturas_batch(
+    ids: List[str] = Query(..., description=BATCH_IDS_DESCRIPTION),
+    include: Optional[str] = Query(
+        None,
+        description=f"{INCLUDE_DESCRIPTION}. Por defecto: {CANDIDATURA_DEFAULT_INCLUDE}",
+    ),
+    session: Session = Depends(get_read_session),
+):
+    """Retorna un objeto indexado por ID en el orden pedido; null si no existe."""
+    relations = parse_include(
+        include, CANDIDATURA_INCLUDES, CANDIDATURA_DEFAULT_INCLUDE
+    )
+    return await politics.get_candidaturas_batch(
+        parse_batch_ids(ids), session, relations
+    )
+
+
+@politics_public_router.get(
+    "/candidaturas/cards",
+    status_code=status.HTTP_200_OK,
+    response_model=List[CandidaturaListResponse],
+    summary="Tarjetas de candidaturas (modelo de lectura)",
+)
+async def get_candidatura_cards(
+    proceso_electoral_id: Optional[str] = Query(None),
+    tipo: Optional[TipoCandidatura] = Query(None),
+    partidos: Optional[List[str]] = Query(None),
+    distritos: Optional[List[str]] = Query(None),
+    estado: Optional[EstadoCandidatura] = Query(None),
+    search: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    session: Session = Depends(get_read_session),
+):
+    """
+    Lista de candidaturas para vistas de tarjetas, servida desde la tabla
+    desnormalizada candidatura_card: una sola consulta indexada y JSON ya
+    serializado, sin joins ni validación por fila.
+    """
+    payloads = await candidatura_cards.get_candidatura_cards(
         session=session,
         proceso_electoral_id=proceso_electoral_id,
         tipo=tipo,
@@ -168,6 +475,7 @@ async def get_candidaturas_list(
         skip=skip,
         limit=limit,
     )
+    return Response(content=f"[{','.join(payloads)}]", media_type="application/json")
 
 
 @politics_public_router.get(
@@ -177,13 +485,19 @@ async def get_candidaturas_list(
     summary="Detalle completo de una candidatura",
 )
 async def get_candidatura_detail(
-    candidatura_id: str, session: Session = Depends(get_session)
+    candidatura_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    session: Session = Depends(get_read_session),
 ):
     """
     Obtiene información detallada de una candidatura específica,
     incluyendo propuestas, plan de gobierno, y datos de la persona.
     """
-    return await politics.get_candidatura_by_id(candidatura_id, session)
+    selected = parse_fields(fields, CandidaturaDetailResponse)
+    candidatura = await politics.get_candidatura_by_id(
+        candidatura_id, session, selected
+    )
+    return sparse_response(CandidaturaDetailResponse, selected, candidatura)
 
 
 # ========== PARTIDOS Y DISTRITOS ==========
@@ -197,10 +511,27 @@ async def get_candidatura_detail(
 )
 async def get_partidos(
     activo: bool = Query(True, description="Solo partidos activos"),
-    session: Session = Depends(get_session),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    session: Session = Depends(get_read_session),
 ):
     """Obtiene la lista de partidos políticos registrados"""
-    return await politics.get_partidos_list(session, activo)
+    selected = parse_fields(fields, PartidoPoliticoDetailResponse)
+    partidos = await politics.get_partidos_list(session, activo, selected)
+    return sparse_response(PartidoPoliticoDetailResponse, selected, partidos, many=True)
+
+
+@politics_public_router.get(
+    "/partidos:batch",
+    status_code=status.HTTP_200_OK,
+    response_model=Dict[str, Optional[PartidoPoliticoDetailResponse]],
+    summary="Obtener varios partidos políticos por ID",
+)
+async def get_partidos_batch(
+    ids: List[str] = Query(..., description=BATCH_IDS_DESCRIPTION),
+    session: Session = Depends(get_read_session),
+):
+    """Retorna un objeto indexado por ID en el orden pedido; null si no existe."""
+    return await politics.get_partidos_batch(parse_batch_ids(ids), session)
 
 
 @politics_public_router.get(
@@ -209,9 +540,15 @@ async def get_partidos(
     response_model=PartidoPoliticoResponse,
     summary="Detalle de un partido político",
 )
-async def get_partido_detail(partido_id: str, session: Session = Depends(get_session)):
+async def get_partido_detail(
+    partido_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    session: Session = Depends(get_read_session),
+):
     """Obtiene información detallada de un partido político"""
-    return await politics.get_partido_by_id(partido_id, session)
+    selected = parse_fields(fields, PartidoPoliticoResponse)
+    partido = await politics.get_partido_by_id(partido_id, session, selected)
+    return sparse_response(PartidoPoliticoResponse, selected, partido)
 
 
 @politics_public_router.get(
@@ -220,17 +557,53 @@ async def get_partido_detail(partido_id: str, session: Session = Depends(get_ses
     response_model=List[DistritoElectoralResponse],
     summary="Listar distritos electorales",
 )
-async def get_distritos(session: Session = Depends(get_session)):
+async def get_distritos(session: Session = Depends(get_read_session)):
     """Obtiene la lista de distritos electorales del Perú"""
     return await politics.get_distritos_list(session)
 
 
+# ========== REGISTRO DE CAMBIOS ==========
+
+
+@politics_public_router.get(
+    "/changes",
+    status_code=status.HTTP_200_OK,
+    response_model=ChangeFeedResponse,
+    summary="Cambios desde una versión",
+    description=(
+        "Sincronización incremental: retorna las entidades creadas o modificadas "
+        "después de `since`. Repetir con `next_since` mientras `has_more` sea true."
+    ),
+)
+async def get_changes(
+    since: int = Query(0, ge=0, description="Última versión ya sincronizada"),
+    limit: int = Query(500, ge=1, le=5000, description="Cambios máximos por página"),
+    entity_types: Optional[List[str]] = Query(
+        None, description="Filtrar por tipo (persona, candidatura, partido, ...)"
+    ),
+    session: Session = Depends(get_read_session),
+):
+    """Cambios compactados (última operación por entidad) en orden de versión"""
+    if entity_types:
+        unknown = set(entity_types) - changes.ENTITY_TYPES
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Tipos de entidad desconocidos: {', '.join(sorted(unknown))}",
+            )
+    return await changes.get_changes(session, since, limit, entity_types)
+
+
 # ====== RUTAS PROTEGIDAS (ADMIN) ======
 politics_admin_router = APIRouter(
     prefix="/politics/admin",
     tags=["Politics - Admin"],
     responses={404: {"description": "Not found"}},
-    dependencies=[Depends(oauth2_scheme), Depends(get_current_user)],
+    dependencies=[
+        Depends(oauth2_scheme),
+        Depends(get_current_user),
+        Depends(use_primary_after_write),
+    ],
 )
 
 
@@ -369,3 +742,40 @@ async def create_proceso_electoral(
     """Crear un nuevo proceso electoral"""
     verify_admin(current_user)
     return await politics.create_proceso_electoral(data, session)
+
+
+@politics_admin_router.post(
+    "/procesos-electorales/{proceso_id}/resultados",
+    status_code=status.HTTP_200_OK,
+    response_model=IngestResultadosResponse,
+    summary="Cargar resultados del conteo",
+)
+async def ingest_resultados(
+    proceso_id: str,
+    data: IngestResultadosRequest,
+    current_user=Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """
+    Recibe un snapshot total o parcial de votos y escribe solo las
+    candidaturas que cambiaron, con un UPDATE por lote.
+    """
+    verify_admin(current_user)
+    return await results_ingestion.ingest_resultados(proceso_id, data, session)
+
+
+# ========== OPERACIÓN ==========
+
+
+@politics_admin_router.get(
+    "/database/pools",
+    status_code=status.HTTP_200_OK,
+    summary="Estado de los pools de conexiones",
+)
+async def get_database_pools(current_user=Depends(get_current_user)):
+    """
+    Tamaño, conexiones en uso y tiempos de espera y de conexión de los pools
+    de este worker (primario y réplicas).
+    """
+    verify_admin(current_user)
+    return db_manager.pool_status()
@@ -1,14 +1,17 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from app.config.settings import get_settings
 from app.models.politics import (
     EstadoCandidatura,
     TipoCamara,
     TipoCandidatura,
 )
 
+settings = get_settings()
+
 # ==============================================================================
 # == SCHEMAS PARA PERSONA
 # ==============================================================================
@@ -197,6 +200,44 @@ class UpdateProcesoElectoralRequest(BaseModel):
     activo: Optional[bool] = None
 
 
+class ResultadoCandidaturaItem(BaseModel):
+    """Conteo de una candidatura dentro de un snapshot de resultados"""
+
+    candidatura_id: str
+    votos_obtenidos: int = Field(..., ge=0)
+    fue_elegido: Optional[bool] = Field(None, description="Se omite si no cambia")
+
+
+class IngestResultadosRequest(BaseModel):
+    """
+    Snapshot (total o parcial) de resultados de un proceso electoral.
+    Solo se escriben las candidaturas cuyo conteo cambió.
+    """
+
+    resultados: List[ResultadoCandidaturaItem] = Field(
+        ..., min_length=1, max_length=20000
+    )
+
+
+class SimulacionRequest(BaseModel):
+    """Parámetros de una simulación Monte Carlo de escaños"""
+
+    escenarios: int = Field(
+        10000,
+        ge=100,
+        le=settings.SIMULATION_MAX_SCENARIOS,
+        description="Escenarios a simular",
+    )
+    incertidumbre: float = Field(
+        0.1, ge=0, le=1, description="Desviación relativa de los votos por partido"
+    )
+    ajustes: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Multiplicador de votos por partido_id (ej: 1.2 = +20%)",
+    )
+    semilla: Optional[int] = Field(None, description="Semilla para reproducir")
+
+
 # ==============================================================================
 # == PROYECTO DE LEY
 # ==============================================================================
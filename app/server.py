@@ -0,0 +1,212 @@
+"""
+Servidor de producción multi-proceso.
+
+El proceso maestro precarga la aplicación (settings, modelos, routers),
+configura los mappers de SQLAlchemy y genera el esquema OpenAPI una sola
+vez; luego congela el heap con gc.freeze() y hace fork de los workers,
+que comparten esas páginas copy-on-write. Cada worker ejecuta su propio
+lifespan (conexión a la base de datos, tareas de fondo) después del fork,
+así ningún socket ni pool se comparte entre procesos.
+
+Uso:
+    python -m app.server
+
+Variables de entorno:
+    WEB_CONCURRENCY  número de workers (por defecto, CPUs disponibles)
+    HOST, PORT       dirección de escucha (0.0.0.0:8000)
+"""
+
+import gc
+import logging
+import math
+import os
+import signal
+import socket
+import sys
+import time
+
+logger = logging.getLogger("app.server")
+
+GRACEFUL_TIMEOUT_SECONDS = 30
+# Un worker que muere antes de este tiempo se considera fallo de arranque
+MIN_WORKER_UPTIME_SECONDS = 5
+
+
+def _cgroup_cpu_limit() -> float | None:
+    """Límite de CPU del contenedor (cgroup v2 o v1), si existe."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max", encoding="ascii") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", encoding="ascii") as f:
+            quota_us = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us", encoding="ascii") as f:
+            period_us = int(f.read())
+        if quota_us > 0:
+            return quota_us / period_us
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+
+def available_cpus() -> int:
+    """CPUs utilizables: afinidad del proceso acotada por la cuota del cgroup."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    limit = _cgroup_cpu_limit()
+    if limit:
+        cpus = min(cpus, max(1, math.ceil(limit)))
+    return cpus
+
+
+def worker_count() -> int:
+    configured = os.environ.get("WEB_CONCURRENCY")
+    if configured:
+        return max(1, int(configured))
+    return available_cpus()
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _warm_up(app) -> None:
+    """Trabajo que conviene hacer una sola vez en el maestro, antes del fork."""
+    from sqlalchemy.orm import configure_mappers
+
+    configure_mappers()
+    app.openapi()
+
+
+def _run_worker(app, sock: socket.socket) -> None:
+    import uvicorn
+
+    from app.config.settings import get_settings
+
+    gc.enable()
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    config = uvicorn.Config(
+        app,
+        lifespan="on",
+        proxy_headers=True,
+        # X-Forwarded-For define la IP del cliente (y sus buckets de rate
+        # limiting): solo se acepta de los proxies configurados
+        forwarded_allow_ips=get_settings().FORWARDED_ALLOW_IPS,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT_SECONDS,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Master:
+    """Proceso maestro: hace fork de los workers y los reemplaza si mueren."""
+
+    def __init__(self, app, sock: socket.socket, workers: int) -> None:
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.children: dict[int, float] = {}
+        self.shutting_down = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                _run_worker(self.app, self.sock)
+            except BaseException:  # pylint: disable=broad-except
+                logger.exception("Worker %s crashed", os.getpid())
+                exit_code = 1
+            finally:
+                os._exit(exit_code)  # pylint: disable=protected-access
+        self.children[pid] = time.monotonic()
+        logger.info("Started worker %s", pid)
+
+    def stop(self, signum, _frame) -> None:
+        self.shutting_down = True
+        for pid in self.children:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        for _ in range(self.workers):
+            self.spawn()
+
+        deadline = None
+        while self.children:
+            if self.shutting_down and deadline is None:
+                deadline = time.monotonic() + GRACEFUL_TIMEOUT_SECONDS + 5
+
+            if deadline is not None and time.monotonic() > deadline:
+                self.stop(signal.SIGKILL, None)
+
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.5)
+                continue
+
+            started = self.children.pop(pid, time.monotonic())
+            logger.info(
+                "Worker %s exited with status %s",
+                pid,
+                os.waitstatus_to_exitcode(status),
+            )
+            if not self.shutting_down:
+                if time.monotonic() - started < MIN_WORKER_UPTIME_SECONDS:
+                    # Evita un bucle de forks si el worker falla al arrancar
+                    time.sleep(MIN_WORKER_UPTIME_SECONDS)
+                self.spawn()
+
+        return 0
+
+
+def main() -> int:
+    # Recomendación de gc.freeze(): desactivar el GC en el maestro desde el inicio,
+    # congelar antes del fork y reactivarlo en cada worker.
+    gc.disable()
+
+    workers = worker_count()
+    # Fijar antes de importar la app: settings dimensiona el pool por worker con esto
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
+    from app.main import app  # pylint: disable=import-outside-toplevel
+
+    _warm_up(app)
+
+    host = os.environ.get("HOST", "0.0.0.0")
+    port = int(os.environ.get("PORT", "8000"))
+    sock = _bind_socket(host, port)
+    logger.info("Listening on %s:%s with %d workers", host, port, workers)
+
+    gc.collect()
+    gc.freeze()
+
+    return Master(app, sock, workers).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException, Request
+from sqlalchemy import update
 from sqlalchemy.orm import joinedload
 from sqlmodel import Session, select
 
@@ -301,6 +302,32 @@ async def get_refresh_token(refresh_token, session):
         return {**tokens, "user": user_token.user}
 
 
+def _revoke_oldest_sessions(user_id: str, session: Session, now: datetime):
+    """
+    Vence las sesiones activas más antiguas del usuario para dejar lugar a una
+    nueva dentro de MAX_ACTIVE_SESSIONS_PER_USER (la purga las borra después).
+    """
+    limit = settings.MAX_ACTIVE_SESSIONS_PER_USER
+    if limit <= 0:
+        return
+    # Usa ix_usertoken_user_id_expires_at
+    oldest = (
+        select(UserToken.id)
+        .where(UserToken.user_id == user_id, UserToken.expires_at > now)
+        .order_by(UserToken.created_at.desc(), UserToken.id.desc())
+        .offset(limit - 1)
+    )
+    revoked = session.exec(
+        update(UserToken)
+        .where(UserToken.id.in_(oldest.scalar_subquery()))
+        .values(expires_at=now)
+    ).rowcount
+    if revoked:
+        logger.info(
+            "%d sesiones antiguas revocadas para usuario %s...", revoked, user_id[:8]
+        )
+
+
 def _generate_tokens(user, session: Session, request: Request):
     """
     Generates new access and refresh tokens for a user.
@@ -324,6 +351,7 @@ def _generate_tokens(user, session: Session, request: Request):
         expires_at=now + rt_expires,
         last_used_at=now,
     )
+    _revoke_oldest_sessions(user.id, session, now)
     session.add(user_token)
     session.commit()
     session.refresh(user_token)
@@ -0,0 +1,226 @@
+"""
+Mantenimiento del modelo de lectura `candidatura_card`.
+
+Las escrituras de candidaturas y personas llaman a refresh_candidatura_cards
+dentro de su propia transacción (antes del commit), así la tarjeta nunca
+queda desfasada respecto de las tablas fuente. El payload se genera en
+Python, así que la migración crea la tabla vacía: el arranque la puebla si
+está vacía y hay candidaturas (ensure_candidatura_cards). Para cargas
+masivas: python -m app.commands.rebuild_cards
+"""
+
+import logging
+from typing import Iterable, List, Optional
+
+import orjson
+from sqlalchemy import delete, func
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, or_, select
+
+from app.models.politics import (
+    Candidato,
+    CandidaturaCard,
+    EstadoCandidatura,
+    TipoCandidatura,
+    utc_now,
+)
+from app.responses.politics import CandidaturaListResponse
+
+logger = logging.getLogger(__name__)
+
+
+def _card_fields(candidato: Candidato) -> dict:
+    persona = candidato.persona
+    payload = CandidaturaListResponse.model_validate(candidato).model_dump(mode="json")
+    return {
+        "persona_id": candidato.persona_id,
+        "proceso_electoral_id": candidato.proceso_electoral_id,
+        "tipo": candidato.tipo,
+        "estado": candidato.estado,
+        "partido_nombre": candidato.partido.nombre,
+        "distrito_nombre": candidato.distrito.nombre if candidato.distrito else None,
+        "nombre_busqueda": " ".join(
+            (persona.nombre_completo, persona.nombres, persona.apellidos)
+        ).lower(),
+        "created_at": candidato.created_at,
+        "payload": orjson.dumps(payload).decode(),
+        "updated_at": utc_now(),
+    }
+
+
+def refresh_candidatura_cards(
+    session: Session,
+    candidatura_ids: Optional[Iterable[str]] = None,
+    persona_ids: Optional[Iterable[str]] = None,
+) -> int:
+    """
+    Recalcula las tarjetas de las candidaturas indicadas (por ID o por
+    persona). No hace commit: corre en la transacción del llamador.
+    """
+    candidatura_ids = list(candidatura_ids or [])
+    persona_ids = list(persona_ids or [])
+    conditions = []
+    if candidatura_ids:
+        conditions.append(Candidato.id.in_(candidatura_ids))
+    if persona_ids:
+        conditions.append(Candidato.persona_id.in_(persona_ids))
+    if not conditions:
+        return 0
+
+    session.flush()
+    candidatos = session.exec(
+        select(Candidato)
+        .where(or_(*conditions))
+        .options(
+            selectinload(Candidato.persona),
+            selectinload(Candidato.partido),
+            selectinload(Candidato.distrito),
+            selectinload(Candidato.proceso_electoral),
+        )
+        # Las candidaturas recién escritas ya están en la sesión: recargarlas
+        .execution_options(populate_existing=True)
+    ).all()
+    _upsert(session, candidatos)
+
+    # Candidaturas pedidas que ya no existen
+    missing = set(candidatura_ids) - {c.id for c in candidatos}
+    if missing:
+        session.execute(
+            delete(CandidaturaCard).where(CandidaturaCard.candidatura_id.in_(missing))
+        )
+    return len(candidatos)
+
+
+def _upsert(session: Session, candidatos: List[Candidato]) -> None:
+    if not candidatos:
+        return
+    existing = {
+        card.candidatura_id: card
+        for card in session.exec(
+            select(CandidaturaCard).where(
+                CandidaturaCard.candidatura_id.in_([c.id for c in candidatos])
+            )
+        ).all()
+    }
+    for candidato in candidatos:
+        card = existing.get(candidato.id)
+        if card is None:
+            card = CandidaturaCard(
+                candidatura_id=candidato.id, **_card_fields(candidato)
+            )
+        else:
+            for key, value in _card_fields(candidato).items():
+                setattr(card, key, value)
+        session.add(card)
+
+
+def rebuild_candidatura_cards(session: Session, batch_size: int = 500) -> int:
+    """Reconstruye todas las tarjetas por lotes, con un commit por lote."""
+    total = 0
+    last_id = ""
+    while True:
+        ids = session.exec(
+            select(Candidato.id)
+            .where(Candidato.id > last_id)
+            .order_by(Candidato.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        total += refresh_candidatura_cards(session, candidatura_ids=ids)
+        session.commit()
+        session.expunge_all()
+        last_id = ids[-1]
+
+    orphans = session.execute(
+        delete(CandidaturaCard).where(
+            CandidaturaCard.candidatura_id.not_in(select(Candidato.id))
+        )
+    )
+    session.commit()
+    logger.info(
+        "Rebuilt %d candidatura cards (%d orphans removed)", total, orphans.rowcount
+    )
+    return total
+
+
+# Clave del advisory lock del poblado inicial (arbitraria, fija para todos los workers)
+POPULATE_LOCK_KEY = 0xCA4D5
+
+
+def _cards_missing(session: Session) -> bool:
+    has_cards = session.exec(select(CandidaturaCard.candidatura_id).limit(1)).first()
+    has_candidatos = session.exec(select(Candidato.id).limit(1)).first()
+    session.commit()
+    return has_cards is None and has_candidatos is not None
+
+
+def ensure_candidatura_cards(session: Session) -> int:
+    """
+    Reconstruye las tarjetas si la tabla está vacía y hay candidaturas
+    (p. ej. recién aplicada la migración que la crea). Retorna las tarjetas
+    construidas, 0 si no hacía falta.
+
+    En Postgres solo un worker reconstruye: el lock de sesión se toma en una
+    conexión propia, porque la sesión devuelve la suya al pool en cada commit.
+    """
+    if not _cards_missing(session):
+        return 0
+
+    engine = session.get_bind()
+    if engine.dialect.name != "postgresql":
+        return rebuild_candidatura_cards(session)
+
+    with engine.connect() as lock_conn:
+        if not lock_conn.execute(
+            select(func.pg_try_advisory_lock(POPULATE_LOCK_KEY))
+        ).scalar():
+            logger.info("Candidatura cards are being rebuilt by another worker")
+            return 0
+        try:
+            # Otro worker pudo terminar entre la comprobación y el lock
+            if not _cards_missing(session):
+                return 0
+            return rebuild_candidatura_cards(session)
+        finally:
+            lock_conn.execute(select(func.pg_advisory_unlock(POPULATE_LOCK_KEY)))
+            lock_conn.commit()
+
+
+async def get_candidatura_cards(
+    session: Session,
+    proceso_electoral_id: Optional[str],
+    tipo: Optional[TipoCandidatura],
+    partidos: Optional[List[str]],
+    distritos: Optional[List[str]],
+    estado: Optional[EstadoCandidatura],
+    search: Optional[str],
+    skip: int = 0,
+    limit: int = 20,
+) -> List[str]:
+    """
+    Misma búsqueda que get_candidaturas_list, resuelta solo con la tabla de
+    tarjetas. Retorna los JSON ya serializados, en orden.
+    """
+    filters = []
+    if proceso_electoral_id:
+        filters.append(CandidaturaCard.proceso_electoral_id == proceso_electoral_id)
+    if tipo:
+        filters.append(CandidaturaCard.tipo == tipo)
+    if estado:
+        filters.append(CandidaturaCard.estado == estado)
+    if partidos:
+        filters.append(CandidaturaCard.partido_nombre.in_(partidos))
+    if distritos:
+        filters.append(CandidaturaCard.distrito_nombre.in_(distritos))
+    if search:
+        filters.append(CandidaturaCard.nombre_busqueda.contains(search.lower()))
+
+    query = (
+        select(CandidaturaCard.payload)
+        .where(*filters)
+        .order_by(CandidaturaCard.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return list(session.exec(query).all())
@@ -0,0 +1,108 @@
+"""
+Change feed de las entidades políticas.
+
+Cada escritura de app.services.politics registra (en su misma transacción)
+qué entidad cambió y cómo. Los clientes piden los cambios posteriores a la
+última versión que vieron en lugar de volver a descargar listas completas.
+"""
+
+from datetime import timedelta
+from typing import List, Optional
+
+from sqlmodel import Session, func, select
+
+from app.config.settings import get_settings
+from app.models.politics import ChangeLog, utc_now
+
+settings = get_settings()
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+# Tipos de entidad publicados en el feed
+PERSONA = "persona"
+LEGISLADOR = "legislador"
+CANDIDATURA = "candidatura"
+PROCESO_ELECTORAL = "proceso_electoral"
+PARTIDO = "partido"
+ENTITY_TYPES = frozenset({PERSONA, LEGISLADOR, CANDIDATURA, PROCESO_ELECTORAL, PARTIDO})
+
+
+def record_change(
+    session: Session, entity_type: str, entity_id: str, operation: str
+) -> None:
+    """Agrega un cambio a la transacción en curso (no hace commit)."""
+    session.add(
+        ChangeLog(entity_type=entity_type, entity_id=entity_id, operation=operation)
+    )
+
+
+def record_changes(
+    session: Session, entity_type: str, entity_ids: List[str], operation: str
+) -> None:
+    """Versión por lotes para escrituras masivas."""
+    session.add_all(
+        ChangeLog(entity_type=entity_type, entity_id=entity_id, operation=operation)
+        for entity_id in entity_ids
+    )
+
+
+def _settled_before():
+    return utc_now() - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+
+
+def settled_version(session: Session) -> int:
+    """Última versión ya publicable en el feed (0 si no hay cambios)."""
+    version = session.exec(
+        select(func.max(ChangeLog.version)).where(
+            ChangeLog.changed_at <= _settled_before()
+        )
+    ).one()
+    return version or 0
+
+
+def latest_version(session: Session, entity_types: Optional[List[str]] = None) -> int:
+    """Versión más alta registrada (sin esperar el asentamiento)."""
+    query = select(func.max(ChangeLog.version))
+    if entity_types:
+        query = query.where(ChangeLog.entity_type.in_(entity_types))
+    return session.exec(query).one() or 0
+
+
+async def get_changes(
+    session: Session,
+    since: int,
+    limit: int,
+    entity_types: Optional[List[str]] = None,
+) -> dict:
+    """
+    Cambios con versión mayor a `since`, compactados: si una entidad cambió
+    varias veces en la página solo se devuelve su última versión.
+
+    Las versiones se asignan al insertar pero se hacen visibles al commit,
+    así que una transacción lenta puede publicar una versión menor que otra
+    ya visible. Para no saltarla, se retienen los cambios más nuevos que
+    CHANGE_FEED_SETTLE_SECONDS.
+    """
+    query = select(ChangeLog).where(
+        ChangeLog.version > since, ChangeLog.changed_at <= _settled_before()
+    )
+    if entity_types:
+        query = query.where(ChangeLog.entity_type.in_(entity_types))
+
+    rows = session.exec(query.order_by(ChangeLog.version).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    latest: dict[tuple[str, str], ChangeLog] = {}
+    for row in rows:
+        key = (row.entity_type, row.entity_id)
+        latest.pop(key, None)
+        latest[key] = row
+
+    return {
+        "changes": list(latest.values()),
+        "next_since": rows[-1].version if rows else since,
+        "has_more": has_more,
+    }
@@ -0,0 +1,236 @@
+"""
+Resultados electorales en vivo por Server-Sent Events.
+
+Un único broadcaster por proceso (worker) consulta el registro de cambios
+una vez por intervalo, carga los resultados de las candidaturas modificadas
+en una sola consulta y los reparte en memoria a todos los clientes
+suscritos. La base de datos recibe la misma carga con 10 o 10.000 clientes.
+
+Cada cliente acumula sus deltas pendientes en un dict por candidatura: si
+lee más lento de lo que llegan los cambios, los valores se sobrescriben
+(coalescing) en vez de encolarse, así la memoria por cliente queda acotada
+por el número de candidaturas y un cliente lento nunca frena a los demás.
+"""
+
+import asyncio
+import logging
+from typing import AsyncIterator, Optional
+
+import orjson
+from fastapi import HTTPException, status
+from sqlmodel import Session, select
+
+from app.config.database import db_manager
+from app.config.settings import get_settings
+from app.models.politics import Candidato
+from app.services import changes
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+CHANGES_PAGE_SIZE = 1000
+
+RESULT_COLUMNS = (
+    Candidato.id,
+    Candidato.proceso_electoral_id,
+    Candidato.partido_id,
+    Candidato.distrito_id,
+    Candidato.votos_obtenidos,
+    Candidato.fue_elegido,
+)
+
+SnapshotKey = tuple[str, Optional[str]]
+
+
+def _result_rows(session: Session, *conditions) -> list[dict]:
+    rows = session.exec(select(*RESULT_COLUMNS).where(*conditions)).all()
+    return [row._asdict() for row in rows]
+
+
+def _event(name: str, version: int, resultados: list[dict]) -> bytes:
+    data = orjson.dumps({"version": version, "resultados": resultados})
+    return b"event: %s\nid: %d\ndata: %s\n\n" % (name.encode(), version, data)
+
+
+class _Subscriber:
+    """Estado de un cliente conectado: filtro y deltas pendientes."""
+
+    __slots__ = ("proceso_id", "distrito_id", "pending", "version", "ready")
+
+    def __init__(self, proceso_id: str, distrito_id: Optional[str]) -> None:
+        self.proceso_id = proceso_id
+        self.distrito_id = distrito_id
+        self.pending: dict[str, dict] = {}
+        self.version = 0
+        self.ready = asyncio.Event()
+
+    def offer(self, rows: list[dict], version: int) -> None:
+        for row in rows:
+            if self.distrito_id is None or row["distrito_id"] == self.distrito_id:
+                self.pending[row["id"]] = row
+        self.version = version
+        if self.pending:
+            self.ready.set()
+
+    def drain(self) -> tuple[int, list[dict]]:
+        rows = list(self.pending.values())
+        self.pending.clear()
+        self.ready.clear()
+        return self.version, rows
+
+
+class LiveResultsBroadcaster:
+    """
+    Fan-out en memoria de deltas de resultados (votos_obtenidos y
+    fue_elegido) por proceso electoral y, opcionalmente, distrito.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[_Subscriber]] = {}
+        self._snapshots: dict[SnapshotKey, tuple[int, list[dict]]] = {}
+        self._version: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="live-results")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def ensure_capacity(self) -> None:
+        if self.subscriber_count >= settings.LIVE_RESULTS_MAX_SUBSCRIBERS:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Demasiados clientes conectados, intente más tarde",
+                headers={"Retry-After": "5"},
+            )
+
+    async def stream(
+        self, proceso_id: str, distrito_id: Optional[str]
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream SSE: un evento `snapshot` con el estado actual y luego eventos
+        `resultados` solo con las candidaturas que cambiaron.
+        """
+        subscriber = self._subscribe(proceso_id, distrito_id)
+        try:
+            version, rows = self._snapshot(proceso_id, distrito_id)
+            yield _event("snapshot", version, rows)
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        subscriber.ready.wait(),
+                        settings.LIVE_RESULTS_KEEPALIVE_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                version, rows = subscriber.drain()
+                yield _event("resultados", version, rows)
+        finally:
+            self._unsubscribe(subscriber)
+
+    def _subscribe(self, proceso_id: str, distrito_id: Optional[str]) -> _Subscriber:
+        if self._version is None:
+            # Primer cliente tras estar inactivo: los cambios anteriores ya
+            # están reflejados en el snapshot que recibe al conectarse.
+            with db_manager.read_session_factory()() as session:
+                self._version = changes.settled_version(session)
+            self._snapshots.clear()
+        subscriber = _Subscriber(proceso_id, distrito_id)
+        subscriber.version = self._version
+        self._subscribers.setdefault(proceso_id, set()).add(subscriber)
+        return subscriber
+
+    def _unsubscribe(self, subscriber: _Subscriber) -> None:
+        subs = self._subscribers.get(subscriber.proceso_id)
+        if subs is not None:
+            subs.discard(subscriber)
+            if not subs:
+                del self._subscribers[subscriber.proceso_id]
+                self._drop_snapshots(subscriber.proceso_id)
+        if not self._subscribers:
+            self._version = None
+
+    def _snapshot(
+        self, proceso_id: str, distrito_id: Optional[str]
+    ) -> tuple[int, list[dict]]:
+        """Estado actual, compartido por los clientes que conectan a la vez."""
+        key = (proceso_id, distrito_id)
+        cached = self._snapshots.get(key)
+        if cached is not None:
+            return cached
+
+        conditions = [Candidato.proceso_electoral_id == proceso_id]
+        if distrito_id is not None:
+            conditions.append(Candidato.distrito_id == distrito_id)
+        with db_manager.read_session_factory()() as session:
+            snapshot = (self._version or 0, _result_rows(session, *conditions))
+        self._snapshots[key] = snapshot
+        return snapshot
+
+    def _drop_snapshots(self, proceso_id: str) -> None:
+        for key in [key for key in self._snapshots if key[0] == proceso_id]:
+            del self._snapshots[key]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.LIVE_RESULTS_POLL_SECONDS)
+            if not self._subscribers or self._version is None:
+                continue
+            try:
+                await self._poll()
+            except Exception as e:
+                logger.error("Live results poll failed: %s", e)
+
+    async def _poll(self) -> None:
+        with db_manager.read_session_factory()() as session:
+            changed: set[str] = set()
+            version = self._version
+            while True:
+                page = await changes.get_changes(
+                    session, version, CHANGES_PAGE_SIZE, [changes.CANDIDATURA]
+                )
+                changed.update(change.entity_id for change in page["changes"])
+                version = page["next_since"]
+                if not page["has_more"]:
+                    break
+            if not changed:
+                self._version = version
+                return
+
+            rows = _result_rows(
+                session,
+                Candidato.id.in_(changed),
+                Candidato.proceso_electoral_id.in_(self._subscribers.keys()),
+            )
+
+        self._version = version
+        by_proceso: dict[str, list[dict]] = {}
+        for row in rows:
+            by_proceso.setdefault(row["proceso_electoral_id"], []).append(row)
+        for proceso_id, proceso_rows in by_proceso.items():
+            self._drop_snapshots(proceso_id)
+            for subscriber in self._subscribers.get(proceso_id, ()):
+                subscriber.offer(proceso_rows, version)
+        logger.debug(
+            "Live results: %d candidaturas changed up to version %d",
+            len(rows),
+            version,
+        )
+
+
+# Instancia global, iniciada en el lifespan de la aplicación
+live_results = LiveResultsBroadcaster()
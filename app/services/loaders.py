@@ -0,0 +1,238 @@
+"""
+Carga de relaciones por lotes controlada por el cliente (`?include=`).
+
+Las entidades raíz se consultan sin relaciones (noload) y el BatchLoader
+resuelve las rutas pedidas nivel por nivel, al estilo DataLoader: en cada
+nivel junta las claves de todas las entidades y de todas las rutas, y hace
+una sola consulta por modelo destino. Así `periodos.partido` y
+`candidaturas.partido` comparten la misma consulta de partidos.
+
+Las colecciones con un CollectionSlice se cargan acotadas por padre
+(ROW_NUMBER() OVER (PARTITION BY fk)) junto con el total de cada padre.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import RelationshipDirection, aliased, noload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import Session, select
+
+# Nombres cortos aceptados en ?include=
+INCLUDE_ALIASES = {"periodos": "periodos_legislativos"}
+
+PERSONA_INCLUDES = frozenset(
+    {
+        "periodos_legislativos",
+        "periodos_legislativos.partido",
+        "periodos_legislativos.distrito",
+        "periodos_legislativos.proyectos_ley",
+        "candidaturas",
+        "candidaturas.proceso_electoral",
+        "candidaturas.partido",
+        "candidaturas.distrito",
+    }
+)
+
+CANDIDATURA_INCLUDES = frozenset(
+    {"persona", "partido", "distrito", "proceso_electoral"}
+)
+
+PERSONA_LIST_INCLUDES = frozenset(
+    path for path in PERSONA_INCLUDES if path.startswith("periodos_legislativos")
+)
+
+# Por defecto se carga lo mismo que antes de existir ?include=
+PERSONA_DETAIL_DEFAULT_INCLUDE = (
+    "periodos.partido,periodos.distrito,periodos.proyectos_ley,"
+    "candidaturas.proceso_electoral,candidaturas.partido,candidaturas.distrito"
+)
+PERSONA_LIST_DEFAULT_INCLUDE = (
+    "periodos.partido,periodos.distrito,periodos.proyectos_ley"
+)
+
+CANDIDATURA_DEFAULT_INCLUDE = "persona,partido,distrito,proceso_electoral"
+
+IncludeTree = dict[str, "IncludeTree"]
+
+
+def parse_include(
+    raw: Optional[str], allowed: frozenset[str], default: str
+) -> IncludeTree:
+    """
+    Convierte `periodos.partido,candidaturas` en un árbol de relaciones.
+    Un string vacío (`?include=`) no carga ninguna relación.
+    """
+    raw = default if raw is None else raw
+    tree: IncludeTree = {}
+    unknown = []
+    for path in filter(None, (part.strip() for part in raw.split(","))):
+        segments = path.split(".")
+        segments[0] = INCLUDE_ALIASES.get(segments[0], segments[0])
+        if ".".join(segments) not in allowed:
+            unknown.append(path)
+            continue
+        node = tree
+        for segment in segments:
+            node = node.setdefault(segment, {})
+
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Relaciones desconocidas en include: {', '.join(unknown)}",
+        )
+    return tree
+
+
+def without_relations():
+    """Opción para consultar entidades sin cargar ninguna relación."""
+    return noload("*")
+
+
+@dataclass(frozen=True)
+class CollectionSlice:
+    """Carga solo los primeros `limit` elementos de una colección, por padre."""
+
+    limit: int
+    order_by: tuple
+
+
+class BatchLoader:
+    """
+    Resuelve relaciones para todas las entidades de una petición con una
+    consulta por relación uno-a-muchos y una por modelo destino muchos-a-uno.
+    Vive lo que dura la petición: las entidades ya cargadas no se repiten.
+    """
+
+    def __init__(
+        self, session: Session, slices: Optional[dict[str, CollectionSlice]] = None
+    ) -> None:
+        self.session = session
+        self.slices = slices or {}
+        self._cache: dict[type, dict[Any, Any]] = defaultdict(dict)
+        self._totals: dict[tuple[str, Any], int] = {}
+
+    def total(self, parent: Any, attr: str) -> Optional[int]:
+        """Total de la colección acotada de `parent` (None si no se acotó)."""
+        return self._totals.get((attr, parent.id))
+
+    def load(self, instances: Iterable[Any], tree: IncludeTree) -> None:
+        level = [(list(instances), tree)]
+        while level:
+            next_level = []
+            pending: dict[type, set] = defaultdict(set)
+            many_to_one = []
+
+            for objs, node in level:
+                if not objs or not node:
+                    continue
+                self._remember(objs)
+                relationships = sa_inspect(type(objs[0])).relationships
+                for attr, subtree in node.items():
+                    prop = relationships[attr]
+                    if prop.direction is RelationshipDirection.MANYTOONE:
+                        local_key = next(iter(prop.local_columns)).key
+                        target = prop.mapper.class_
+                        keys = {getattr(obj, local_key) for obj in objs} - {None}
+                        pending[target] |= keys - self._cache[target].keys()
+                        many_to_one.append((objs, attr, local_key, target, subtree))
+                    else:
+                        children = self._load_one_to_many(objs, attr, prop)
+                        next_level.append((children, subtree))
+
+            for target, keys in pending.items():
+                self._fetch(target, keys)
+
+            for objs, attr, local_key, target, subtree in many_to_one:
+                related = {}
+                for obj in objs:
+                    value = self._cache[target].get(getattr(obj, local_key))
+                    set_committed_value(obj, attr, value)
+                    if value is not None:
+                        related[id(value)] = value
+                next_level.append((list(related.values()), subtree))
+
+            level = next_level
+
+    def _remember(self, objs: list) -> None:
+        cache = self._cache[type(objs[0])]
+        for obj in objs:
+            cache.setdefault(obj.id, obj)
+
+    def _fetch(self, model: type, keys: set) -> None:
+        if not keys:
+            return
+        rows = self.session.exec(
+            select(model).where(model.id.in_(keys)).options(without_relations())
+        ).all()
+        cache = self._cache[model]
+        for row in rows:
+            cache[row.id] = row
+
+    def _load_one_to_many(self, parents: list, attr: str, prop) -> list:
+        child_model = prop.mapper.class_
+        foreign_key = next(iter(prop.remote_side)).key
+        parent_ids = [p.id for p in parents]
+        if attr in self.slices:
+            children = self._load_slice(
+                child_model, foreign_key, parent_ids, attr, self.slices[attr]
+            )
+        else:
+            children = self.session.exec(
+                select(child_model)
+                .where(getattr(child_model, foreign_key).in_(parent_ids))
+                .options(without_relations())
+            ).all()
+
+        grouped = defaultdict(list)
+        for child in children:
+            grouped[getattr(child, foreign_key)].append(child)
+
+        back_populates = prop.back_populates
+        for parent in parents:
+            items = grouped.get(parent.id, [])
+            set_committed_value(parent, attr, items)
+            if back_populates:
+                for child in items:
+                    set_committed_value(child, back_populates, parent)
+        return list(children)
+
+    def _load_slice(
+        self,
+        child_model: type,
+        foreign_key: str,
+        parent_ids: list,
+        attr: str,
+        collection_slice: CollectionSlice,
+    ) -> list:
+        column = getattr(child_model, foreign_key)
+        ranked = (
+            select(
+                child_model,
+                func.row_number()
+                .over(partition_by=column, order_by=collection_slice.order_by)
+                .label("position"),
+                func.count().over(partition_by=column).label("total"),
+            )
+            .where(column.in_(parent_ids))
+            .subquery()
+        )
+        child_alias = aliased(child_model, ranked)
+        rows = self.session.exec(
+            select(child_alias, ranked.c.total)
+            .where(ranked.c.position <= collection_slice.limit)
+            .order_by(ranked.c[foreign_key], ranked.c.position)
+            .options(without_relations())
+        ).all()
+
+        for parent_id in parent_ids:
+            self._totals[(attr, parent_id)] = 0
+        children = []
+        for child, total in rows:
+            self._totals[(attr, getattr(child, foreign_key))] = total
+            children.append(child)
+        return children
@@ -1,10 +1,13 @@
 # app/services/politics.py
 
+from datetime import datetime
 from typing import List, Optional
 
 from fastapi import HTTPException, status
+from sqlalchemy import exists, func, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import aliased, joinedload, selectinload
-from sqlmodel import Session, or_, select
+from sqlmodel import Session, and_, or_, select
 
 from app.models.politics import (
     Candidato,
@@ -26,12 +29,132 @@ from app.schemas.politics import (
     CreateProcesoElectoralRequest,
     UpdatePersonaRequest,
 )
+from app.services import changes
+from app.services.candidatura_cards import refresh_candidatura_cards
+from app.services.loaders import (
+    CANDIDATURA_DEFAULT_INCLUDE,
+    CANDIDATURA_INCLUDES,
+    PERSONA_DETAIL_DEFAULT_INCLUDE,
+    PERSONA_INCLUDES,
+    PERSONA_LIST_DEFAULT_INCLUDE,
+    PERSONA_LIST_INCLUDES,
+    BatchLoader,
+    CollectionSlice,
+    IncludeTree,
+    parse_include,
+    without_relations,
+)
+from app.services.reference import reference_registry
+from app.utils.cursors import decode_cursor, encode_cursor
+from app.utils.fieldsets import load_columns, loaded_dict, wants
+from app.utils.singleflight import coalesce
+
+# Proyectos de ley embebidos por periodo en las respuestas de persona
+PROYECTOS_POR_PERIODO = 10
+PROYECTOS_ORDER = (ProyectoLey.fecha_presentacion.desc(), ProyectoLey.id.desc())
 
 # ==============================================================================
 # == SERVICIOS PARA PERSONA
 # ==============================================================================
 
 
+def _persona_loader(session: Session, proyectos_limit: int) -> BatchLoader:
+    """Loader que embebe solo los proyectos más recientes de cada periodo."""
+    return BatchLoader(
+        session,
+        slices={"proyectos_ley": CollectionSlice(proyectos_limit, PROYECTOS_ORDER)},
+    )
+
+
+def _proyecto_cursor(proyecto: ProyectoLey) -> str:
+    return encode_cursor(proyecto.fecha_presentacion.isoformat(), proyecto.id)
+
+
+def _periodo_dict(periodo: Legislador, loader: BatchLoader) -> dict:
+    """Periodo con su página de proyectos, el total y el cursor para seguir."""
+    proyectos = periodo.proyectos_ley or []
+    periodo_dict = {
+        **periodo.model_dump(),
+        "partido": periodo.partido,
+        "distrito": periodo.distrito,
+        "proyectos_ley": proyectos,
+    }
+    total = loader.total(periodo, "proyectos_ley")
+    if total is not None:
+        periodo_dict["total_proyectos_ley"] = total
+        if proyectos and total > len(proyectos):
+            periodo_dict["proyectos_ley_next_cursor"] = _proyecto_cursor(proyectos[-1])
+    return periodo_dict
+
+
+def _persona_detail_dict(
+    persona: Persona,
+    loader: BatchLoader,
+    include: IncludeTree,
+    fields: Optional[frozenset[str]],
+) -> dict:
+    persona_dict = loaded_dict(persona, fields)
+    if "periodos_legislativos" in include:
+        persona_dict["periodos_legislativos"] = [
+            _periodo_dict(periodo, loader) for periodo in persona.periodos_legislativos
+        ]
+    if "candidaturas" in include:
+        persona_dict["candidaturas"] = persona.candidaturas
+    return persona_dict
+
+
+def _json_array_contains(session: Session, column, item: dict):
+    """
+    El arreglo JSON `column` tiene un objeto con los pares de `item`.
+    En Postgres es `@>` sobre JSONB (usa el índice GIN); en SQLite, json_each.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return type_coerce(column, JSONB).contains([item])
+    elements = func.json_each(column).table_valued("value")
+    return exists(
+        select(1)
+        .select_from(elements)
+        .where(
+            *(
+                func.json_extract(elements.c.value, f"$.{key}") == value
+                for key, value in item.items()
+            )
+        )
+    )
+
+
+def _antecedentes_filters(
+    session: Session,
+    con_antecedentes_penales: Optional[bool],
+    con_antecedentes_judiciales: Optional[bool],
+    antecedente_tipo: Optional[str],
+) -> list:
+    """Condiciones sobre Persona resueltas en la base (conteos generados y JSONB)."""
+    filters = []
+    if con_antecedentes_penales is not None:
+        filters.append(
+            Persona.num_antecedentes_penales > 0
+            if con_antecedentes_penales
+            else Persona.num_antecedentes_penales == 0
+        )
+    if con_antecedentes_judiciales is not None:
+        filters.append(
+            Persona.num_antecedentes_judiciales > 0
+            if con_antecedentes_judiciales
+            else Persona.num_antecedentes_judiciales == 0
+        )
+    if antecedente_tipo:
+        item = {"tipo": antecedente_tipo}
+        filters.append(
+            or_(
+                _json_array_contains(session, Persona.antecedentes_penales, item),
+                _json_array_contains(session, Persona.antecedentes_judiciales, item),
+            )
+        )
+    return filters
+
+
+@coalesce
 async def get_personas_list(
     session: Session,
     es_legislador_activo: bool,
@@ -41,11 +164,21 @@ async def get_personas_list(
     search: Optional[str],
     skip: int,
     limit: int,
+    fields: Optional[frozenset[str]] = None,
+    include: Optional[IncludeTree] = None,
+    proyectos_limit: int = PROYECTOS_POR_PERIODO,
+    con_antecedentes_penales: Optional[bool] = None,
+    con_antecedentes_judiciales: Optional[bool] = None,
+    antecedente_tipo: Optional[str] = None,
 ):
-    query = select(Persona).options(
-        selectinload(Persona.periodos_legislativos).selectinload(Legislador.partido),
-        selectinload(Persona.periodos_legislativos).selectinload(Legislador.distrito),
-    )
+    if include is None:
+        include = parse_include(
+            None, PERSONA_LIST_INCLUDES, PERSONA_LIST_DEFAULT_INCLUDE
+        )
+    if not wants(fields, "periodo_activo"):
+        include = {}
+
+    query = select(Persona).options(load_columns(Persona, fields), without_relations())
 
     if es_legislador_activo:
         # alias para evitar conflictos
@@ -59,16 +192,25 @@ async def get_personas_list(
             query = query.where(legislador_alias.camara == camara)
 
         if partidos:
-            partido_alias = aliased(PartidoPolitico)
-            query = query.join(
-                partido_alias, legislador_alias.partido_id == partido_alias.id
-            ).where(partido_alias.nombre.in_(partidos))
+            partido_ids = reference_registry.ids_by_nombre(
+                session, PartidoPolitico, partidos
+            )
+            query = query.where(legislador_alias.partido_id.in_(partido_ids))
 
         if distritos:
-            distrito_alias = aliased(Distrito)
-            query = query.join(
-                distrito_alias, legislador_alias.distrito_id == distrito_alias.id
-            ).where(distrito_alias.nombre.in_(distritos))
+            distrito_ids = reference_registry.ids_by_nombre(
+                session, Distrito, distritos
+            )
+            query = query.where(legislador_alias.distrito_id.in_(distrito_ids))
+
+    query = query.where(
+        *_antecedentes_filters(
+            session,
+            con_antecedentes_penales,
+            con_antecedentes_judiciales,
+            antecedente_tipo,
+        )
+    )
 
     if search:
         search_term = f"%{search.lower()}%"
@@ -84,46 +226,87 @@ async def get_personas_list(
     query = query.distinct(Persona.id).offset(skip).limit(limit)
 
     personas = session.exec(query).all()
+    loader = _persona_loader(session, proyectos_limit)
+    loader.load(personas, include)
+
+    resultado = []
+    for persona in personas:
+        persona_dict = loaded_dict(persona, fields)
+        if wants(fields, "periodo_activo"):
+            periodo_activo = next(
+                (p for p in persona.periodos_legislativos or [] if p.esta_activo),
+                None,
+            )
+            persona_dict["periodo_activo"] = (
+                _periodo_dict(periodo_activo, loader) if periodo_activo else None
+            )
+        resultado.append(persona_dict)
+
+    return resultado
 
-    return [
-        {
-            **persona.model_dump(),
-            "periodo_activo": next(
-                (p for p in persona.periodos_legislativos if p.esta_activo), None
-            ),
-        }
-        for persona in personas
-    ]
 
+@coalesce
+async def get_persona_by_id(
+    persona_id: str,
+    session: Session,
+    fields: Optional[frozenset[str]] = None,
+    include: Optional[IncludeTree] = None,
+    proyectos_limit: int = PROYECTOS_POR_PERIODO,
+):
+    """
+    Obtener una persona por su ID con su historial político.
+    `include` decide qué relaciones se cargan y `fields` qué columnas.
+    De cada periodo se embeben solo los `proyectos_limit` proyectos más
+    recientes, con el total y un cursor para el resto.
+    """
+    if include is None:
+        include = parse_include(None, PERSONA_INCLUDES, PERSONA_DETAIL_DEFAULT_INCLUDE)
+    include = {name: tree for name, tree in include.items() if wants(fields, name)}
 
-async def get_persona_by_id(persona_id: str, session: Session):
-    """Obtener una persona por su ID con todo su historial político."""
+    # Cada candidatura anida a la misma persona completa: recortar sus columnas
+    # solo provocaría cargas diferidas al serializarla
+    columns = None if "candidaturas" in include else fields
     query = (
         select(Persona)
         .where(Persona.id == persona_id)
-        .options(
-            selectinload(Persona.periodos_legislativos).selectinload(
-                Legislador.partido
-            ),
-            selectinload(Persona.periodos_legislativos).selectinload(
-                Legislador.distrito
-            ),
-            selectinload(Persona.periodos_legislativos).selectinload(
-                Legislador.proyectos_ley
-            ),
-            selectinload(Persona.candidaturas).selectinload(
-                Candidato.proceso_electoral
-            ),
-            selectinload(Persona.candidaturas).selectinload(Candidato.partido),
-            selectinload(Persona.candidaturas).selectinload(Candidato.distrito),
-        )
+        .options(load_columns(Persona, columns), without_relations())
     )
     persona = session.exec(query).first()
     if not persona:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Persona no encontrada"
         )
-    return persona
+    loader = _persona_loader(session, proyectos_limit)
+    loader.load([persona], include)
+    return _persona_detail_dict(persona, loader, include, columns)
+
+
+@coalesce
+async def get_personas_batch(
+    ids: List[str],
+    session: Session,
+    include: Optional[IncludeTree] = None,
+    proyectos_limit: int = PROYECTOS_POR_PERIODO,
+):
+    """
+    Obtener varias personas en una sola pasada: una consulta IN para las
+    personas y una por nivel de relaciones. Retorna un dict en el orden de
+    `ids`, con None para los IDs inexistentes.
+    """
+    if include is None:
+        include = parse_include(None, PERSONA_INCLUDES, PERSONA_DETAIL_DEFAULT_INCLUDE)
+
+    personas = session.exec(
+        select(Persona).where(Persona.id.in_(ids)).options(without_relations())
+    ).all()
+    loader = _persona_loader(session, proyectos_limit)
+    loader.load(personas, include)
+
+    by_id = {
+        persona.id: _persona_detail_dict(persona, loader, include, None)
+        for persona in personas
+    }
+    return {persona_id: by_id.get(persona_id) for persona_id in ids}
 
 
 async def create_persona(data: CreatePersonaRequest, session: Session):
@@ -141,6 +324,7 @@ async def create_persona(data: CreatePersonaRequest, session: Session):
     persona = Persona.model_validate(data, update={"nombre_completo": nombre_completo})
 
     session.add(persona)
+    changes.record_change(session, changes.PERSONA, persona.id, changes.CREATE)
     session.commit()
     session.refresh(persona)
     return persona
@@ -162,6 +346,8 @@ async def update_persona(persona_id: str, data: UpdatePersonaRequest, session: S
         persona.nombre_completo = f"{persona.nombres} {persona.apellidos}".strip()
 
     session.add(persona)
+    refresh_candidatura_cards(session, persona_ids=[persona.id])
+    changes.record_change(session, changes.PERSONA, persona.id, changes.UPDATE)
     session.commit()
     session.refresh(persona)
     return persona
@@ -185,6 +371,43 @@ async def get_proyectos_by_persona(
     return session.exec(query).all()
 
 
+async def get_proyectos_by_periodo(
+    periodo_id: str, session: Session, cursor: Optional[str], limit: int
+):
+    """
+    Página keyset de proyectos de un periodo, del más reciente al más antiguo.
+    El cursor es el `proyectos_ley_next_cursor` del detalle de la persona o
+    el `next_cursor` de la página anterior.
+    """
+    query = select(ProyectoLey).where(ProyectoLey.legislador_id == periodo_id)
+    if cursor:
+        fecha, proyecto_id = decode_cursor(cursor, 2)
+        fecha = _parse_cursor_datetime(fecha)
+        query = query.where(
+            or_(
+                ProyectoLey.fecha_presentacion < fecha,
+                and_(
+                    ProyectoLey.fecha_presentacion == fecha,
+                    ProyectoLey.id < proyecto_id,
+                ),
+            )
+        )
+
+    proyectos = session.exec(query.order_by(*PROYECTOS_ORDER).limit(limit + 1)).all()
+    items = proyectos[:limit]
+    next_cursor = _proyecto_cursor(items[-1]) if len(proyectos) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def _parse_cursor_datetime(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+        ) from e
+
+
 # ==============================================================================
 # == SERVICIOS PARA ROLES (LEGISLADOR Y CANDIDATO)
 # ==============================================================================
@@ -200,13 +423,13 @@ async def add_legislador_periodo(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Persona no encontrada para asignar el rol",
         )
-    if not session.get(PartidoPolitico, data.partido_id):
+    if not reference_registry.exists(session, PartidoPolitico, data.partido_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Partido político no encontrado",
         )
 
-    if not session.get(Distrito, data.distrito_id):
+    if not reference_registry.exists(session, Distrito, data.distrito_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Distrito no encontrado",
@@ -214,6 +437,7 @@ async def add_legislador_periodo(
 
     periodo = Legislador.model_validate(data)
     session.add(periodo)
+    changes.record_change(session, changes.LEGISLADOR, periodo.id, changes.CREATE)
     session.commit()
     session.refresh(periodo)
     return periodo
@@ -224,6 +448,7 @@ async def add_legislador_periodo(
 # ==============================================================================
 
 
+@coalesce
 async def get_candidaturas_list(
     session: Session,
     proceso_electoral_id: Optional[str],
@@ -234,11 +459,15 @@ async def get_candidaturas_list(
     search: Optional[str],
     skip: int = 0,
     limit: int = 20,
+    fields: Optional[frozenset[str]] = None,
+    con_antecedentes_penales: Optional[bool] = None,
+    con_antecedentes_judiciales: Optional[bool] = None,
+    antecedente_tipo: Optional[str] = None,
 ):
     """
     Obtiene candidaturas con persona, partido, distrito, proceso_electoral y periodos_legislativos.
     Aplana los periodos_legislativos al nivel superior.
-    Totalmente optimizado.
+    Con `fields` solo se cargan las columnas y relaciones pedidas.
     """
 
     filters = []
@@ -249,88 +478,103 @@ async def get_candidaturas_list(
     if estado:
         filters.append(Candidato.estado == estado)
 
+    with_periodos = wants(fields, "periodos_legislativos")
+    with_persona = with_periodos or wants(fields, "persona")
+
     query = (
         select(Candidato)
         .where(*filters)
-        .options(
-            selectinload(Candidato.partido),
-            selectinload(Candidato.distrito),
-            selectinload(Candidato.proceso_electoral),
+        .options(load_columns(Candidato, fields))
+        .order_by(Candidato.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    for name in ("partido", "distrito", "proceso_electoral"):
+        if wants(fields, name):
+            query = query.options(selectinload(getattr(Candidato, name)))
+    if with_periodos:
+        query = query.options(
             selectinload(Candidato.persona)
             .selectinload(Persona.periodos_legislativos)
             .options(
                 joinedload(Legislador.partido),
                 joinedload(Legislador.distrito),
                 joinedload(Legislador.proyectos_ley),
-            ),
+            )
         )
-        .order_by(Candidato.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
+    elif with_persona:
+        query = query.options(selectinload(Candidato.persona))
 
     if partidos:
-        query = query.join(Candidato.partido).where(
-            PartidoPolitico.nombre.in_(partidos)
+        query = query.where(
+            Candidato.partido_id.in_(
+                reference_registry.ids_by_nombre(session, PartidoPolitico, partidos)
+            )
         )
     if distritos:
-        query = query.join(Candidato.distrito).where(Distrito.nombre.in_(distritos))
+        query = query.where(
+            Candidato.distrito_id.in_(
+                reference_registry.ids_by_nombre(session, Distrito, distritos)
+            )
+        )
+    persona_filters = _antecedentes_filters(
+        session, con_antecedentes_penales, con_antecedentes_judiciales, antecedente_tipo
+    )
     if search:
         s = f"%{search.lower()}%"
-        query = query.join(Candidato.persona).where(
+        persona_filters.append(
             or_(
                 Persona.nombre_completo.ilike(s),
                 Persona.nombres.ilike(s),
                 Persona.apellidos.ilike(s),
             )
         )
+    if persona_filters:
+        query = query.join(Candidato.persona).where(*persona_filters)
 
     candidatos = session.exec(query).unique().all()
 
     resultado = []
     for c in candidatos:
-        persona = c.persona
-
-        candidatura_dict = c.model_dump()
-        candidatura_dict.update(
-            {
-                "persona": persona.model_dump() if persona else None,
-                "periodos_legislativos": [
-                    {
-                        **p.model_dump(),
-                        "partido": p.partido.model_dump() if p.partido else None,
-                        "distrito": p.distrito.model_dump() if p.distrito else None,
-                        "proyectos_ley": [pl.model_dump() for pl in p.proyectos_ley]
-                        if hasattr(p, "proyectos_ley")
-                        else [],
-                    }
-                    for p in (persona.periodos_legislativos if persona else [])
-                ],
-                "partido": c.partido.model_dump() if c.partido else None,
-                "distrito": c.distrito.model_dump() if c.distrito else None,
-                "proceso_electoral": c.proceso_electoral.model_dump()
-                if c.proceso_electoral
-                else None,
-            }
-        )
+        persona = c.persona if with_persona else None
+
+        candidatura_dict = loaded_dict(c, fields)
+        if wants(fields, "persona"):
+            candidatura_dict["persona"] = persona.model_dump() if persona else None
+        if with_periodos:
+            candidatura_dict["periodos_legislativos"] = [
+                {
+                    **p.model_dump(),
+                    "partido": p.partido.model_dump() if p.partido else None,
+                    "distrito": p.distrito.model_dump() if p.distrito else None,
+                    "proyectos_ley": [pl.model_dump() for pl in p.proyectos_ley]
+                    if hasattr(p, "proyectos_ley")
+                    else [],
+                }
+                for p in (persona.periodos_legislativos if persona else [])
+            ]
+        for name in ("partido", "distrito", "proceso_electoral"):
+            if wants(fields, name):
+                related = getattr(c, name)
+                candidatura_dict[name] = related.model_dump() if related else None
 
         resultado.append(candidatura_dict)
 
     return resultado
 
 
-async def get_candidatura_by_id(candidatura_id: str, session: Session):
+async def get_candidatura_by_id(
+    candidatura_id: str, session: Session, fields: Optional[frozenset[str]] = None
+):
     """Obtener una candidatura específica con todos sus detalles."""
     query = (
         select(Candidato)
         .where(Candidato.id == candidatura_id)
-        .options(
-            selectinload(Candidato.persona),
-            selectinload(Candidato.partido),
-            selectinload(Candidato.distrito),
-            selectinload(Candidato.proceso_electoral),
-        )
+        .options(load_columns(Candidato, fields))
     )
+    for name in ("persona", "partido", "distrito", "proceso_electoral"):
+        if wants(fields, name):
+            query = query.options(selectinload(getattr(Candidato, name)))
     candidatura = session.exec(query).first()
     if not candidatura:
         raise HTTPException(
@@ -339,6 +583,22 @@ async def get_candidatura_by_id(candidatura_id: str, session: Session):
     return candidatura
 
 
+async def get_candidaturas_batch(
+    ids: List[str], session: Session, include: Optional[IncludeTree] = None
+):
+    """Obtener varias candidaturas por ID, en el orden pedido (None si no existe)."""
+    if include is None:
+        include = parse_include(None, CANDIDATURA_INCLUDES, CANDIDATURA_DEFAULT_INCLUDE)
+
+    candidaturas = session.exec(
+        select(Candidato).where(Candidato.id.in_(ids)).options(without_relations())
+    ).all()
+    BatchLoader(session).load(candidaturas, include)
+
+    by_id = {candidatura.id: candidatura for candidatura in candidaturas}
+    return {candidatura_id: by_id.get(candidatura_id) for candidatura_id in ids}
+
+
 async def add_candidatura(data: CreateCandidaturaRequest, session: Session):
     """Añadir una nueva candidatura a una Persona."""
     if not session.get(Persona, data.persona_id):
@@ -347,19 +607,23 @@ async def add_candidatura(data: CreateCandidaturaRequest, session: Session):
             detail="Persona no encontrada para la candidatura",
         )
 
-    if not session.get(ProcesoElectoral, data.proceso_electoral_id):
+    if not reference_registry.exists(
+        session, ProcesoElectoral, data.proceso_electoral_id
+    ):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Proceso electoral no encontrado",
         )
 
-    if not session.get(PartidoPolitico, data.partido_id):
+    if not reference_registry.exists(session, PartidoPolitico, data.partido_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Partido político no encontrado",
         )
 
-    if data.distrito_id and not session.get(Distrito, data.distrito_id):
+    if data.distrito_id and not reference_registry.exists(
+        session, Distrito, data.distrito_id
+    ):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Distrito no encontrado",
@@ -367,6 +631,8 @@ async def add_candidatura(data: CreateCandidaturaRequest, session: Session):
 
     candidatura = Candidato.model_validate(data)
     session.add(candidatura)
+    refresh_candidatura_cards(session, candidatura_ids=[candidatura.id])
+    changes.record_change(session, changes.CANDIDATURA, candidatura.id, changes.CREATE)
     session.commit()
     session.refresh(candidatura)
 
@@ -388,6 +654,8 @@ async def update_candidatura(
         setattr(candidatura, key, value)
 
     session.add(candidatura)
+    refresh_candidatura_cards(session, candidatura_ids=[candidatura_id])
+    changes.record_change(session, changes.CANDIDATURA, candidatura_id, changes.UPDATE)
     session.commit()
     session.refresh(candidatura)
     return await get_candidatura_by_id(candidatura_id, session)
@@ -435,7 +703,11 @@ async def create_proceso_electoral(
 
     proceso = ProcesoElectoral.model_validate(data)
     session.add(proceso)
+    changes.record_change(
+        session, changes.PROCESO_ELECTORAL, proceso.id, changes.CREATE
+    )
     session.commit()
+    reference_registry.invalidate()
     session.refresh(proceso)
     return proceso
 
@@ -445,9 +717,15 @@ async def create_proceso_electoral(
 # ==============================================================================
 
 
-async def get_partidos_list(session: Session, activo: Optional[bool]):
+async def get_partidos_list(
+    session: Session, activo: Optional[bool], fields: Optional[frozenset[str]] = None
+):
     """Obtener lista de partidos políticos."""
-    query = select(PartidoPolitico).order_by(PartidoPolitico.nombre)
+    query = (
+        select(PartidoPolitico)
+        .options(load_columns(PartidoPolitico, fields))
+        .order_by(PartidoPolitico.nombre)
+    )
 
     if activo is not None:
         query = query.where(PartidoPolitico.activo == activo)
@@ -455,9 +733,15 @@ async def get_partidos_list(session: Session, activo: Optional[bool]):
     return session.exec(query).all()
 
 
-async def get_partido_by_id(partido_id: str, session: Session):
+async def get_partido_by_id(
+    partido_id: str, session: Session, fields: Optional[frozenset[str]] = None
+):
     """Obtener un partido político específico."""
-    partido = session.get(PartidoPolitico, partido_id)
+    partido = session.exec(
+        select(PartidoPolitico)
+        .where(PartidoPolitico.id == partido_id)
+        .options(load_columns(PartidoPolitico, fields))
+    ).first()
     if not partido:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -466,6 +750,15 @@ async def get_partido_by_id(partido_id: str, session: Session):
     return partido
 
 
+async def get_partidos_batch(ids: List[str], session: Session):
+    """Obtener varios partidos por ID, en el orden pedido (None si no existe)."""
+    partidos = session.exec(
+        select(PartidoPolitico).where(PartidoPolitico.id.in_(ids))
+    ).all()
+    by_id = {partido.id: partido for partido in partidos}
+    return {partido_id: by_id.get(partido_id) for partido_id in ids}
+
+
 async def create_partido(data: CreatePartidoRequest, session: Session):
     """Crear un nuevo partido político."""
     existing_nombre = session.exec(
@@ -490,7 +783,9 @@ async def create_partido(data: CreatePartidoRequest, session: Session):
 
     partido = PartidoPolitico.model_validate(data)
     session.add(partido)
+    changes.record_change(session, changes.PARTIDO, partido.id, changes.CREATE)
     session.commit()
+    reference_registry.invalidate()
     session.refresh(partido)
     return partido
 
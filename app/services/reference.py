@@ -0,0 +1,111 @@
+"""
+Registro en memoria de las tablas de referencia: partidos, distritos y
+procesos electorales.
+
+Son tablas chicas que casi no cambian pero se consultan en cada filtro por
+nombre y en cada validación de llaves foráneas. Cada worker guarda un
+snapshot (id -> nombre) cargado al arrancar y lo usa para traducir nombres
+a ids y validar referencias sin ir a la base de datos.
+
+El snapshot lleva la versión del change log con la que se cargó. Las
+escrituras del propio worker lo invalidan; los demás workers lo revisan
+cada REFERENCE_REFRESH_SECONDS y solo lo recargan si la versión cambió. Lo
+que el snapshot no conoce (p. ej. un partido recién creado en otro worker)
+se busca en la base de datos antes de darlo por inexistente.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlmodel import Session, SQLModel, select
+
+from app.config.settings import get_settings
+from app.models.politics import Distrito, PartidoPolitico, ProcesoElectoral
+from app.services import changes
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MODELS = (PartidoPolitico, Distrito, ProcesoElectoral)
+# Modelos con nombre único, que se pueden buscar por nombre
+NAMED_MODELS = (PartidoPolitico, Distrito)
+# Distritos no tienen escrituras en la API: solo se versionan estos tipos
+VERSIONED_TYPES = [changes.PARTIDO, changes.PROCESO_ELECTORAL]
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    version: int
+    nombres: dict[type, dict[str, str]]  # modelo -> id -> nombre
+    ids: dict[type, dict[str, str]]  # modelo con nombre único -> nombre -> id
+    loaded_at: float
+
+
+class ReferenceRegistry:
+    """Snapshot por worker de las tablas de referencia."""
+
+    def __init__(self) -> None:
+        self._snapshot: Optional[ReferenceSnapshot] = None
+        self._checked_at = 0.0
+
+    def load(self, session: Session) -> ReferenceSnapshot:
+        version = changes.latest_version(session, VERSIONED_TYPES)
+        nombres = {
+            model: dict(session.exec(select(model.id, model.nombre)).all())
+            for model in MODELS
+        }
+        self._snapshot = ReferenceSnapshot(
+            version=version,
+            nombres=nombres,
+            ids={
+                model: {nombre: id_ for id_, nombre in nombres[model].items()}
+                for model in NAMED_MODELS
+            },
+            loaded_at=time.monotonic(),
+        )
+        self._checked_at = self._snapshot.loaded_at
+        logger.debug("Reference registry loaded at version %d", version)
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+
+    def snapshot(self, session: Session) -> ReferenceSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.load(session)
+        if time.monotonic() - self._checked_at >= settings.REFERENCE_REFRESH_SECONDS:
+            self._checked_at = time.monotonic()
+            if changes.latest_version(session, VERSIONED_TYPES) != snapshot.version:
+                return self.load(session)
+        return snapshot
+
+    def exists(self, session: Session, model: type[SQLModel], id_: str) -> bool:
+        """Valida una referencia; lo desconocido se confirma en la base."""
+        if id_ in self.snapshot(session).nombres[model]:
+            return True
+        if session.get(model, id_) is None:
+            return False
+        self.invalidate()
+        return True
+
+    def ids_by_nombre(
+        self, session: Session, model: type[SQLModel], nombres: list[str]
+    ) -> list[str]:
+        """Ids de los registros con esos nombres (los inexistentes se omiten)."""
+        known = self.snapshot(session).ids[model]
+        ids = [known[nombre] for nombre in nombres if nombre in known]
+        missing = [nombre for nombre in nombres if nombre not in known]
+        if missing:
+            found = session.exec(
+                select(model.id).where(model.nombre.in_(missing))
+            ).all()
+            if found:
+                self.invalidate()
+                ids.extend(found)
+        return ids
+
+
+reference_registry = ReferenceRegistry()
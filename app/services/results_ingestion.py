@@ -0,0 +1,151 @@
+"""
+Ingesta de resultados electorales (conteos de la ONPE).
+
+Cada snapshot se compara con los valores actuales y solo las candidaturas
+que cambiaron se escriben, con un único UPDATE ... CASE por lote en lugar
+de un get/commit/refresh por candidatura. Cada lote es una transacción
+corta: registra sus cambios en el change feed (lo que alimenta el stream
+de resultados en vivo), suma los deltas a los totales agregados y
+actualiza las tarjetas afectadas.
+"""
+
+import logging
+import time
+from collections import defaultdict
+
+from fastapi import HTTPException, status
+from sqlalchemy import case, update
+from sqlmodel import Session, select
+
+from app.models.politics import Candidato, ProcesoElectoral
+from app.schemas.politics import IngestResultadosRequest, ResultadoCandidaturaItem
+from app.services import changes
+from app.services.candidatura_cards import refresh_candidatura_cards
+from app.services.reference import reference_registry
+from app.services.tallies import SIN_DISTRITO, persist_deltas, tally_store
+
+logger = logging.getLogger(__name__)
+
+INGEST_BATCH_SIZE = 1000
+
+
+def _changed(current, item: ResultadoCandidaturaItem) -> bool:
+    if current.votos_obtenidos != item.votos_obtenidos:
+        return True
+    return item.fue_elegido is not None and current.fue_elegido != item.fue_elegido
+
+
+def _tally_deltas(current: dict, items: list[ResultadoCandidaturaItem]) -> dict:
+    """Diferencia de votos por (tipo, partido, distrito) del lote."""
+    deltas: dict = defaultdict(int)
+    for item in items:
+        row = current[item.candidatura_id]
+        key = (row.tipo, row.partido_id, row.distrito_id or SIN_DISTRITO)
+        deltas[key] += item.votos_obtenidos - (row.votos_obtenidos or 0)
+    return deltas
+
+
+def _apply_batch(session: Session, items: list[ResultadoCandidaturaItem]) -> None:
+    """Un solo UPDATE para todo el lote, con un CASE por columna."""
+    ids = [item.candidatura_id for item in items]
+    votos = {item.candidatura_id: item.votos_obtenidos for item in items}
+    elegidos = {
+        item.candidatura_id: item.fue_elegido
+        for item in items
+        if item.fue_elegido is not None
+    }
+    values = {"votos_obtenidos": case(votos, value=Candidato.id)}
+    if elegidos:
+        values["fue_elegido"] = case(
+            elegidos, value=Candidato.id, else_=Candidato.fue_elegido
+        )
+    session.execute(
+        update(Candidato)
+        .where(Candidato.id.in_(ids))
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def ingest_resultados(
+    proceso_id: str, data: IngestResultadosRequest, session: Session
+) -> dict:
+    """Aplica un snapshot de resultados y reporta filas escritas y latencia."""
+    started = time.perf_counter()
+    if not reference_registry.exists(session, ProcesoElectoral, proceso_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Proceso electoral no encontrado",
+        )
+
+    # Si una candidatura viene repetida, gana el último valor
+    items = list({item.candidatura_id: item for item in data.resultados}.values())
+    actualizadas = 0
+    no_encontradas: list[str] = []
+    lotes = 0
+
+    for start in range(0, len(items), INGEST_BATCH_SIZE):
+        batch = items[start : start + INGEST_BATCH_SIZE]
+        current = {
+            row.id: row
+            for row in session.exec(
+                select(
+                    Candidato.id,
+                    Candidato.tipo,
+                    Candidato.partido_id,
+                    Candidato.distrito_id,
+                    Candidato.votos_obtenidos,
+                    Candidato.fue_elegido,
+                )
+                .where(
+                    Candidato.id.in_([item.candidatura_id for item in batch]),
+                    Candidato.proceso_electoral_id == proceso_id,
+                )
+                # Dos ingestas de la misma candidatura no calculan su delta
+                # contra el mismo valor anterior; el orden evita deadlocks
+                .order_by(Candidato.id)
+                .with_for_update()
+            ).all()
+        }
+        no_encontradas.extend(
+            item.candidatura_id for item in batch if item.candidatura_id not in current
+        )
+        changed = [
+            item
+            for item in batch
+            if item.candidatura_id in current
+            and _changed(current[item.candidatura_id], item)
+        ]
+        if not changed:
+            session.commit()  # libera los bloqueos del lote
+            continue
+
+        changed_ids = [item.candidatura_id for item in changed]
+        deltas = _tally_deltas(current, changed)
+        _apply_batch(session, changed)
+        persist_deltas(session, proceso_id, deltas)
+        changes.record_changes(
+            session, changes.CANDIDATURA, changed_ids, changes.UPDATE
+        )
+        refresh_candidatura_cards(session, candidatura_ids=changed_ids)
+        session.commit()
+        tally_store.apply(proceso_id, deltas)
+        actualizadas += len(changed)
+        lotes += 1
+
+    duracion_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        "Ingested results for proceso %s: %d received, %d updated in %.1f ms",
+        proceso_id,
+        len(items),
+        actualizadas,
+        duracion_ms,
+    )
+    return {
+        "recibidas": len(items),
+        "actualizadas": actualizadas,
+        "sin_cambios": len(items) - actualizadas - len(no_encontradas),
+        "no_encontradas": no_encontradas,
+        "lotes": lotes,
+        "duracion_ms": round(duracion_ms, 1),
+    }
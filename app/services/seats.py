@@ -0,0 +1,315 @@
+"""
+Asignación de escaños por cifra repartidora (D'Hondt), vectorizada con NumPy.
+
+Los votos de una cámara se arman como una matriz distritos × partidos y la
+asignación de todos los distritos se resuelve a la vez: se generan los
+cocientes votos / 1..k, se ordenan por distrito y cada distrito se queda con
+sus `n` cocientes más altos. Las mismas funciones aceptan dimensiones extra
+al inicio (escenarios × distritos × partidos) para las simulaciones.
+
+Simplificaciones respecto de la norma:
+- El voto por partido en un distrito es la suma de los votos preferenciales
+  de sus candidatos (el modelo no guarda el voto de lista por separado).
+- Valla: porcentaje de votos válidos a nivel nacional y, para las cámaras
+  con mínimo, al menos VALLA_MIN_ESCANOS escaños en la asignación previa.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlmodel import Session, select
+
+from app.config.settings import get_settings
+from app.models.politics import (
+    Candidato,
+    Distrito,
+    EstadoCandidatura,
+    PartidoPolitico,
+    ProcesoElectoral,
+    TipoCandidatura,
+)
+from app.services import changes
+from app.services.reference import reference_registry
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Columna de Distrito con el número de escaños de cada cámara
+CAMARAS = {
+    TipoCandidatura.SENADOR: "num_senadores",
+    TipoCandidatura.DIPUTADO: "num_diputados",
+    TipoCandidatura.CONGRESISTA: "num_diputados",
+}
+
+# Escaños mínimos para superar la valla (además del porcentaje de votos)
+VALLA_MIN_ESCANOS = {
+    TipoCandidatura.SENADOR: 3,
+    TipoCandidatura.DIPUTADO: 7,
+    TipoCandidatura.CONGRESISTA: 0,
+}
+
+NO_ELEGIBLES = (EstadoCandidatura.INHABILITADO, EstadoCandidatura.TACADO)
+
+# La caché se invalida con cada cambio de candidaturas; la edad máxima cubre
+# commits que llegan con una versión menor a la ya vista.
+CACHE_MAX_AGE_SECONDS = 60
+
+
+@dataclass
+class SeatInputs:
+    """Entradas de una cámara: matriz de votos y candidatos por celda."""
+
+    camara: TipoCandidatura
+    distrito_ids: list[str]
+    partido_ids: list[str]  # ordenados por votos nacionales (desempate)
+    seats: np.ndarray  # (D,)
+    votes: np.ndarray  # (D, P)
+    candidatura_ids: np.ndarray  # (C,)
+    candidato_distrito: np.ndarray  # (C,) índice de distrito
+    candidato_partido: np.ndarray  # (C,) índice de partido
+    candidato_votos: np.ndarray  # (C,)
+    candidato_lista: np.ndarray  # (C,) número de lista (desempate)
+    candidato_elegible: np.ndarray  # (C,) bool
+
+
+def dhondt(votes: np.ndarray, seats: np.ndarray) -> np.ndarray:
+    """
+    Escaños por distrito y partido. `votes` es (..., D, P) y `seats` (D,);
+    los empates se resuelven a favor del partido con menor índice.
+    """
+    votes = np.asarray(votes, dtype=np.float64)
+    max_seats = int(seats.max()) if seats.size else 0
+    if max_seats == 0:
+        return np.zeros(votes.shape, dtype=np.int64)
+
+    num_partidos = votes.shape[-1]
+    quotients = votes[..., None] / np.arange(1, max_seats + 1)
+    flat = quotients.reshape(*votes.shape[:-1], num_partidos * max_seats)
+    order = np.argsort(-flat, axis=-1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(
+        ranks, order, np.broadcast_to(np.arange(flat.shape[-1]), flat.shape), axis=-1
+    )
+    won = (ranks < seats[:, None]) & (flat > 0)
+    return won.reshape(*votes.shape, max_seats).sum(axis=-1)
+
+
+def passing_threshold(
+    votes: np.ndarray, seats: np.ndarray, percent: float, min_seats: int
+) -> np.ndarray:
+    """Partidos (..., P) que superan la valla de votos y de escaños."""
+    national = votes.sum(axis=-2)
+    total = national.sum(axis=-1, keepdims=True)
+    passes = (national * 100 >= percent * total) & (total > 0)
+    if min_seats:
+        provisional = dhondt(votes * passes[..., None, :], seats).sum(axis=-2)
+        passes &= provisional >= min_seats
+    return passes
+
+
+def allocate(
+    votes: np.ndarray, seats: np.ndarray, camara: TipoCandidatura
+) -> tuple[np.ndarray, np.ndarray]:
+    """Aplica la valla y reparte. Retorna (escaños (..., D, P), valla (..., P))."""
+    passes = passing_threshold(
+        votes, seats, settings.SEATS_THRESHOLD_PERCENT, VALLA_MIN_ESCANOS[camara]
+    )
+    return dhondt(votes * passes[..., None, :], seats), passes
+
+
+def elect_candidates(inputs: SeatInputs, escanos: np.ndarray) -> np.ndarray:
+    """
+    Voto preferencial: en cada distrito y partido salen elegidos los
+    candidatos más votados (desempate por número de lista).
+    """
+    if not inputs.candidatura_ids.size:
+        return np.zeros(0, dtype=bool)
+    num_partidos = len(inputs.partido_ids)
+    group = inputs.candidato_distrito * num_partidos + inputs.candidato_partido
+    # Los no elegibles van al final de su grupo
+    order = np.lexsort(
+        (
+            inputs.candidato_lista,
+            -inputs.candidato_votos,
+            ~inputs.candidato_elegible,
+            group,
+        )
+    )
+    sorted_group = group[order]
+    starts = np.flatnonzero(np.r_[True, sorted_group[1:] != sorted_group[:-1]])
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    rank = np.arange(len(order)) - group_start
+
+    elected = np.zeros(len(order), dtype=bool)
+    elected[order] = (rank < escanos.reshape(-1)[sorted_group]) & (
+        inputs.candidato_elegible[order]
+    )
+    return elected
+
+
+def load_inputs(session: Session, proceso_id: str) -> dict[TipoCandidatura, SeatInputs]:
+    """Arma las matrices de votos de cada cámara presente en el proceso."""
+    rows = session.exec(
+        select(
+            Candidato.id,
+            Candidato.tipo,
+            Candidato.partido_id,
+            Candidato.distrito_id,
+            Candidato.votos_obtenidos,
+            Candidato.numero_lista,
+            Candidato.estado,
+        ).where(
+            Candidato.proceso_electoral_id == proceso_id,
+            Candidato.tipo.in_(list(CAMARAS)),
+        )
+    ).all()
+    distritos = session.exec(select(Distrito).where(Distrito.activo)).all()
+    nacional = next((d.id for d in distritos if d.es_distrito_nacional), None)
+
+    inputs = {}
+    for camara, seats_column in CAMARAS.items():
+        camara_rows = [row for row in rows if row.tipo == camara]
+        if not camara_rows:
+            continue
+        seats_by_distrito = {
+            d.id: getattr(d, seats_column)
+            for d in distritos
+            if getattr(d, seats_column) > 0
+        }
+        # Candidaturas sin distrito compiten en el distrito nacional
+        camara_rows = [
+            (row, row.distrito_id or nacional)
+            for row in camara_rows
+            if (row.distrito_id or nacional) in seats_by_distrito
+        ]
+        if not camara_rows:
+            continue
+        inputs[camara] = _build_inputs(camara, camara_rows, seats_by_distrito)
+    return inputs
+
+
+def _build_inputs(
+    camara: TipoCandidatura, camara_rows: list, seats_by_distrito: dict[str, int]
+) -> SeatInputs:
+    distrito_ids = list(seats_by_distrito)
+    distrito_index = {distrito_id: i for i, distrito_id in enumerate(distrito_ids)}
+    votos = np.array([row.votos_obtenidos or 0 for row, _ in camara_rows], np.int64)
+    partido_codes, candidato_partido = np.unique(
+        [row.partido_id for row, _ in camara_rows], return_inverse=True
+    )
+    candidato_distrito = np.array(
+        [distrito_index[distrito_id] for _, distrito_id in camara_rows], np.int64
+    )
+
+    votes = np.zeros((len(distrito_ids), len(partido_codes)), dtype=np.int64)
+    np.add.at(votes, (candidato_distrito, candidato_partido), votos)
+
+    # Partidos ordenados por votos nacionales: D'Hondt desempata por índice
+    by_votes = np.argsort(-votes.sum(axis=0), kind="stable")
+    remap = np.empty_like(by_votes)
+    remap[by_votes] = np.arange(len(by_votes))
+
+    return SeatInputs(
+        camara=camara,
+        distrito_ids=distrito_ids,
+        partido_ids=[str(partido_codes[i]) for i in by_votes],
+        seats=np.array([seats_by_distrito[d] for d in distrito_ids], np.int64),
+        votes=votes[:, by_votes],
+        candidatura_ids=np.array([row.id for row, _ in camara_rows]),
+        candidato_distrito=candidato_distrito,
+        candidato_partido=remap[candidato_partido],
+        candidato_votos=votos,
+        candidato_lista=np.array(
+            [row.numero_lista or 0 for row, _ in camara_rows], np.int64
+        ),
+        candidato_elegible=np.array(
+            [row.estado not in NO_ELEGIBLES for row, _ in camara_rows], dtype=bool
+        ),
+    )
+
+
+def _camara_result(inputs: SeatInputs, partidos: dict[str, PartidoPolitico]) -> dict:
+    escanos, passes = allocate(inputs.votes, inputs.seats, inputs.camara)
+    elected = elect_candidates(inputs, escanos)
+    national = inputs.votes.sum(axis=0)
+    total = int(national.sum())
+
+    resultado = []
+    for p, partido_id in enumerate(inputs.partido_ids):
+        partido = partidos.get(partido_id)
+        por_distrito = {
+            inputs.distrito_ids[d]: int(n) for d, n in enumerate(escanos[:, p]) if n > 0
+        }
+        resultado.append(
+            {
+                "partido_id": partido_id,
+                "nombre": partido.nombre if partido else None,
+                "sigla": partido.sigla if partido else None,
+                "votos": int(national[p]),
+                "porcentaje": round(100 * national[p] / total, 3) if total else 0.0,
+                "supera_valla": bool(passes[p]),
+                "escanos": int(escanos[:, p].sum()),
+                "escanos_por_distrito": por_distrito,
+                "electos": inputs.candidatura_ids[
+                    elected & (inputs.candidato_partido == p)
+                ].tolist(),
+            }
+        )
+    resultado.sort(key=lambda r: (-r["escanos"], -r["votos"]))
+    return {
+        "camara": inputs.camara,
+        "total_escanos": int(inputs.seats.sum()),
+        "votos_validos": total,
+        "partidos": resultado,
+    }
+
+
+# proceso_id -> (versión del change log, momento del cálculo, resultado)
+_cache: dict[str, tuple[int, float, dict]] = {}
+
+
+async def get_escanos(proceso_id: str, session: Session) -> dict:
+    """
+    Proyección de escaños por partido y cámara. Se recalcula solo cuando
+    hubo cambios en candidaturas desde el último cálculo.
+    """
+    version = changes.latest_version(session, [changes.CANDIDATURA])
+    cached = _cache.get(proceso_id)
+    if (
+        cached is not None
+        and cached[0] == version
+        and time.monotonic() - cached[1] < CACHE_MAX_AGE_SECONDS
+    ):
+        return cached[2]
+
+    if not reference_registry.exists(session, ProcesoElectoral, proceso_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Proceso electoral no encontrado",
+        )
+
+    started = time.perf_counter()
+    inputs = load_inputs(session, proceso_id)
+    partido_ids = {p for camara in inputs.values() for p in camara.partido_ids}
+    partidos = {
+        partido.id: partido
+        for partido in session.exec(
+            select(PartidoPolitico).where(PartidoPolitico.id.in_(partido_ids))
+        ).all()
+    }
+    result = {
+        "proceso_electoral_id": proceso_id,
+        "version": version,
+        "camaras": [_camara_result(camara, partidos) for camara in inputs.values()],
+        "duracion_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    _cache[proceso_id] = (version, time.monotonic(), result)
+    logger.debug(
+        "Seat allocation for proceso %s computed in %.1f ms",
+        proceso_id,
+        result["duracion_ms"],
+    )
+    return result
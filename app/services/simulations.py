@@ -0,0 +1,266 @@
+"""
+Simulación Monte Carlo de escaños ("¿y si el partido X pasa la valla?").
+
+Parte de las mismas matrices de votos que la proyección de escaños
+(app.services.seats), las perturba con ruido multiplicativo (un shock
+nacional por partido más uno local por distrito) y reparte cada escenario
+con D'Hondt vectorizado. Los escenarios se dividen en bloques que corren en
+un pool de procesos, así el cálculo no bloquea el event loop ni queda
+limitado por el GIL. Cada bloque recibe una semilla derivada de la semilla
+pedida, por lo que el resultado no depende del orden de ejecución.
+
+Los resultados se guardan por hash del snapshot de entrada (votos, escaños
+y parámetros): repetir la misma simulación no vuelve a calcular. Como máximo
+SIMULATION_MAX_CONCURRENT simulaciones calculan a la vez por worker; con
+todas ocupadas se responde 503 en vez de encolar trabajo en el pool.
+"""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlmodel import Session, select
+
+from app.config.settings import get_settings
+from app.models.politics import PartidoPolitico, ProcesoElectoral
+from app.schemas.politics import SimulacionRequest
+from app.services.reference import reference_registry
+from app.services.seats import (
+    VALLA_MIN_ESCANOS,
+    SeatInputs,
+    dhondt,
+    load_inputs,
+    passing_threshold,
+)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+CACHE_MAX_ENTRIES = 64
+
+_pool: Optional[ProcessPoolExecutor] = None
+_cache: OrderedDict[str, dict] = OrderedDict()
+_running = 0
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: no heredar hilos ni conexiones abiertas del servidor
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.SIMULATION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+@contextmanager
+def _simulation_slot():
+    """Cupo de cálculo; 503 con Retry-After si no hay ninguno libre."""
+    global _running
+    if _running >= settings.SIMULATION_MAX_CONCURRENT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=(
+                "Hay demasiadas simulaciones en curso, "
+                "intente nuevamente en unos segundos"
+            ),
+            headers={"Retry-After": "5"},
+        )
+    _running += 1
+    try:
+        yield
+    finally:
+        _running -= 1
+
+
+def shutdown_pool() -> None:
+    """Detiene el pool de procesos (lifespan shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def simulate_chunk(
+    votes: np.ndarray,
+    seats: np.ndarray,
+    factors: np.ndarray,
+    sigma: float,
+    percent: float,
+    min_seats: int,
+    scenarios: int,
+    seed: np.random.SeedSequence,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Corre `scenarios` escenarios en un proceso del pool.
+    Retorna escaños (scenarios, P) y quién supera la valla (scenarios, P).
+    """
+    rng = np.random.default_rng(seed)
+    num_distritos, num_partidos = votes.shape
+    national = rng.standard_normal((scenarios, 1, num_partidos))
+    local = rng.standard_normal((scenarios, num_distritos, num_partidos))
+    noise = np.exp(sigma * (national + 0.5 * local) - 0.625 * sigma**2)
+    perturbed = votes * factors * noise
+
+    passes = passing_threshold(perturbed, seats, percent, min_seats)
+    escanos = dhondt(perturbed * passes[:, None, :], seats).sum(axis=-2)
+    return escanos.astype(np.int32), passes
+
+
+def _snapshot_hash(inputs: SeatInputs, data: SimulacionRequest) -> str:
+    digest = hashlib.sha256()
+    digest.update(inputs.camara.name.encode())
+    digest.update(inputs.votes.tobytes())
+    digest.update(inputs.seats.tobytes())
+    digest.update(",".join(inputs.partido_ids).encode())
+    digest.update(data.model_dump_json().encode())
+    digest.update(str(settings.SEATS_THRESHOLD_PERCENT).encode())
+    return digest.hexdigest()
+
+
+async def _simulate_camara(inputs: SeatInputs, data: SimulacionRequest) -> dict:
+    factors = np.array([data.ajustes.get(p, 1.0) for p in inputs.partido_ids])
+    chunk_size = settings.SIMULATION_CHUNK_SIZE
+    sizes = [
+        min(chunk_size, data.escenarios - start)
+        for start in range(0, data.escenarios, chunk_size)
+    ]
+    seeds = np.random.SeedSequence(data.semilla).spawn(len(sizes))
+
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    chunks = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                pool,
+                simulate_chunk,
+                inputs.votes,
+                inputs.seats,
+                factors,
+                data.incertidumbre,
+                settings.SEATS_THRESHOLD_PERCENT,
+                VALLA_MIN_ESCANOS[inputs.camara],
+                size,
+                seed,
+            )
+            for size, seed in zip(sizes, seeds, strict=True)
+        )
+    )
+    escanos = np.concatenate([chunk[0] for chunk in chunks])
+    passes = np.concatenate([chunk[1] for chunk in chunks])
+    return _summarize(inputs, escanos, passes)
+
+
+def _summarize(inputs: SeatInputs, escanos: np.ndarray, passes: np.ndarray) -> dict:
+    total_escanos = int(inputs.seats.sum())
+    mayoria = total_escanos // 2 + 1
+    p05, p50, p95 = np.percentile(escanos, [5, 50, 95], axis=0)
+    partidos = []
+    for p, partido_id in enumerate(inputs.partido_ids):
+        counts = np.bincount(escanos[:, p])
+        distribucion = {
+            int(n): round(float(c) / len(escanos), 4) for n, c in enumerate(counts) if c
+        }
+        partidos.append(
+            {
+                "partido_id": partido_id,
+                "votos_base": int(inputs.votes[:, p].sum()),
+                "escanos_media": round(float(escanos[:, p].mean()), 2),
+                "escanos_p05": int(p05[p]),
+                "escanos_mediana": int(p50[p]),
+                "escanos_p95": int(p95[p]),
+                "prob_supera_valla": round(float(passes[:, p].mean()), 4),
+                "prob_mayoria": round(float((escanos[:, p] >= mayoria).mean()), 4),
+                "distribucion": distribucion,
+            }
+        )
+    partidos.sort(key=lambda r: -r["escanos_media"])
+    return {
+        "camara": inputs.camara,
+        "total_escanos": total_escanos,
+        "partidos": partidos,
+    }
+
+
+async def simulate(proceso_id: str, data: SimulacionRequest, session: Session) -> dict:
+    """Simula todas las cámaras del proceso y agrega las distribuciones."""
+    if not reference_registry.exists(session, ProcesoElectoral, proceso_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Proceso electoral no encontrado",
+        )
+
+    inputs = load_inputs(session, proceso_id)
+    known = {p for camara in inputs.values() for p in camara.partido_ids}
+    unknown = set(data.ajustes) - known
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Partidos sin candidaturas en el proceso: {', '.join(unknown)}",
+        )
+    partidos = {
+        partido.id: partido
+        for partido in session.exec(
+            select(PartidoPolitico).where(PartidoPolitico.id.in_(known))
+        ).all()
+    }
+    # Liberar la conexión mientras corre el cálculo
+    session.close()
+
+    keyed = [(camara, _snapshot_hash(camara, data)) for camara in inputs.values()]
+    # Solo ocupa cupo si hay algo que calcular
+    slot = (
+        _simulation_slot()
+        if any(key not in _cache for _, key in keyed)
+        else nullcontext()
+    )
+    camaras = []
+    with slot:
+        for camara, key in keyed:
+            result = _cache.get(key)
+            if result is None:
+                started = time.perf_counter()
+                result = await _simulate_camara(camara, data)
+                result["hash"] = key
+                result["duracion_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                _cache[key] = result
+                while len(_cache) > CACHE_MAX_ENTRIES:
+                    _cache.popitem(last=False)
+                logger.info(
+                    "Simulated %d scenarios for %s in %.1f ms",
+                    data.escenarios,
+                    camara.camara.name,
+                    result["duracion_ms"],
+                )
+            else:
+                _cache.move_to_end(key)
+            camaras.append(result)
+
+    return {
+        "proceso_electoral_id": proceso_id,
+        "escenarios": data.escenarios,
+        "camaras": [_with_partido_names(camara, partidos) for camara in camaras],
+    }
+
+
+def _with_partido_names(camara: dict, partidos: dict[str, PartidoPolitico]) -> dict:
+    rows = []
+    for row in camara["partidos"]:
+        partido = partidos.get(row["partido_id"])
+        rows.append(
+            {
+                **row,
+                "nombre": partido.nombre if partido else None,
+                "sigla": partido.sigla if partido else None,
+            }
+        )
+    return {**camara, "partidos": rows}
@@ -0,0 +1,282 @@
+"""
+Totales de votos por partido, distrito y proceso, mantenidos por deltas.
+
+La ingesta de resultados (app.services.results_ingestion) calcula la
+diferencia de votos de cada candidatura que cambia y la suma a
+`resultado_agregado` con un upsert por lote, dentro de su transacción. Cada
+worker guarda además los totales en memoria (TallyStore): el que ingesta
+aplica los deltas al confirmar y todos recargan desde la tabla cada
+TALLY_REFRESH_SECONDS, que es una lectura de pocas filas en vez de un
+SUM ... GROUP BY sobre todas las candidaturas.
+
+Las escrituras fuera de la ingesta (p. ej. update_candidatura) no aplican
+deltas; la reconciliación periódica recalcula los totales desde candidato,
+registra la deriva encontrada y la corrige.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from app.config.database import db_manager
+from app.config.settings import get_settings
+from app.models.politics import (
+    Candidato,
+    ProcesoElectoral,
+    ResultadoAgregado,
+    TipoCandidatura,
+    utc_now,
+)
+from app.services.reference import reference_registry
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+SIN_DISTRITO = ""
+
+# (tipo, partido_id, distrito_id) -> votos
+TallyKey = tuple[TipoCandidatura, str, str]
+
+AGRUPACIONES = ("partido", "distrito", "partido,distrito")
+
+
+def _dialect_insert(session: Session):
+    dialect = session.get_bind().dialect.name
+    return sqlite.insert if dialect == "sqlite" else postgresql.insert
+
+
+def persist_deltas(
+    session: Session, proceso_id: str, deltas: dict[TallyKey, int]
+) -> None:
+    """Suma los deltas a resultado_agregado (no hace commit)."""
+    rows = [
+        {
+            "proceso_electoral_id": proceso_id,
+            "tipo": tipo,
+            "partido_id": partido_id,
+            "distrito_id": distrito_id,
+            "votos": delta,
+            "updated_at": utc_now(),
+        }
+        for (tipo, partido_id, distrito_id), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    insert = _dialect_insert(session)(ResultadoAgregado).values(rows)
+    session.execute(
+        insert.on_conflict_do_update(
+            index_elements=[
+                "proceso_electoral_id",
+                "tipo",
+                "partido_id",
+                "distrito_id",
+            ],
+            set_={
+                "votos": ResultadoAgregado.votos + insert.excluded.votos,
+                "updated_at": insert.excluded.updated_at,
+            },
+        )
+    )
+
+
+class TallyStore:
+    """Totales en memoria por proceso, refrescados desde resultado_agregado."""
+
+    def __init__(self) -> None:
+        self._tallies: dict[str, dict[TallyKey, int]] = {}
+        self._loaded_at: dict[str, float] = {}
+
+    def apply(self, proceso_id: str, deltas: dict[TallyKey, int]) -> None:
+        """Aplica deltas ya confirmados en la base de datos."""
+        tally = self._tallies.get(proceso_id)
+        if tally is None:
+            return
+        for key, delta in deltas.items():
+            tally[key] = tally.get(key, 0) + delta
+
+    def invalidate(self, proceso_id: Optional[str] = None) -> None:
+        if proceso_id is None:
+            self._loaded_at.clear()
+        else:
+            self._loaded_at.pop(proceso_id, None)
+
+    def get(self, session: Session, proceso_id: str) -> dict[TallyKey, int]:
+        loaded_at = self._loaded_at.get(proceso_id)
+        if (
+            loaded_at is None
+            or time.monotonic() - loaded_at >= settings.TALLY_REFRESH_SECONDS
+        ):
+            rows = session.exec(
+                select(ResultadoAgregado).where(
+                    ResultadoAgregado.proceso_electoral_id == proceso_id
+                )
+            ).all()
+            self._tallies[proceso_id] = {
+                (row.tipo, row.partido_id, row.distrito_id): row.votos for row in rows
+            }
+            self._loaded_at[proceso_id] = time.monotonic()
+        return self._tallies[proceso_id]
+
+
+tally_store = TallyStore()
+
+
+async def get_totales(
+    proceso_id: str,
+    session: Session,
+    tipo: Optional[TipoCandidatura],
+    agrupar: str,
+) -> dict:
+    """Totales agrupados por partido, distrito o ambos."""
+    if agrupar not in AGRUPACIONES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"agrupar debe ser uno de: {', '.join(AGRUPACIONES)}",
+        )
+    if not reference_registry.exists(session, ProcesoElectoral, proceso_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Proceso electoral no encontrado",
+        )
+
+    by_partido = "partido" in agrupar
+    by_distrito = "distrito" in agrupar
+    grouped: dict[tuple, int] = defaultdict(int)
+    total = 0
+    for (key_tipo, partido_id, distrito_id), votos in tally_store.get(
+        session, proceso_id
+    ).items():
+        if tipo is not None and key_tipo != tipo:
+            continue
+        group = (
+            key_tipo,
+            partido_id if by_partido else None,
+            (distrito_id or None) if by_distrito else None,
+        )
+        grouped[group] += votos
+        total += votos
+
+    totales = [
+        {
+            "tipo": key_tipo,
+            "partido_id": partido_id,
+            "distrito_id": distrito_id,
+            "votos": votos,
+        }
+        for (key_tipo, partido_id, distrito_id), votos in grouped.items()
+    ]
+    totales.sort(key=lambda row: (row["tipo"].name, -row["votos"]))
+    return {"proceso_electoral_id": proceso_id, "total": total, "totales": totales}
+
+
+def reconcile(session: Session, proceso_id: str) -> int:
+    """
+    Recalcula los totales del proceso desde candidato y corrige las filas que
+    difieren. Retorna cuántas filas tenían deriva.
+
+    Bloquea primero las filas agregadas del proceso: una ingesta concurrente
+    espera y aplica su delta sobre el valor reconciliado.
+    """
+    stored = {
+        (row.tipo, row.partido_id, row.distrito_id): row.votos
+        for row in session.exec(
+            select(ResultadoAgregado)
+            .where(ResultadoAgregado.proceso_electoral_id == proceso_id)
+            .with_for_update()
+        ).all()
+    }
+    actual = {
+        (tipo, partido_id, distrito_id or SIN_DISTRITO): int(votos)
+        for tipo, partido_id, distrito_id, votos in session.exec(
+            select(
+                Candidato.tipo,
+                Candidato.partido_id,
+                Candidato.distrito_id,
+                func.coalesce(func.sum(Candidato.votos_obtenidos), 0),
+            )
+            .where(Candidato.proceso_electoral_id == proceso_id)
+            .group_by(Candidato.tipo, Candidato.partido_id, Candidato.distrito_id)
+        ).all()
+    }
+
+    drift = {
+        key: actual.get(key, 0) - stored.get(key, 0)
+        for key in stored.keys() | actual.keys()
+        if actual.get(key, 0) != stored.get(key, 0)
+    }
+    if drift:
+        logger.warning(
+            "Tally drift in proceso %s: %d rows off by %d votes in total",
+            proceso_id,
+            len(drift),
+            sum(abs(delta) for delta in drift.values()),
+        )
+        persist_deltas(session, proceso_id, drift)
+
+    # Grupos que ya no tienen candidaturas
+    for tipo, partido_id, distrito_id in stored.keys() - actual.keys():
+        session.execute(
+            delete(ResultadoAgregado).where(
+                ResultadoAgregado.proceso_electoral_id == proceso_id,
+                ResultadoAgregado.tipo == tipo,
+                ResultadoAgregado.partido_id == partido_id,
+                ResultadoAgregado.distrito_id == distrito_id,
+            )
+        )
+    session.commit()
+    tally_store.invalidate(proceso_id)
+    return len(drift)
+
+
+def reconcile_active(session: Session) -> int:
+    """Reconcilia todos los procesos activos."""
+    proceso_ids = session.exec(
+        select(ProcesoElectoral.id).where(ProcesoElectoral.activo)
+    ).all()
+    return sum(reconcile(session, proceso_id) for proceso_id in proceso_ids)
+
+
+class TallyReconciler:
+    """Tarea de fondo que reconcilia cada TALLY_RECONCILE_SECONDS."""
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None and settings.TALLY_RECONCILE_SECONDS > 0:
+            self._task = asyncio.create_task(self._run(), name="tally-reconciler")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @staticmethod
+    def _reconcile() -> int:
+        with db_manager.get_session_context() as session:
+            return reconcile_active(session)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.TALLY_RECONCILE_SECONDS)
+            try:
+                # El GROUP BY y las esperas de FOR UPDATE corren fuera del event loop
+                await asyncio.to_thread(self._reconcile)
+            except Exception as e:
+                logger.error("Tally reconciliation failed: %s", e)
+
+
+tally_reconciler = TallyReconciler()
@@ -0,0 +1,126 @@
+"""
+Purga de tokens vencidos (UserToken y VerificationToken).
+
+Cada login inserta un UserToken y nada los borraba. La purga elimina las
+filas con `expires_at` pasado en lotes de TOKEN_PURGE_BATCH_SIZE, cada uno
+en su propia transacción: los bloqueos duran lo que un lote y las escrituras
+del login no esperan a la purga completa.
+
+En Postgres cada lote toma `pg_try_advisory_xact_lock`, así que con varios
+workers solo uno purga a la vez (los demás lo dejan para la próxima vuelta),
+y las filas bloqueadas por otra transacción (p. ej. un refresh en curso) se
+saltan con SKIP LOCKED.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func
+from sqlmodel import Session, SQLModel, select
+
+from app.config.database import db_manager
+from app.config.settings import get_settings
+from app.models.auth import UserToken, VerificationToken
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MODELS = (UserToken, VerificationToken)
+# Clave del advisory lock de la purga (arbitraria, fija para todos los workers)
+PURGE_LOCK_KEY = 0x70B6E5
+
+
+def _purge_batch(
+    session: Session, model: type[SQLModel], cutoff: datetime, batch_size: int
+) -> Optional[int]:
+    """Borra un lote y confirma. None si otro worker tiene el lock."""
+    ids = select(model.id).where(model.expires_at < cutoff).limit(batch_size)
+    if session.get_bind().dialect.name == "postgresql":
+        if not session.exec(
+            select(func.pg_try_advisory_xact_lock(PURGE_LOCK_KEY))
+        ).one():
+            session.rollback()
+            return None
+        ids = ids.with_for_update(skip_locked=True)
+
+    batch = session.exec(ids).all()
+    if batch:
+        session.exec(delete(model).where(model.id.in_(batch)))
+    session.commit()
+    return len(batch)
+
+
+def purge_expired(
+    session: Session,
+    model: type[SQLModel],
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> int:
+    """Borra los tokens vencidos de `model` en lotes. Retorna las filas borradas."""
+    batch_size = batch_size or settings.TOKEN_PURGE_BATCH_SIZE
+    cutoff = datetime.now(timezone.utc)
+    deleted = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        count = _purge_batch(session, model, cutoff, batch_size)
+        if count is None:
+            logger.debug("Token purge skipped: another worker holds the lock")
+            break
+        deleted += count
+        batches += 1
+        if count < batch_size:
+            break
+        if settings.TOKEN_PURGE_BATCH_PAUSE_SECONDS > 0:
+            time.sleep(settings.TOKEN_PURGE_BATCH_PAUSE_SECONDS)
+    return deleted
+
+
+def purge_all(session: Session, max_batches: Optional[int] = None) -> dict[str, int]:
+    """Purga todos los modelos de tokens. Retorna las filas borradas por tabla."""
+    return {
+        model.__tablename__: purge_expired(session, model, max_batches=max_batches)
+        for model in MODELS
+    }
+
+
+class TokenPurger:
+    """Tarea de fondo que purga tokens vencidos cada TOKEN_PURGE_INTERVAL_SECONDS."""
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None and settings.TOKEN_PURGE_INTERVAL_SECONDS > 0:
+            self._task = asyncio.create_task(self._run(), name="token-purger")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @staticmethod
+    def _purge() -> dict[str, int]:
+        with db_manager.get_session_context() as session:
+            return purge_all(session, max_batches=settings.TOKEN_PURGE_MAX_BATCHES)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.TOKEN_PURGE_INTERVAL_SECONDS)
+            try:
+                # Los lotes y sus pausas corren fuera del event loop
+                deleted = await asyncio.to_thread(self._purge)
+                if any(deleted.values()):
+                    logger.info("Purged expired tokens: %s", deleted)
+            except Exception as e:
+                logger.error("Token purge failed: %s", e)
+
+
+token_purger = TokenPurger()
@@ -4,6 +4,8 @@ from app.config.settings import get_settings
 
 settings = get_settings()
 
+PRIMARY_READS_COOKIE = "db_primary_reads"
+
 
 def _set_token_cookies(response: Response, result: dict) -> None:
     """Set access and refresh cookies securely."""
@@ -36,3 +38,16 @@ def _clear_token_cookies(response: Response) -> None:
     """Remove auth cookies (for logout)."""
     response.delete_cookie("access_token", path="/", httponly=True)
     response.delete_cookie("refresh_token", path="/", httponly=True)
+
+
+def _set_primary_reads_cookie(response: Response) -> None:
+    """Mark the client as a recent writer (read-your-writes window)."""
+    response.set_cookie(
+        key=PRIMARY_READS_COOKIE,
+        value="1",
+        httponly=True,
+        secure=settings.ENVIRONMENT == "production",
+        samesite="lax",
+        max_age=settings.READ_YOUR_WRITES_SECONDS,
+        path="/",
+    )
@@ -0,0 +1,139 @@
+"""
+Sparse fieldsets: `?fields=id,nombre_completo,foto_url`.
+
+El mismo conjunto de campos recorta la consulta (load_only sobre las
+columnas pedidas, sin cargar relaciones que no se devuelven) y la
+serialización (un modelo de respuesta reducido, generado y cacheado por
+combinación de campos).
+"""
+
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import load_only
+
+from app.responses.base import FastJSONResponse
+
+# Campos que siempre se devuelven, aunque no se pidan
+ALWAYS_INCLUDED = frozenset({"id"})
+
+
+def parse_fields(
+    raw: Optional[str], response_model: type[BaseModel]
+) -> Optional[frozenset[str]]:
+    """
+    Valida `?fields=` contra el modelo de respuesta.
+    None significa "todos los campos" (comportamiento por defecto).
+    """
+    if not raw:
+        return None
+
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested - response_model.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos desconocidos: {', '.join(sorted(unknown))}",
+        )
+    return frozenset(requested | ALWAYS_INCLUDED)
+
+
+def wants(fields: Optional[frozenset[str]], name: str) -> bool:
+    return fields is None or name in fields
+
+
+def column_names(model: type, fields: Optional[frozenset[str]]) -> list[str]:
+    """Columnas del modelo ORM que corresponden a los campos pedidos."""
+    columns = [attr.key for attr in sa_inspect(model).column_attrs]
+    if fields is None:
+        return columns
+    return [name for name in columns if name in fields]
+
+
+def load_columns(model: type, fields: Optional[frozenset[str]]):
+    """Opción load_only para las columnas pedidas (la PK siempre se carga)."""
+    return load_only(
+        *(getattr(model, name) for name in column_names(model, fields) or ["id"])
+    )
+
+
+def loaded_dict(obj: Any, fields: Optional[frozenset[str]]) -> dict:
+    """
+    Columnas ya cargadas de una instancia, sin disparar cargas diferidas
+    (model_dump() leería todas las columnas, también las excluidas).
+    """
+    if fields is None:
+        return obj.model_dump()
+    return {name: getattr(obj, name) for name in column_names(type(obj), fields)}
+
+
+def plain_data(value: Any, _path: frozenset[int] = frozenset()) -> Any:
+    """
+    Copia `value` sin instancias ORM: cada instancia pasa a dict con sus
+    columnas y relaciones ya cargadas, sin disparar cargas ni depender de la
+    sesión. Una instancia que reaparece dentro de sí misma (persona ->
+    candidatura -> persona) se copia sin relaciones.
+    """
+    if hasattr(value, "_sa_instance_state"):
+        state = sa_inspect(value)
+        unloaded = state.unloaded
+        nested = _path | {id(value)}
+        data = {
+            attr.key: state.dict.get(attr.key)
+            for attr in state.mapper.column_attrs
+            if attr.key not in unloaded
+        }
+        if id(value) not in _path:
+            for rel in state.mapper.relationships:
+                if rel.key not in unloaded:
+                    data[rel.key] = plain_data(state.dict.get(rel.key), nested)
+        return data
+    if isinstance(value, dict):
+        return {key: plain_data(item, _path) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [plain_data(item, _path) for item in value]
+    return value
+
+
+@lru_cache(maxsize=256)
+def sparse_model(
+    response_model: type[BaseModel], fields: frozenset[str]
+) -> type[BaseModel]:
+    """Modelo de respuesta con solo los campos pedidos (cacheado)."""
+    definitions = {
+        name: (info.annotation, info)
+        for name, info in response_model.model_fields.items()
+        if name in fields
+    }
+    return create_model(
+        f"{response_model.__name__}Sparse",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+
+
+@lru_cache(maxsize=256)
+def _adapter(model: type[BaseModel], many: bool) -> TypeAdapter:
+    return TypeAdapter(list[model] if many else model)
+
+
+def sparse_response(
+    response_model: type[BaseModel],
+    fields: Optional[frozenset[str]],
+    content: Any,
+    many: bool = False,
+):
+    """
+    Serializa `content` con el modelo reducido.
+    Sin `fields` retorna el contenido tal cual para que FastAPI lo valide
+    con el response_model completo de la ruta.
+    """
+    if fields is None:
+        return content
+
+    adapter = _adapter(sparse_model(response_model, fields), many)
+    validated = adapter.validate_python(content, from_attributes=True)
+    return FastJSONResponse(content=adapter.dump_python(validated, mode="json"))
@@ -0,0 +1,82 @@
+"""
+Generación de llaves primarias.
+
+- "cuid": cuid2 (aleatorio, 24 caracteres), el formato histórico. Usa una
+  sola instancia de Cuid: crearla por id recalcula su huella cada vez.
+- "sortable": 48 bits de milisegundos + 80 aleatorios en base32 Crockford
+  (26 caracteres, estilo ULID). El orden lexicográfico sigue al de creación,
+  así que las inserciones caen al final del btree de la llave primaria y de
+  las foráneas que la referencian en vez de repartirse por todo el índice.
+
+Ambos formatos son texto en minúsculas y conviven en las mismas columnas; la
+estrategia (ID_STRATEGY) solo afecta a las filas nuevas.
+"""
+
+import secrets
+import threading
+import time
+from typing import Callable, Optional
+
+from cuid2 import Cuid
+
+from app.config.settings import get_settings
+
+_CROCKFORD = "0123456789abcdefghjkmnpqrstvwxyz"
+_RANDOM_BITS = 80
+
+_cuid = Cuid()
+
+
+def cuid_id() -> str:
+    return _cuid.generate()
+
+
+class SortableIdGenerator:
+    """
+    Ids ordenables por tiempo. Dentro del mismo milisegundo la parte
+    aleatoria se incrementa, así que son monotónicos en el proceso.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._random = 0
+
+    def generate(self) -> str:
+        with self._lock:
+            ms = time.time_ns() // 1_000_000
+            if ms > self._last_ms:
+                self._random = secrets.randbits(_RANDOM_BITS)
+            else:
+                # Mismo milisegundo (o reloj que retrocede): seguir la secuencia
+                ms = self._last_ms
+                self._random += 1
+                if self._random >> _RANDOM_BITS:
+                    ms += 1
+                    self._random = secrets.randbits(_RANDOM_BITS)
+            self._last_ms = ms
+            value = (ms << _RANDOM_BITS) | self._random
+
+        chars = []
+        for _ in range(26):
+            chars.append(_CROCKFORD[value & 31])
+            value >>= 5
+        return "".join(reversed(chars))
+
+
+_sortable = SortableIdGenerator()
+
+GENERATORS: dict[str, Callable[[], str]] = {
+    "cuid": cuid_id,
+    "sortable": _sortable.generate,
+}
+
+_generator: Optional[Callable[[], str]] = None
+
+
+def new_id() -> str:
+    """Id para una fila nueva, según ID_STRATEGY (default_factory de los modelos)."""
+    global _generator
+    if _generator is None:
+        _generator = GENERATORS[get_settings().ID_STRATEGY]
+    return _generator()
@@ -0,0 +1,113 @@
+"""
+Single-flight: peticiones idénticas y simultáneas comparten una ejecución.
+
+La primera llamada con una clave (el "líder") ejecuta la función en el
+threadpool; las que llegan mientras tanto esperan su resultado (o su
+excepción) en vez de repetir las mismas consultas. Al terminar, la clave se
+libera: no es una caché.
+
+Los servicios de politics son `async def` con cuerpo síncrono, así que en el
+event loop corren de a uno y nunca se solaparían. `coalesce` corre el cuerpo
+completo en un hilo, lo que además deja libre el loop mientras tanto. Las
+sesiones de los seguidores no llegan a pedir conexión al pool.
+
+El líder no usa la sesión de la petición que lo originó: esa petición puede
+cancelarse y cerrarla mientras el hilo sigue trabajando. Abre su propia
+sesión contra el mismo engine y comparte solo datos planos (plain_data),
+copiados antes de cerrarla.
+"""
+
+import asyncio
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.fieldsets import plain_data
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Agrupa llamadas en curso por clave."""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Ejecuta `fn` (síncrona) una sola vez por clave en curso. La tarea no
+        se cancela si el líder se desconecta: los seguidores la siguen
+        esperando.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(run_in_threadpool(fn))
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
+
+
+def _run_to_completion(coro) -> Any:
+    """Corre una corrutina que no suspende (cuerpo síncrono)."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("Coalesced functions must not await")
+
+
+def _run_leader(fn: Callable[..., Awaitable[T]], arguments: dict[str, Any]) -> Any:
+    """Corre el servicio con sesiones propias y retorna una copia sin ORM."""
+    own = {
+        name: Session(bind=value.get_bind(), autoflush=False)
+        for name, value in arguments.items()
+        if isinstance(value, Session)
+    }
+    try:
+        return plain_data(_run_to_completion(fn(**{**arguments, **own})))
+    finally:
+        for session in own.values():
+            session.close()
+
+
+def _normalize(value: Any) -> Hashable:
+    if isinstance(value, Session):
+        # Cada engine (primario o réplica) es su propio grupo: leer del
+        # primario (read-your-writes) no se mezcla con réplicas
+        return ("session", str(value.get_bind().url))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_normalize(v) for v in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    return value
+
+
+def coalesce(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Decorador para servicios de solo lectura: la clave es el servicio más sus
+    argumentos normalizados (parámetros por defecto incluidos, la sesión
+    reducida a su engine). Todos reciben el mismo resultado en datos planos,
+    que no debe mutarse.
+    """
+    signature = inspect.signature(fn)
+    group = SingleFlight()
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = _normalize(bound.arguments)
+        return await group.do(key, lambda: _run_leader(fn, bound.arguments))
+
+    wrapper.single_flight = group
+    return wrapper
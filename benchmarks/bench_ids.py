@@ -0,0 +1,145 @@
+"""
+Benchmark de estrategias de llave primaria.
+
+Para cada estrategia (cuid2 con una instancia nueva por id, como antes;
+cuid2 con instancia reutilizada; ids ordenables por tiempo) mide:
+- generación: microsegundos por id
+- inserción: filas por segundo al cargar `n_rows` filas en lotes, en una
+  tabla con llave primaria de texto y una tabla hija con llave foránea
+  indexada (el patrón de persona -> candidato)
+- tamaño: bytes de los índices al terminar (pg_indexes_size en Postgres,
+  dbstat en SQLite si está disponible)
+
+Las tablas se crean y se eliminan en cada corrida.
+
+Uso:
+    python -m benchmarks.bench_ids [n_rows] [database_uri]
+    (por defecto 200000 filas en un archivo SQLite temporal; con Postgres
+    los resultados reflejan mejor el costo de los splits del btree)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from cuid2 import Cuid
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    insert,
+    text,
+)
+from sqlalchemy.engine import Engine
+
+from app.utils.ids import SortableIdGenerator, cuid_id
+
+BATCH_SIZE = 5000
+
+STRATEGIES: dict[str, Callable[[], str]] = {
+    "cuid (instancia por id)": lambda: Cuid().generate(),
+    "cuid (instancia única)": cuid_id,
+    "sortable": SortableIdGenerator().generate,
+}
+
+
+def _tables(suffix: str) -> tuple[MetaData, Table, Table]:
+    metadata = MetaData()
+    parent = Table(
+        f"bench_ids_parent_{suffix}",
+        metadata,
+        Column("id", String, primary_key=True),
+        Column("nombre", String, nullable=False),
+    )
+    child = Table(
+        f"bench_ids_child_{suffix}",
+        metadata,
+        Column("id", String, primary_key=True),
+        Column("parent_id", ForeignKey(parent.c.id), index=True, nullable=False),
+    )
+    return metadata, parent, child
+
+
+def generation_us(generate: Callable[[], str], n: int) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        generate()
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def index_bytes(engine: Engine, tables: list[Table]) -> int | None:
+    names = [table.name for table in tables]
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            return sum(
+                conn.execute(
+                    text("SELECT pg_indexes_size(CAST(:name AS regclass))"),
+                    {"name": name},
+                ).scalar_one()
+                for name in names
+            )
+        if engine.dialect.name == "sqlite":
+            try:
+                return conn.execute(
+                    text(
+                        "SELECT SUM(pgsize) FROM dbstat WHERE name IN "
+                        "(SELECT name FROM sqlite_master WHERE type = 'index' "
+                        "AND tbl_name IN (:parent, :child))"
+                    ),
+                    {"parent": names[0], "child": names[1]},
+                ).scalar_one()
+            except Exception:  # SQLite compilado sin dbstat
+                return None
+    return None
+
+
+def insert_rows(engine: Engine, generate: Callable[[], str], n_rows: int, suffix: str):
+    metadata, parent, child = _tables(suffix)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    try:
+        started = time.perf_counter()
+        for start in range(0, n_rows, BATCH_SIZE):
+            size = min(BATCH_SIZE, n_rows - start)
+            parent_ids = [generate() for _ in range(size)]
+            with engine.begin() as conn:
+                conn.execute(
+                    insert(parent),
+                    [{"id": id_, "nombre": f"fila {id_}"} for id_ in parent_ids],
+                )
+                conn.execute(
+                    insert(child),
+                    [{"id": generate(), "parent_id": id_} for id_ in parent_ids],
+                )
+        elapsed = time.perf_counter() - started
+        return 2 * n_rows / elapsed, index_bytes(engine, [parent, child])
+    finally:
+        metadata.drop_all(engine)
+
+
+def run(n_rows: int, database_uri: str) -> None:
+    engine = create_engine(database_uri)
+    print(f"{n_rows} filas padre + {n_rows} hijas en {engine.dialect.name}")
+    print(
+        f"{'estrategia':<26}{'us/id':>8}{'filas/s':>12}{'MiB índices':>14}{'ejemplo':>30}"
+    )
+    for i, (label, generate) in enumerate(STRATEGIES.items()):
+        us = generation_us(generate, 20_000)
+        rows_per_second, size = insert_rows(engine, generate, n_rows, str(i))
+        mib = f"{size / 2**20:.1f}" if size is not None else "-"
+        print(f"{label:<26}{us:>8.2f}{rows_per_second:>12.0f}{mib:>14}{generate():>30}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    if len(sys.argv) > 2:
+        run(rows, sys.argv[2])
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            run(rows, f"sqlite:///{os.path.join(tmp, 'bench_ids.db')}")
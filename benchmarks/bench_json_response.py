@@ -0,0 +1,205 @@
+"""
+Benchmark de renderizado JSON de respuestas.
+
+Compara, para los payloads de lista de personas y de candidaturas, el
+JSONResponse por defecto (json.dumps) con FastJSONResponse (orjson):
+- con response_model: validación + serialización de pydantic y render
+- sin response_model: FastAPI pasa igual el contenido por jsonable_encoder
+  antes de renderizar, con json.dumps o con orjson
+- respuesta devuelta por la ruta (como sparse_response): FastAPI no la
+  serializa de nuevo y orjson recibe el contenido tal cual
+
+Reporta tiempo medio por respuesta y memoria asignada (pico de tracemalloc).
+
+Uso:
+    python -m benchmarks.bench_json_response [n_items] [repeticiones]
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.models.politics import EstadoCandidatura, TipoCamara, TipoCandidatura
+from app.responses.base import FastJSONResponse
+from app.responses.politics import CandidaturaDetailResponse, PersonaListResponse
+
+NOW = datetime(2026, 4, 12, tzinfo=timezone.utc)
+
+
+def _partido(i: int) -> dict:
+    return {
+        "id": f"partido{i % 12:020d}",
+        "nombre": f"Partido Político {i % 12}",
+        "sigla": f"PP{i % 12}",
+        "logo_url": "https://example.org/logo.png",
+        "color_hex": "#FF6600",
+        "activo": True,
+        "created_at": NOW,
+    }
+
+
+def _distrito(i: int) -> dict:
+    return {
+        "id": f"distrito{i % 27:019d}",
+        "nombre": f"Distrito {i % 27}",
+        "codigo": f"D{i % 27}",
+        "es_distrito_nacional": False,
+        "num_senadores": 2,
+        "num_diputados": 5,
+        "activo": True,
+    }
+
+
+def _proyecto(i: int, j: int) -> dict:
+    return {
+        "id": f"proyecto{i:010d}{j:010d}",
+        "numero": f"{i}/{j}-2024-CR",
+        "titulo": "Ley que modifica diversos artículos " * 3,
+        "resumen": "Resumen del proyecto de ley con detalle de su alcance. " * 6,
+        "fecha_presentacion": NOW - timedelta(days=j),
+        "estado": "En comisión",
+        "url_documento": "https://example.org/proyecto.pdf",
+        "created_at": NOW,
+    }
+
+
+def _periodo(i: int, n_proyectos: int) -> dict:
+    return {
+        "id": f"legislador{i:018d}",
+        "camara": TipoCamara.CONGRESO,
+        "periodo_inicio": NOW - timedelta(days=1500),
+        "periodo_fin": NOW + timedelta(days=300),
+        "esta_activo": True,
+        "partido": _partido(i),
+        "distrito": _distrito(i),
+        "proyectos_ley": [_proyecto(i, j) for j in range(n_proyectos)],
+    }
+
+
+def _persona(i: int) -> dict:
+    return {
+        "id": f"persona{i:021d}",
+        "dni": f"{i:08d}",
+        "nombres": f"Nombre {i}",
+        "apellidos": f"Apellido Paterno {i} Apellido Materno",
+        "nombre_completo": f"Nombre {i} Apellido Paterno {i} Apellido Materno",
+        "foto_url": "https://example.org/foto.jpg",
+        "profesion": "Abogado",
+        "fecha_nacimiento": NOW - timedelta(days=365 * 50),
+        "biografia_corta": "Biografía corta de la persona política. " * 8,
+        "educacion_universitaria": "Universidad Nacional Mayor de San Marcos",
+        "grado_academico": "Bachiller",
+        "titulo_profesional": "Abogado",
+        "antecedentes_penales": (
+            [{"tipo": "Penal", "descripcion": "Proceso por peculado", "año": 2019}]
+            if i % 7 == 0
+            else []
+        ),
+        "antecedentes_judiciales": [],
+        "facebook_url": "https://facebook.com/x",
+        "twitter_url": "https://twitter.com/x",
+        "instagram_url": None,
+        "created_at": NOW,
+    }
+
+
+def persona_list_payload(n: int) -> list[dict]:
+    return [{**_persona(i), "periodo_activo": _periodo(i, 3)} for i in range(n)]
+
+
+def candidatura_list_payload(n: int) -> list[dict]:
+    return [
+        {
+            "id": f"candidato{i:019d}",
+            "tipo": TipoCandidatura.DIPUTADO,
+            "numero_lista": i % 30 + 1,
+            "estado": EstadoCandidatura.HABIL,
+            "votos_obtenidos": 1000 + i,
+            "fue_elegido": False,
+            "propuestas": "Propuestas de campaña. " * 10,
+            "plan_gobierno_url": "https://example.org/plan.pdf",
+            "created_at": NOW,
+            "persona": _persona(i),
+            "periodos_legislativos": [_periodo(i, 5)] if i % 3 == 0 else [],
+            "partido": _partido(i),
+            "distrito": _distrito(i),
+            "proceso_electoral": {
+                "id": "proceso2026000000000000",
+                "nombre": "Elecciones Generales 2026",
+                "año": 2026,
+                "fecha_elecciones": NOW,
+                "activo": True,
+                "created_at": NOW,
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def measure(fn: Callable[[], object], repeat: int) -> tuple[float, float]:
+    """Retorna (ms por llamada, KiB de pico asignado en una llamada)."""
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 1024
+
+
+def run(n_items: int, repeat: int) -> None:
+    cases = [
+        ("personas", persona_list_payload(n_items), List[PersonaListResponse]),
+        (
+            "candidaturas",
+            candidatura_list_payload(n_items),
+            List[CandidaturaDetailResponse],
+        ),
+    ]
+
+    print(f"{n_items} items, {repeat} repeticiones")
+    print(
+        f"{'payload':<14}{'pipeline':<44}{'ms/resp':>10}{'KiB pico':>11}{'bytes':>10}"
+    )
+    for name, payload, model in cases:
+        adapter = TypeAdapter(model)
+
+        def with_model(response_class):
+            def render():
+                value = adapter.validate_python(payload)
+                return response_class(adapter.dump_python(value, mode="json")).body
+
+            return render
+
+        variants = {
+            "response_model + JSONResponse": with_model(JSONResponse),
+            "response_model + FastJSONResponse": with_model(FastJSONResponse),
+            "jsonable_encoder + JSONResponse": lambda: JSONResponse(
+                jsonable_encoder(payload)
+            ).body,
+            "jsonable_encoder + FastJSONResponse": lambda: FastJSONResponse(
+                jsonable_encoder(payload)
+            ).body,
+            "FastJSONResponse devuelta por la ruta": lambda: FastJSONResponse(
+                payload
+            ).body,
+        }
+        for label, fn in variants.items():
+            ms, kib = measure(fn, repeat)
+            print(f"{name:<14}{label:<44}{ms:>10.2f}{kib:>11.0f}{len(fn()):>10}")
+
+
+if __name__ == "__main__":
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    run(items, repetitions)
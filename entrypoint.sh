@@ -31,4 +31,4 @@ else
   fi
 fi
 echo 'Iniciando servidor FastAPI...'
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
+exec python -m app.server
@@ -0,0 +1,54 @@
+"""composite indexes for hot filters
+
+Revision ID: 3c9e1d7a52b4
+Revises: 733f915d9aec
+Create Date: 2026-10-19 09:14:37.512209
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9e1d7a52b4"
+down_revision: Union[str, Sequence[str], None] = "733f915d9aec"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_legislador_activo_camara",
+        "legislador",
+        ["camara", "persona_id"],
+        unique=False,
+        postgresql_include=["partido_id", "distrito_id"],
+        postgresql_where=sa.text("esta_activo"),
+        sqlite_where=sa.text("esta_activo"),
+    )
+    op.create_index(
+        "ix_candidato_proceso_tipo_estado_created",
+        "candidato",
+        ["proceso_electoral_id", "tipo", "estado", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_candidato_distrito_id"), "candidato", ["distrito_id"], unique=False
+    )
+    op.create_index(
+        "ix_proyectoley_legislador_fecha",
+        "proyectoley",
+        ["legislador_id", "fecha_presentacion"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_proyectoley_legislador_fecha", table_name="proyectoley")
+    op.drop_index(op.f("ix_candidato_distrito_id"), table_name="candidato")
+    op.drop_index("ix_candidato_proceso_tipo_estado_created", table_name="candidato")
+    op.drop_index("ix_legislador_activo_camara", table_name="legislador")
@@ -0,0 +1,111 @@
+"""candidatura_card read model
+
+Revision ID: 5f2b8c1d9e47
+Revises: 3c9e1d7a52b4
+Create Date: 2026-10-19 11:58:02.114873
+
+La tabla se crea vacía (el payload se genera en Python): la aplicación la
+puebla al arrancar si está vacía (ensure_candidatura_cards). También puede
+poblarse a mano: python -m app.commands.rebuild_cards
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2b8c1d9e47"
+down_revision: Union[str, Sequence[str], None] = "3c9e1d7a52b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIPO_CANDIDATURA = (
+    "PRESIDENTE",
+    "VICEPRESIDENTE",
+    "SENADOR",
+    "DIPUTADO",
+    "CONGRESISTA",
+)
+ESTADO_CANDIDATURA = ("INSCRITO", "HABIL", "INHABILITADO", "TACADO")
+
+
+def _existing_enum(values: tuple, name: str) -> sa.Enum:
+    """Reutiliza en PostgreSQL el tipo ENUM que ya creó init_table."""
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), "postgresql"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "candidatura_card",
+        sa.Column("candidatura_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("persona_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column(
+            "proceso_electoral_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column(
+            "tipo", _existing_enum(TIPO_CANDIDATURA, "tipocandidatura"), nullable=False
+        ),
+        sa.Column(
+            "estado",
+            _existing_enum(ESTADO_CANDIDATURA, "estadocandidatura"),
+            nullable=False,
+        ),
+        sa.Column("partido_nombre", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("distrito_nombre", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column(
+            "nombre_busqueda", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["candidatura_id"], ["candidato.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("candidatura_id"),
+    )
+    op.create_index(
+        "ix_candidatura_card_proceso_tipo_estado_created",
+        "candidatura_card",
+        ["proceso_electoral_id", "tipo", "estado", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_candidatura_card_persona_id"),
+        "candidatura_card",
+        ["persona_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_candidatura_card_partido_nombre"),
+        "candidatura_card",
+        ["partido_nombre"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_candidatura_card_distrito_nombre"),
+        "candidatura_card",
+        ["distrito_nombre"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_candidatura_card_distrito_nombre"), table_name="candidatura_card"
+    )
+    op.drop_index(
+        op.f("ix_candidatura_card_partido_nombre"), table_name="candidatura_card"
+    )
+    op.drop_index(op.f("ix_candidatura_card_persona_id"), table_name="candidatura_card")
+    op.drop_index(
+        "ix_candidatura_card_proceso_tipo_estado_created",
+        table_name="candidatura_card",
+    )
+    op.drop_table("candidatura_card")
@@ -0,0 +1,48 @@
+"""change_log
+
+Revision ID: 8a3d6e0f1b72
+Revises: 5f2b8c1d9e47
+Create Date: 2026-10-19 12:04:31.520917
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a3d6e0f1b72"
+down_revision: Union[str, Sequence[str], None] = "5f2b8c1d9e47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "change_log",
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column(
+            "entity_type", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False
+        ),
+        sa.Column("entity_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column(
+            "operation", sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False
+        ),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("version"),
+    )
+    op.create_index(
+        "ix_change_log_entity_version",
+        "change_log",
+        ["entity_type", "version"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_change_log_entity_version", table_name="change_log")
+    op.drop_table("change_log")
@@ -0,0 +1,74 @@
+"""resultado_agregado tallies
+
+Revision ID: b7e4c2a9d318
+Revises: 8a3d6e0f1b72
+Create Date: 2026-10-19 12:31:07.284415
+
+La tabla se puebla con los totales actuales de candidato; a partir de ahí la
+mantienen los deltas de la ingesta y la reconciliación periódica.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4c2a9d318"
+down_revision: Union[str, Sequence[str], None] = "8a3d6e0f1b72"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIPO_CANDIDATURA = (
+    "PRESIDENTE",
+    "VICEPRESIDENTE",
+    "SENADOR",
+    "DIPUTADO",
+    "CONGRESISTA",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "resultado_agregado",
+        sa.Column(
+            "proceso_electoral_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column(
+            "tipo",
+            sa.Enum(*TIPO_CANDIDATURA, name="tipocandidatura").with_variant(
+                postgresql.ENUM(
+                    *TIPO_CANDIDATURA, name="tipocandidatura", create_type=False
+                ),
+                "postgresql",
+            ),
+            nullable=False,
+        ),
+        sa.Column("partido_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("distrito_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("votos", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "proceso_electoral_id", "tipo", "partido_id", "distrito_id"
+        ),
+    )
+    # Sin este poblado los totales solo reflejarían los deltas posteriores al
+    # despliegue (y los procesos inactivos nunca se reconcilian)
+    op.execute(
+        """
+        INSERT INTO resultado_agregado
+            (proceso_electoral_id, tipo, partido_id, distrito_id, votos, updated_at)
+        SELECT proceso_electoral_id, tipo, partido_id, COALESCE(distrito_id, ''),
+               SUM(COALESCE(votos_obtenidos, 0)), CURRENT_TIMESTAMP
+        FROM candidato
+        GROUP BY proceso_electoral_id, tipo, partido_id, COALESCE(distrito_id, '')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("resultado_agregado")
@@ -0,0 +1,105 @@
+"""jsonb antecedentes, experiencia and historia with gin indexes
+
+Revision ID: d4f1a7c3b925
+Revises: b7e4c2a9d318
+Create Date: 2026-10-19 13:02:41.118734
+
+Después de aplicar: python -m app.commands.rebuild_cards
+(las tarjetas incluyen los nuevos conteos de antecedentes)
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d4f1a7c3b925"
+down_revision: Union[str, Sequence[str], None] = "b7e4c2a9d318"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = (
+    ("persona", "experiencia_laboral"),
+    ("persona", "antecedentes_penales"),
+    ("persona", "antecedentes_judiciales"),
+    ("partidopolitico", "historia_timeline"),
+)
+
+COUNT_COLUMNS = (
+    ("num_antecedentes_penales", "antecedentes_penales"),
+    ("num_antecedentes_judiciales", "antecedentes_judiciales"),
+    ("num_experiencia_laboral", "experiencia_laboral"),
+)
+
+
+def _array_length(column: str) -> str:
+    return (
+        f"CASE WHEN jsonb_typeof({column}) = 'array' "
+        f"THEN jsonb_array_length({column}) ELSE 0 END"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_type=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using=f"{column}::jsonb",
+        )
+
+    # Columnas generadas: Postgres las calcula al agregarlas y en cada escritura
+    for count_column, source in COUNT_COLUMNS:
+        op.add_column(
+            "persona",
+            sa.Column(
+                count_column,
+                sa.Integer(),
+                sa.Computed(_array_length(source), persisted=True),
+                nullable=False,
+            ),
+        )
+
+    for table, column in JSON_COLUMNS:
+        op.create_index(
+            f"ix_{table}_{column}_gin",
+            table,
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "jsonb_path_ops"},
+        )
+    for count_column in ("num_antecedentes_penales", "num_antecedentes_judiciales"):
+        op.create_index(
+            f"ix_persona_con_{count_column.removeprefix('num_')}",
+            "persona",
+            [count_column],
+            unique=False,
+            postgresql_where=sa.text(f"{count_column} > 0"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for count_column in ("num_antecedentes_penales", "num_antecedentes_judiciales"):
+        op.drop_index(
+            f"ix_persona_con_{count_column.removeprefix('num_')}", table_name="persona"
+        )
+    for table, column in JSON_COLUMNS:
+        op.drop_index(f"ix_{table}_{column}_gin", table_name=table)
+    for count_column, _ in COUNT_COLUMNS:
+        op.drop_column("persona", count_column)
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            existing_nullable=True,
+            postgresql_using=f"{column}::json",
+        )
@@ -0,0 +1,50 @@
+"""token expiry indexes
+
+Revision ID: e6b3a8d1c540
+Revises: d4f1a7c3b925
+Create Date: 2026-10-19 14:21:09.604317
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6b3a8d1c540"
+down_revision: Union[str, Sequence[str], None] = "d4f1a7c3b925"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_usertoken_user_id_expires_at", "usertoken", ["user_id", "expires_at"]),
+    ("ix_usertoken_expires_at", "usertoken", ["expires_at"]),
+    ("ix_verificationtoken_expires_at", "verificationtoken", ["expires_at"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # usertoken recibe una fila por login: crear sin bloquear escrituras
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )